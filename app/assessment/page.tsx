@@ -37,6 +37,7 @@ export default function AssessmentPage() {
   useEffect(() => {
     const domain = searchParams.get("domain") || sessionStorage.getItem("assessment_domain")
     const difficulty = searchParams.get("difficulty") || sessionStorage.getItem("assessment_difficulty") || "moderate"
+    const documentId = sessionStorage.getItem("assessment_document_id")
 
     if (!domain) {
       router.push("/start")
@@ -48,7 +49,7 @@ export default function AssessmentPage() {
       fetch(`${BACKEND_URL}/api/assessment/generate-batch`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ domain, count: 10, difficulty }),
+        body: JSON.stringify({ domain, count: 10, difficulty, ...(documentId ? { document_id: documentId } : {}) }),
       })
         .then((res) => res.json())
         .then((data) => {
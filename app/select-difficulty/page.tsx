@@ -71,6 +71,7 @@ export default function SelectDifficultyPage() {
     
     if (!pdfContent) {
       // No PDF uploaded, use domain-based assessment
+      sessionStorage.removeItem("assessment_document_id")
       sessionStorage.setItem("assessment_difficulty", selectedDifficulty)
       router.push("/start")
       return
@@ -83,6 +84,12 @@ export default function SelectDifficultyPage() {
     sessionStorage.setItem("assessment_domain", domain)
     sessionStorage.setItem("assessment_difficulty", selectedDifficulty)
     sessionStorage.setItem("assessment_mode", "pdf")
+    if (content.document_id) {
+      // /generate-batch grounds the questions in the ingested document
+      sessionStorage.setItem("assessment_document_id", content.document_id)
+    } else {
+      sessionStorage.removeItem("assessment_document_id")
+    }
     
     router.push(`/assessment?domain=${encodeURIComponent(domain)}&difficulty=${selectedDifficulty}`)
   }
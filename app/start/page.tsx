@@ -40,6 +40,7 @@ export default function StartAssessmentPage() {
       // Store domain and difficulty in sessionStorage
       sessionStorage.setItem("assessment_domain", domainToUse)
       sessionStorage.setItem("assessment_difficulty", selectedDifficulty)
+      sessionStorage.removeItem("assessment_document_id")
       
       // Navigate to assessment page
       router.push(`/assessment?domain=${encodeURIComponent(domainToUse)}&difficulty=${selectedDifficulty}`)
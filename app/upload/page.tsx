@@ -23,7 +23,7 @@ interface PDFSummary {
   estimated_read_time_minutes?: number
   // legacy fields (fallback if backend returns old shape)
   topics?: string[]
-  concepts?: { title: string; content: string; summary?: string }[]
+  concepts?: { title: string; content?: string; summary?: string }[]
 }
 
 export default function UploadPage() {
@@ -69,21 +69,14 @@ export default function UploadPage() {
       const data = await response.json()
       
       if (data.success) {
-        const summaryPayload: PDFSummary = {
-          title: data.summary?.title || data.title,
-          overview: data.summary?.overview || data.overview,
-          key_concepts: data.summary?.key_concepts || data.key_concepts || data.topics,
-          main_topics: data.summary?.main_topics || data.main_topics,
-          difficulty_level: data.summary?.difficulty_level || data.difficulty_level,
-          estimated_read_time_minutes:
-            data.summary?.estimated_read_time_minutes || data.estimated_read_time_minutes,
-          topics: data.topics || [],
-          concepts: data.concepts || [],
+        showSummary(data)
+        if (!(data.summary?.main_topics || data.main_topics)) {
+          loadSections(data.document_id)
+        }
+        if (data.summary_pending) {
+          // A quick local summary came back; the full AI summary replaces it when ready
+          pollForSummary(data.document_id)
         }
-
-        setSummary(summaryPayload)
-        // Store PDF content in session for question generation
-        sessionStorage.setItem("pdf_content", JSON.stringify({ ...data, summary: summaryPayload }))
       } else {
         throw new Error(data.error || "Failed to process PDF")
       }
@@ -95,6 +88,57 @@ export default function UploadPage() {
     }
   }
 
+  const pollForSummary = async (documentId: string, attempts = 30) => {
+    for (let i = 0; i < attempts; i++) {
+      await new Promise((resolve) => setTimeout(resolve, 2000))
+      try {
+        const response = await fetch(`${BACKEND_URL}/api/assessment/documents/${documentId}`)
+        if (!response.ok) return
+        const data = await response.json()
+        if (!data.summary_pending) {
+          showSummary(data)
+          return
+        }
+      } catch (err) {
+        console.error("Summary poll error:", err)
+        return
+      }
+    }
+  }
+
+  const loadSections = async (documentId: string, limit = 5) => {
+    // The ingest response only carries the outline; the concept cards need section text
+    try {
+      const response = await fetch(
+        `${BACKEND_URL}/api/assessment/documents/${documentId}/sections?limit=${limit}&fields=title,summary,content`
+      )
+      if (!response.ok) return
+      const data = await response.json()
+      setSummary((prev) => (prev ? { ...prev, concepts: data.sections || prev.concepts } : prev))
+    } catch (err) {
+      console.error("Sections fetch error:", err)
+    }
+  }
+
+  const showSummary = (data: any) => {
+    const summaryPayload: PDFSummary = {
+      title: data.summary?.title || data.title,
+      overview: data.summary?.overview || data.overview,
+      key_concepts: data.summary?.key_concepts || data.key_concepts || data.topics,
+      main_topics: data.summary?.main_topics || data.main_topics,
+      difficulty_level: data.summary?.difficulty_level || data.difficulty_level,
+      estimated_read_time_minutes:
+        data.summary?.estimated_read_time_minutes || data.estimated_read_time_minutes,
+      topics: data.topics || [],
+      // section content/summaries are paged in by loadSections
+      concepts: data.outline || [],
+    }
+
+    setSummary((prev) => ({ ...summaryPayload, concepts: prev?.concepts?.length ? prev.concepts : summaryPayload.concepts }))
+    // Store PDF content in session for question generation
+    sessionStorage.setItem("pdf_content", JSON.stringify({ ...data, summary: summaryPayload }))
+  }
+
   const handleTestConfidence = () => {
     // Navigate to difficulty selection page
     router.push("/select-difficulty")
@@ -281,7 +325,7 @@ export default function UploadPage() {
                         <div key={idx} className="p-3 rounded-lg border border-gray-200 bg-gray-50">
                           <div className="font-semibold text-blue-700">{concept.title}</div>
                           <p className="text-sm text-gray-600">
-                            {concept.summary || concept.content.substring(0, 160) + "..."}
+                            {concept.summary || (concept.content ? concept.content.substring(0, 160) + "..." : "")}
                           </p>
                         </div>
                       ))}
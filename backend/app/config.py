@@ -4,4 +4,7 @@ PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID")
 DOC_AI_LOCATION = os.getenv("DOCUMENT_AI_LOCATION", "us")
 DOC_AI_PROCESSOR_ID = os.getenv("DOCUMENT_AI_PROCESSOR_ID")
 VERTEX_LOCATION = os.getenv("VERTEX_LOCATION", "us-central1")
-VERTEX_API_KEY = os.getenv("VERTEX_API_KEY")
\ No newline at end of file
+VERTEX_API_KEY = os.getenv("VERTEX_API_KEY")
+# "vertex" (default) summarizes with the Vertex AI SDK; "gemini" sends the
+# same prompt through call_gemini, which honours GEMINI_BASE.
+SUMMARY_PROVIDER = os.getenv("SUMMARY_PROVIDER", "vertex")
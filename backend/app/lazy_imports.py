@@ -0,0 +1,71 @@
+"""
+Deferred loading of heavy optional SDKs.
+
+Cloud SDKs (Document AI, Vertex AI) and numpy/scipy/PyPDF2 are imported on
+first use instead of at module import, so worker boot and cold starts only
+pay for Flask and the pure-Python services. `init_app` can additionally start a
+daemon thread that imports them in the background right after boot, so the
+first request that needs one usually finds it already loaded.
+
+Environment:
+    WARM_IMPORTS    "1" to warm up HEAVY_MODULES in a background thread (default 1)
+"""
+import importlib
+import logging
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = (
+    "numpy",
+    "scipy.sparse",
+    "PyPDF2",
+    "google.cloud.documentai",
+    "vertexai",
+    "vertexai.language_models",
+)
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+_lock = threading.Lock()
+
+
+def optional_import(name: str) -> Optional[ModuleType]:
+    """Import `name` once and cache it; returns None if it is not installed."""
+    try:
+        return _modules[name]
+    except KeyError:
+        pass
+    with _lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except Exception:  # optional dependency
+                _modules[name] = None
+        return _modules[name]
+
+
+def warm_up(names: Iterable[str] = HEAVY_MODULES) -> threading.Thread:
+    """Import `names` in a daemon thread and log how long each took."""
+    def _run():
+        for name in names:
+            start = time.perf_counter()
+            module = optional_import(name)
+            logger.debug(
+                "warm import",
+                extra={"import": name, "available": module is not None,
+                       "duration_ms": round((time.perf_counter() - start) * 1000, 1)},
+            )
+
+    thread = threading.Thread(target=_run, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def init_app(app) -> None:
+    """Start the background warm-up unless WARM_IMPORTS=0."""
+    if os.getenv("WARM_IMPORTS", "1") == "1":
+        app.extensions["import_warmup"] = warm_up()
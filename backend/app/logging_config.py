@@ -0,0 +1,159 @@
+"""
+Non-blocking structured logging.
+
+Request threads only enqueue log records (QueueHandler); a single
+QueueListener thread formats them as JSON lines and writes to stdout, so
+slow terminal/pipe writes never hold up a request. Each record carries the
+current request_id and session_id, and high-volume DEBUG lines are sampled.
+
+Environment:
+    LOG_LEVEL               minimum level for the "app" loggers (default INFO)
+    LOG_DEBUG_SAMPLE_RATE   fraction of DEBUG records kept (default 0.1)
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+session_id_var: contextvars.ContextVar = contextvars.ContextVar("session_id", default=None)
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "session_id",
+}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key in ("request_id", "session_id"):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and key not in entry:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps extras and traceback separate from the message.
+
+    The stock prepare() flattens everything into one preformatted string;
+    here only the %-args and exception are rendered (they may reference
+    objects that change after the call), and JSON encoding is left to the
+    listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class ContextFilter(logging.Filter):
+    """Stamp request/session ids on the record in the emitting thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if getattr(record, "session_id", None) is None:
+            record.session_id = session_id_var.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keep only a fraction of DEBUG records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+def configure_logging() -> None:
+    """Route the "app" logger tree through a queue. Safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    level = os.getenv("LOG_LEVEL", "INFO").upper()
+    sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = StructuredQueueHandler(log_queue)
+    # Filters run in the caller's thread, before the record is enqueued
+    queue_handler.addFilter(DebugSampler(sample_rate))
+    queue_handler.addFilter(ContextFilter())
+
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def init_app(app) -> None:
+    """Configure logging and bind request/session ids for each request."""
+    from flask import g, request
+
+    configure_logging()
+
+    @app.before_request
+    def _bind_log_context():
+        rid = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        sid = (request.view_args or {}).get("session_id")
+        if sid is None and request.is_json:
+            sid = (request.get_json(silent=True) or {}).get("session_id")
+        g._log_tokens = (request_id_var.set(rid), session_id_var.set(sid))
+        g._log_start = time.perf_counter()
+
+    @app.after_request
+    def _log_request(response):
+        start = g.pop("_log_start", None)
+        response.headers["X-Request-ID"] = request_id_var.get() or ""
+        logging.getLogger("app.request").info(
+            "request",
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2) if start else None,
+            },
+        )
+        tokens = g.pop("_log_tokens", None)
+        if tokens:
+            request_id_var.reset(tokens[0])
+            session_id_var.reset(tokens[1])
+        return response
@@ -4,10 +4,16 @@ load_dotenv()
 from flask import Flask
 from flask_cors import CORS
 from app.routes.assessment import assessment_bp
+from app.services import metrics
+from app import logging_config, profiling, lazy_imports
 
 def create_app():
     app = Flask(__name__)
     CORS(app)
+    logging_config.init_app(app)
+    metrics.init_app(app)
+    profiling.init_app(app)
+    lazy_imports.init_app(app)
 
     app.register_blueprint(
         assessment_bp,
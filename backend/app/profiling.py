@@ -0,0 +1,189 @@
+"""
+On-demand request profiling.
+
+Opt-in (PROFILING_ENABLED=1). A request is profiled when it carries an
+X-Profile header ("cpu", "mem" or "cpu,mem") or is picked by
+PROFILE_SAMPLE_RATE. cProfile output is saved as a .prof file (load with
+pstats/snakeviz) next to a .txt summary with the top functions and, for
+"mem", the top tracemalloc allocation sites. Files live under PROFILE_DIR,
+one sub-directory per route, keeping at most PROFILE_MAX_PER_ROUTE captures
+each. GET /debug/profiles lists captures; GET /debug/profiles/<route>/<file>
+downloads one.
+
+cProfile and tracemalloc are process-wide, so only one request is profiled
+at a time; others run unprofiled while a capture is in progress.
+
+Environment:
+    PROFILING_ENABLED       "1" to install the hooks and endpoints
+    PROFILE_SAMPLE_RATE     fraction of requests profiled without a header (default 0)
+    PROFILE_DIR             capture directory (default <tmp>/assessment-profiles)
+    PROFILE_MAX_PER_ROUTE   captures kept per route (default 20)
+    PROFILE_TOKEN           if set, X-Profile-Token must match to trigger or list captures
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+logger = logging.getLogger(__name__)
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "0") == "1"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "assessment-profiles"))
+PROFILE_MAX_PER_ROUTE = int(os.getenv("PROFILE_MAX_PER_ROUTE", "20"))
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+
+_capture_lock = threading.Lock()
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _route_slug(rule: str) -> str:
+    return _SAFE_NAME.sub("_", rule.strip("/")) or "root"
+
+
+def _authorized(request) -> bool:
+    return not PROFILE_TOKEN or request.headers.get("X-Profile-Token") == PROFILE_TOKEN
+
+
+def _requested_modes(request) -> set:
+    header = request.headers.get("X-Profile")
+    if header and _authorized(request):
+        modes = {m.strip().lower() for m in header.split(",")}
+        return {"cpu", "mem"} if modes & {"1", "all", "true"} else modes & {"cpu", "mem"}
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return {"cpu"}
+    return set()
+
+
+def _write_capture(route: str, profiler, snapshot, elapsed: float, status: int) -> str:
+    directory = os.path.join(PROFILE_DIR, _route_slug(route))
+    os.makedirs(directory, exist_ok=True)
+    base = f"{time.strftime('%Y%m%dT%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+    summary = io.StringIO()
+    summary.write(f"route: {route}\nstatus: {status}\nelapsed_ms: {elapsed * 1000:.2f}\n\n")
+    if profiler is not None:
+        profiler.dump_stats(os.path.join(directory, base + ".prof"))
+        stats = pstats.Stats(profiler, stream=summary)
+        stats.sort_stats("cumulative").print_stats(30)
+    if snapshot is not None:
+        summary.write("\nTop allocations (by size):\n")
+        for stat in snapshot.statistics("lineno")[:20]:
+            summary.write(f"{stat}\n")
+    with open(os.path.join(directory, base + ".txt"), "w") as f:
+        f.write(summary.getvalue())
+
+    _prune(directory)
+    return base
+
+
+def _prune(directory: str) -> None:
+    """Keep only the newest PROFILE_MAX_PER_ROUTE captures in a route directory."""
+    newest = {}
+    for name in os.listdir(directory):
+        base = os.path.splitext(name)[0]
+        newest[base] = max(newest.get(base, 0), os.path.getmtime(os.path.join(directory, name)))
+    captures = sorted(newest, key=newest.get)
+    for stale in captures[:-PROFILE_MAX_PER_ROUTE]:
+        for ext in (".prof", ".txt"):
+            path = os.path.join(directory, stale + ext)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def list_captures() -> list:
+    out = []
+    if not os.path.isdir(PROFILE_DIR):
+        return out
+    for route in sorted(os.listdir(PROFILE_DIR)):
+        directory = os.path.join(PROFILE_DIR, route)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory), reverse=True):
+            path = os.path.join(directory, name)
+            out.append({
+                "route": route,
+                "file": name,
+                "bytes": os.path.getsize(path),
+                "created": round(os.path.getmtime(path), 3),
+            })
+    return out
+
+
+def _stop(state: dict):
+    """Stop the profilers for a capture (idempotent); return (profiler, snapshot)."""
+    if state.get("stopped"):
+        return state["profiler"], None
+    state["stopped"] = True
+    profiler = state["profiler"]
+    if profiler is not None:
+        profiler.disable()
+    snapshot = None
+    if "mem" in state["modes"]:
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+    return profiler, snapshot
+
+
+def init_app(app) -> None:
+    """Install profiling hooks and /debug/profiles endpoints when enabled."""
+    if not PROFILING_ENABLED:
+        return
+
+    from flask import abort, g, jsonify, request, send_from_directory
+
+    @app.before_request
+    def _start_profile():
+        modes = _requested_modes(request)
+        if not modes or not _capture_lock.acquire(blocking=False):
+            return
+        g._profile = {"modes": modes, "start": time.perf_counter(), "profiler": None}
+        if "mem" in modes:
+            tracemalloc.start()
+        if "cpu" in modes:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            g._profile["profiler"] = profiler
+
+    @app.after_request
+    def _finish_profile(response):
+        state = g.get("_profile")
+        if state is None:
+            return response
+        try:
+            profiler, snapshot = _stop(state)
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            elapsed = time.perf_counter() - state["start"]
+            name = _write_capture(route, profiler, snapshot, elapsed, response.status_code)
+            response.headers["X-Profile-Capture"] = f"{_route_slug(route)}/{name}"
+        except Exception:
+            logger.warning("Failed to write profile capture", exc_info=True)
+        return response
+
+    @app.teardown_request
+    def _release_profile(exc):
+        # Runs even when the view raised and after_request was skipped
+        state = g.pop("_profile", None)
+        if state is not None:
+            _stop(state)
+            _capture_lock.release()
+
+    @app.route("/debug/profiles")
+    def profiles_index():
+        if not _authorized(request):
+            abort(403)
+        return jsonify({"directory": PROFILE_DIR, "captures": list_captures()})
+
+    @app.route("/debug/profiles/<route>/<filename>")
+    def profiles_download(route: str, filename: str):
+        if not _authorized(request):
+            abort(403)
+        return send_from_directory(os.path.join(PROFILE_DIR, _route_slug(route)), filename, as_attachment=True)
@@ -1,71 +1,219 @@
-from flask import Blueprint, request, jsonify
+import logging
+
+from flask import Blueprint, request, jsonify, Response
 
 from app.services.session_store import (
     sessions,
     create_session,
     get_session,
+    expire_sessions,
     add_question,
     add_response,
-    set_confidence,
+    mark_question_served,
 )
 
-from app.services.question_generator import generate_question, generate_batch_questions
-from app.services.gemini_analyzer import analyze_response
-from app.services.pdf_parser import (
-    extract_text_from_pdf_bytes,
-    parse_document,
-    build_structured_summary,
-    extract_text_prefer_document_ai,
+from app.services.question_generator import (
+    generate_question,
+    generate_batch_questions,
+    generate_adaptive_bank,
+    generate_validated_question,
+    domain_topic_pool,
+    document_topic_pool,
 )
+from app.services.gemini_analyzer import analyze_response
+from app.services.answer_grader import grade_mcq_response
+from app.services.pdf_parser import extract_text_hybrid
 from app.services.concept_extractor import extract_concepts
+from app.services.document_summary import initial_summary, summarize_in_background
+from app.services.document_store import (
+    SECTION_FIELDS,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    REINGEST_RESUMMARIZE_FRACTION,
+    create_document,
+    get_document,
+    text_digest,
+    reusable_sections,
+    diff_sections,
+    describe_document,
+    page_etag,
+    get_sections,
+)
 from app.services.explanation_engine import explain_concept
+from app.services.explanation_prefetch import prefetch_explanations, cached_explanation
+from app.services.question_lookahead import next_question
 from app.services.confidence_engine import evaluate_concept
+from app.services.confidence_scorer import compute_confidence
+from app.services.cohort_analytics import (
+    NumpyUnavailable,
+    pack_analyses,
+    collect_session_records,
+    cohort_report,
+)
+from app.services.metrics import span
+from app.schemas.assessment import CONFIDENCE_OPTIONS
 
 assessment_bp = Blueprint("assessment", __name__)
 
+logger = logging.getLogger(__name__)
+
 @assessment_bp.route("/ingest", methods=["POST"])
 def ingest_content():
-    """Ingest PDF or raw text and return topics/concepts."""
+    """Ingest PDF or raw text and store it; return the document_id, outline and summary.
+
+    Section content and per-section summaries are fetched separately from
+    /documents/<document_id>/sections. If "summary_pending" is true, a local
+    summary was returned and the LLM summary will replace it; poll
+    /documents/<document_id> for it (see document_summary.SUMMARY_MODE).
+    With EXPLAIN_PREFETCH_COUNT set, the largest sections are explained in
+    the background; /explain serves those when given the document_id.
+
+    Re-ingest: pass the document_id of an earlier upload (form field with a
+    PDF, JSON key with text) to replace it. Only added or changed sections
+    are re-summarized, and the LLM summary is kept when little changed; the
+    response then includes "reingest": {reused, recomputed, removed,
+    changed_fraction, summary_reused}.
+    """
     summary_source = ""
     if "pdf" in request.files:
         pdf_file = request.files["pdf"]
-        text, summary_source = extract_text_prefer_document_ai(pdf_file.read())
+        document_id = request.form.get("document_id")
+        with span("extraction"):
+            text, summary_source = extract_text_hybrid(pdf_file.read())
     else:
         payload = request.get_json(silent=True) or {}
+        document_id = payload.get("document_id")
         text = payload.get("text", "")
         summary_source = "raw_text"
 
     if not text:
         return jsonify({"error": "No content provided"}), 400
 
-    parsed = parse_document(text)
-    # Add lightweight summaries via concept extractor
-    concepts = extract_concepts(text)
-    parsed["concepts"] = concepts
+    previous = None
+    if document_id:
+        previous = get_document(document_id)
+        if not previous:
+            return jsonify({"error": "invalid document"}), 404
+        if previous["digest"] == text_digest(text):
+            unchanged = {"reused": len(previous["sections"]), "recomputed": 0, "removed": 0,
+                         "changed_fraction": 0.0, "summary_reused": True}
+            return jsonify({"success": True, **describe_document(previous), "reingest": unchanged})
+
+    # Sections with lightweight summaries; their titles are the topics
+    with span("concepts"):
+        concepts = extract_concepts(text, reusable_sections(previous) if previous else None)
+    topics = [c["title"] for c in concepts]
+
+    changes = diff_sections(previous, concepts) if previous else None
+    pending = False
+    if changes and previous["summary"].get("source") == "vertex_ai" \
+            and changes["changed_fraction"] <= REINGEST_RESUMMARIZE_FRACTION:
+        summary = previous["summary"]
+    else:
+        summary, pending = initial_summary(text, topics, concepts, summary_source)
+
+    with span("store"):
+        document_id = create_document(text, concepts, topics, summary, summary_source, document_id, pending)
+    document = get_document(document_id)
+    if pending:
+        summarize_in_background(document_id, text)
+    prefetch_explanations(document, previous)
+    resp = {"success": True, **describe_document(document)}
+    if changes:
+        changes["summary_reused"] = summary is previous["summary"]
+        resp["reingest"] = changes
+        logger.info("Re-ingested document", extra={"document_id": document_id, **changes})
+    return jsonify(resp)
 
-    summary = None
-    try:
-        from app.services.vertex_summarizer import summarize_text
 
-        summary = summarize_text(text)
-        summary["source"] = "vertex_ai"
-    except Exception as e:
-        print(f"[Vertex] Summarization fallback to heuristic: {e}")
-        summary = build_structured_summary(text, parsed.get("topics", []), concepts)
-        summary["source"] = summary_source or "heuristic"
+def _conditional(etag: str, build):
+    """304 if the client already has `etag`, else jsonify(build()) tagged with it."""
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = jsonify(build())
+    resp.set_etag(etag)
+    return resp
+
+
+# Grading data that never leaves the server for questions served one at a time
+ANSWER_KEY_FIELDS = ("correct_answer", "reasoning_explanation")
+
 
-    return jsonify({"success": True, **parsed, "summary": summary})
+def _client_view(question) -> dict:
+    """The question as sent to the client, without its answer key."""
+    return {k: v for k, v in question.to_dict().items() if k not in ANSWER_KEY_FIELDS}
+
+
+@assessment_bp.route("/documents/<document_id>", methods=["GET"])
+def get_document_outline(document_id: str):
+    """Return an ingested document's outline and summary (the /ingest payload)."""
+    document = get_document(document_id)
+    if not document:
+        return jsonify({"error": "invalid document"}), 404
+    state = "pending" if document["summary_pending"] else "final"
+    return _conditional(page_etag(document, "outline", state),
+                        lambda: {"success": True, **describe_document(document)})
+
+
+@assessment_bp.route("/documents/<document_id>/sections", methods=["GET"])
+def get_document_sections(document_id: str):
+    """Return a page of sections.
+
+    Query: offset (default 0), limit (default 10, max DOCUMENT_PAGE_MAX),
+    fields (comma-separated subset of title,content,summary)
+    Returns: {"success": true, "sections": [{index, ...}], "total": int, "next_offset": int | null, ...}
+    """
+    document = get_document(document_id)
+    if not document:
+        return jsonify({"error": "invalid document"}), 404
+
+    offset = request.args.get("offset", 0, type=int)
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    if offset < 0 or limit < 1:
+        return jsonify({"error": "offset must be >= 0 and limit >= 1"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    fields = [f for f in request.args.get("fields", "").split(",") if f]
+    unknown = [f for f in fields if f not in SECTION_FIELDS]
+    if unknown:
+        return jsonify({"error": f"unknown fields: {', '.join(unknown)}"}), 400
+    fields = [f for f in SECTION_FIELDS if f in fields]
+
+    etag = page_etag(document, offset, limit, "+".join(fields) or "all")
+    return _conditional(etag, lambda: {"success": True, **get_sections(document, offset, limit, fields)})
+
+
+@assessment_bp.route("/documents/<document_id>/sections/<int:index>", methods=["GET"])
+def get_document_section(document_id: str, index: int):
+    """Return one section's title, content and summary."""
+    document = get_document(document_id)
+    if not document:
+        return jsonify({"error": "invalid document"}), 404
+    if index >= len(document["sections"]):
+        return jsonify({"error": "invalid section"}), 404
+    return _conditional(page_etag(document, "section", index),
+                        lambda: {"success": True, **get_sections(document, index, 1)["sections"][0]})
 
 
 @assessment_bp.route("/explain", methods=["POST"])
 def explain():
-    """Explain a concept in simple terms with an example."""
+    """Explain a concept in simple terms with an example.
+
+    Expects: {"title": str, "content": str, "document_id": str}
+    - document_id (optional): the ingested document the concept is a section
+      of; an explanation prefetched after /ingest is returned without a new
+      LLM call (see explanation_prefetch)
+    """
     payload = request.get_json(silent=True) or {}
     title = payload.get("title")
     content = payload.get("content")
     if not title or not content:
         return jsonify({"error": "title and content are required"}), 400
-    result = explain_concept(title, content)
+    document = get_document(payload["document_id"]) if payload.get("document_id") else None
+    result = cached_explanation(document, title, content) if document else None
+    if result is None:
+        result = explain_concept(title, content)
     return jsonify({"success": True, "explanation": result})
 
 
@@ -79,7 +227,7 @@ def generate():
     q = generate_question(subject, topic, difficulty)
     # optionally track in a session
     session_id = payload.get("session_id")
-    if session_id and session_id in sessions:
+    if session_id and get_session(session_id):
         add_question(session_id, q)
     return jsonify({"success": True, "question": q})
 
@@ -88,34 +236,64 @@ def generate():
 def generate_batch():
     """
     Generate a batch of questions for the confidence assessment system.
-    Expects: {"domain": str, "count": int, "difficulty": str}
+    Expects: {"domain": str, "count": int, "difficulty": str, "adaptive": bool, "document_id": str}
     - difficulty: "easy", "moderate", or "hard" (default: "moderate")
-    Returns: {"success": bool, "session_id": str, "questions": list}
+    - adaptive: pre-generate a bank spread across all levels; serve it
+      through /next-question/<session_id> (difficulty is then ignored)
+    - document_id: ground questions in an ingested document (/ingest); topics
+      are its section titles and each prompt carries only the top-k passages
+      retrieved for its topic
+    Returns: {"success": bool, "session_id": str, "questions": list}; adaptive
+    sessions get {"success", "session_id", "adaptive", "question_count"} instead
     """
     payload = request.get_json(silent=True) or {}
-    domain = payload.get("domain", "general")
     count = payload.get("count", 10)
     difficulty = payload.get("difficulty", "moderate")
+    adaptive = bool(payload.get("adaptive", False))
+    document_id = payload.get("document_id")
+    document = None
+    if document_id:
+        document = get_document(document_id)
+        if not document:
+            return jsonify({"error": "invalid document"}), 404
+    default_domain = document["summary"].get("title", "Document") if document else "general"
+    domain = payload.get("domain") or default_domain
     
     # Validate difficulty
     if difficulty not in ["easy", "moderate", "hard"]:
         difficulty = "moderate"
     
-    print(f"[BATCH] Generating {count} questions for domain: {domain}, difficulty: {difficulty}")
+    logger.info("Generating batch", extra={
+        "count": count, "domain": domain, "difficulty": difficulty, "adaptive": adaptive,
+        "document_id": document_id,
+    })
     
     # Create session
-    session_id = create_session(domain, "Confidence Assessment")
+    session_id = create_session(domain, "Confidence Assessment", document_id if document else None)
     
     # Generate questions with difficulty awareness
-    questions = generate_batch_questions(domain, count, difficulty)
+    if adaptive:
+        questions = generate_adaptive_bank(domain, count, document)
+    else:
+        questions = generate_batch_questions(domain, count, difficulty, document)
     
-    # Store questions in session
+    # Store questions in session. The whole batch goes to the client at once,
+    # so there is no server-side "shown" time; latency comes from the client.
     for q in questions:
-        add_question(session_id, q)
-    
+        add_question(session_id, q, served=False)
+
+    if adaptive:
+        # The bank (answer keys included) stays server-side; /next-question serves it
+        return jsonify({
+            "success": True,
+            "session_id": session_id,
+            "adaptive": True,
+            "question_count": len(questions),
+        })
     return jsonify({
         "success": True,
         "session_id": session_id,
+        "adaptive": adaptive,
         "questions": questions
     })
 
@@ -132,7 +310,8 @@ def evaluate():
         return jsonify({"error": "question and answer are required"}), 400
 
     analysis = analyze_response(question, answer)
-    result = evaluate_concept(concept, [analysis])
+    with span("score"):
+        result = evaluate_concept(concept, [analysis])
 
     # minimal insights for UI
     insights = [analysis.get("short_feedback", "Review your reasoning.")]
@@ -162,14 +341,17 @@ def start_assessment():
 
 @assessment_bp.route("/question/<session_id>", methods=["GET"])
 def get_question(session_id: str):
-    """Return a question for the given session in the UI's expected shape."""
+    """Return a question for the given session in the UI's expected shape.
+
+    Served from the session's look-ahead buffer when a question was
+    generated in the background after the previous call (see question_lookahead).
+    """
     session = get_session(session_id)
     if not session:
         return jsonify({"error": "invalid session"}), 404
 
-    subject = session.get("subject", "General")
     topic = session.get("topic", "Concept")
-    q = generate_question(subject, topic, "medium")
+    q = next_question(session_id, session, "medium")
 
     # Shape to UI expectations
     import uuid
@@ -178,18 +360,48 @@ def get_question(session_id: str):
         "question_id": question_id,
         "question": q["question"],
         "difficulty": q["difficulty"],
-        "options": [
-            {"key": "A", "text": "I understand fundamentals and can explain."},
-            {"key": "B", "text": "I can apply with guidance."},
-            {"key": "C", "text": "I am unsure about details."},
-            {"key": "D", "text": "I need a basic explanation."},
-        ],
+        "options": list(CONFIDENCE_OPTIONS),
     }
 
     add_question(session_id, {**ui_q, "topic": topic})
     return jsonify(ui_q)
 
 
+@assessment_bp.route("/next-question/<session_id>", methods=["GET"])
+def get_next_adaptive_question(session_id: str):
+    """Return the most informative next question for the session's ability.
+
+    Serves from the pre-generated bank when possible; generates one at the
+    chosen level only when the bank is exhausted.
+    """
+    session = get_session(session_id)
+    if not session:
+        return jsonify({"error": "invalid session"}), 404
+
+    state = session["adaptive"]
+    q = state.next_question(session.get("questions", []))
+    source = "bank"
+    if q is None:
+        domain = session.get("subject", "general")
+        document = get_document(session["document_id"]) if session.get("document_id") else None
+        diff, segment = state.next_level()
+        pool = document_topic_pool(document) if document else domain_topic_pool(domain)
+        topic = state.least_covered_topic(pool)
+        q = generate_validated_question(domain, topic, diff, segment, "adaptive", document)
+        q = add_question(session_id, q)
+        state.mark_served(q)
+        source = "generated"
+    else:
+        mark_question_served(session_id, q.get("question_id"))
+
+    return jsonify({
+        "success": True,
+        "question": _client_view(q),
+        "source": source,
+        "ability": state.to_dict(),
+    })
+
+
 @assessment_bp.route("/answer", methods=["POST"])
 def submit_answer():
     """Evaluate user's explanation and confidence, return structured summary."""
@@ -202,6 +414,14 @@ def submit_answer():
     if not session_id or not question_id:
         return jsonify({"error": "session_id and question_id required"}), 400
 
+    # Client-measured latency; anything non-numeric or non-positive is ignored
+    try:
+        time_taken = float(payload.get("time_taken_seconds"))
+    except (TypeError, ValueError):
+        time_taken = None
+    if time_taken is not None and not (0 < time_taken < float("inf")):
+        time_taken = None
+
     session = get_session(session_id)
     if not session:
         return jsonify({"error": "invalid session"}), 404
@@ -212,15 +432,24 @@ def submit_answer():
     if not q_item:
         return jsonify({"error": "question not found"}), 404
 
-    analysis = analyze_response(q_item["question"], explanation)
+    # Objective MCQs are graded against the answer key; only free-text
+    # reasoning goes to Gemini.
+    with span("grade_local"):
+        analysis = grade_mcq_response(q_item, payload.get("selected_option"), self_confidence)
+    if analysis is None:
+        analysis = analyze_response(q_item["question"], explanation)
     concept = session.get("topic", "Concept")
-    confidence = evaluate_concept(concept, [analysis])
+    with span("score"):
+        confidence = evaluate_concept(concept, [analysis])
+    ability = session["adaptive"].record_outcome(q_item, analysis)
 
     add_response(session_id, {
         "question_id": question_id,
+        "topic": q_item.get("topic", concept),
         "selected_option": payload.get("selected_option"),
         "explanation": explanation,
         "self_confidence": self_confidence,
+        "time_taken_seconds": time_taken,
         "analysis": analysis,
     })
 
@@ -229,5 +458,33 @@ def submit_answer():
         "confidence_score": confidence["confidence_score"],
         "reasoning_quality": analysis.get("reasoning_quality", 0),
         "feedback": analysis.get("short_feedback", "Review your reasoning."),
+        "ability": round(ability, 3),
     }
     return jsonify(result)
+
+
+@assessment_bp.route("/confidence/<session_id>", methods=["GET"])
+def get_session_confidence(session_id: str):
+    """Return the running session-wide and per-topic confidence report."""
+    session = get_session(session_id)
+    if not session:
+        return jsonify({"error": "invalid session"}), 404
+
+    report = session["aggregator"].report(session.get("topic"))
+    return jsonify({
+        "success": True,
+        "session_id": session_id,
+        **report,
+        "timing": compute_confidence(session),
+    })
+
+
+@assessment_bp.route("/analytics/cohort", methods=["GET"])
+def get_cohort_analytics():
+    """Return confidence distributions across all live (unexpired) sessions."""
+    expire_sessions()
+    try:
+        frame = pack_analyses(collect_session_records(sessions))
+    except NumpyUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({"success": True, **cohort_report(frame)})
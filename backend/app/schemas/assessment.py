@@ -0,0 +1,188 @@
+"""
+Compact in-memory models for session questions and responses.
+
+Sessions keep hundreds of questions/responses alive; as plain dicts each
+one carries a hash table and its own copies of repeated strings. These
+models use __slots__, store difficulty/segment as enum members, and share
+one tuple for option sets every question of a kind repeats (the four
+Assertion-Reason options, the UI self-assessment options, the generator's
+fallback sets).
+
+They are read-only Mappings over the original keys, so existing code that
+does q.get("difficulty") or q["question"] keeps working, and to_dict()
+returns exactly the JSON shape the API has always sent (fields that were
+absent stay absent; unknown keys are kept in `extra`).
+"""
+import sys
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+
+class Difficulty(Enum):
+    EASY = "easy"
+    MEDIUM = "medium"  # open-ended /generate-question and /question prompts
+    MODERATE = "moderate"
+    HARD = "hard"
+
+
+class Segment(Enum):
+    MCQ = "MCQ"
+    MCQ_REASONING = "MCQ_REASONING"
+    ASSERTION_REASON = "ASSERTION_REASON"
+
+
+ASSERTION_REASON_OPTIONS: Tuple[str, ...] = (
+    "A) Both A and R are true, and R is the correct explanation of A",
+    "B) Both A and R are true, but R is NOT the correct explanation of A",
+    "C) A is true, but R is false",
+    "D) A is false, but R is true",
+)
+
+# Self-assessment options shown for open-ended /question prompts
+CONFIDENCE_OPTIONS: Tuple[Dict[str, str], ...] = (
+    {"key": "A", "text": "I understand fundamentals and can explain."},
+    {"key": "B", "text": "I can apply with guidance."},
+    {"key": "C", "text": "I am unsure about details."},
+    {"key": "D", "text": "I need a basic explanation."},
+)
+
+_shared_option_sets: Dict[tuple, tuple] = {}
+
+
+def register_option_set(options: Iterable[Any]) -> tuple:
+    """Make `options` a shared set: later equal option lists reuse this tuple."""
+    key = tuple(_freeze(o) for o in options)
+    return _shared_option_sets.setdefault(key, tuple(options))
+
+
+def intern_options(options: Iterable[Any]) -> tuple:
+    """Return the shared tuple for a known option set, else a private tuple."""
+    options = tuple(options)
+    try:
+        return _shared_option_sets.get(tuple(_freeze(o) for o in options), options)
+    except TypeError:  # unhashable option payloads
+        return options
+
+
+def _freeze(option: Any) -> Any:
+    return tuple(option.items()) if isinstance(option, dict) else option
+
+
+register_option_set(ASSERTION_REASON_OPTIONS)
+register_option_set(CONFIDENCE_OPTIONS)
+
+_UNSET = object()
+_ENUMS = {"difficulty": Difficulty, "segment": Segment}
+_SHORT_STRINGS = ("topic", "correct_answer", "selected_option")
+
+
+def _encode(key: str, value: Any) -> Any:
+    enum = _ENUMS.get(key)
+    if enum is not None:
+        try:
+            return enum(value)
+        except ValueError:
+            pass
+    if key == "options" and isinstance(value, (list, tuple)):
+        return intern_options(value)
+    if key in _SHORT_STRINGS and isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _decode(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class _Record(Mapping):
+    """Slots-backed read-only mapping over a fixed set of known keys."""
+
+    __slots__ = ("extra",)
+    FIELDS: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    def __init__(self, data: Dict[str, Any]):
+        for name in self.FIELDS:
+            value = data.get(name, _UNSET)
+            object.__setattr__(self, name, _UNSET if value is _UNSET else _encode(name, value))
+        extra = {k: v for k, v in data.items() if k not in self._field_set}
+        object.__setattr__(self, "extra", extra or None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        return data if isinstance(data, cls) else cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is _UNSET:
+                raise KeyError(key)
+            return _decode(value)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if getattr(self, name) is not _UNSET:
+                yield name
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {}
+        for key in self:
+            value = self[key]
+            if isinstance(value, tuple):
+                # Copy dict options: the tuple may be a set shared by every question
+                value = [dict(v) if isinstance(v, dict) else v for v in value]
+            elif isinstance(value, _Record):
+                value = value.to_dict()
+            out[key] = value
+        return out
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class Question(_Record):
+    """A generated or UI question as stored in a session."""
+
+    __slots__ = FIELDS = (
+        "question_id", "question", "options", "correct_answer", "topic",
+        "difficulty", "segment", "reasoning_required",
+    )
+    _field_set = frozenset(FIELDS)
+
+
+class Analysis(_Record):
+    """Scores for one answer, from answer_grader or analyze_response."""
+
+    __slots__ = FIELDS = (
+        "clarity", "correctness", "confidence", "reasoning_quality", "short_feedback",
+        "is_correct", "graded_locally",
+    )
+    _field_set = frozenset(FIELDS)
+
+
+class Response(_Record):
+    """One submitted answer; its analysis is stored as an Analysis."""
+
+    __slots__ = FIELDS = (
+        "question_id", "topic", "selected_option", "explanation", "self_confidence",
+        "time_taken_seconds", "analysis",
+    )
+    _field_set = frozenset(FIELDS)
+
+    def __init__(self, data: Dict[str, Any]):
+        analysis = data.get("analysis")
+        if isinstance(analysis, dict):
+            data = {**data, "analysis": Analysis(analysis)}
+        super().__init__(data)
@@ -0,0 +1,130 @@
+"""
+Adaptive question sequencing.
+
+Keeps a per-session ability estimate (Rasch/Elo-style update from each
+graded response) and picks the next item that is most informative at
+that ability, i.e. whose predicted success probability is closest to 50%,
+while spreading questions across topics. Items come from a pre-generated
+bank so choosing the next one is a small in-memory scan.
+"""
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+# Item difficulty on the ability (logit) scale, keyed by (difficulty, segment)
+ITEM_DIFFICULTY: Dict[Tuple[str, str], float] = {
+    ("easy", "MCQ"): -1.0,
+    ("moderate", "MCQ"): 0.0,
+    ("hard", "MCQ_REASONING"): 1.0,
+    ("hard", "ASSERTION_REASON"): 1.2,
+}
+
+# Generation parameters (difficulty, segment arg) for each item level
+LEVEL_PARAMS: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {
+    ("easy", "MCQ"): ("easy", None),
+    ("moderate", "MCQ"): ("moderate", None),
+    ("hard", "MCQ_REASONING"): ("hard", "A"),
+    ("hard", "ASSERTION_REASON"): ("hard", "B"),
+}
+
+# Elo step size: starts large so early answers move the estimate quickly,
+# then shrinks as evidence accumulates.
+K_INITIAL = 0.8
+K_MIN = 0.2
+
+
+def item_difficulty(question: Dict[str, Any]) -> float:
+    key = (question.get("difficulty", "moderate"), question.get("segment", "MCQ"))
+    return ITEM_DIFFICULTY.get(key, 0.0)
+
+
+def success_probability(ability: float, difficulty: float) -> float:
+    """Rasch model: P(correct) = 1 / (1 + exp(-(ability - difficulty)))."""
+    return 1.0 / (1.0 + math.exp(difficulty - ability))
+
+
+def item_information(ability: float, difficulty: float) -> float:
+    """Fisher information of a Rasch item at the given ability: p * (1 - p)."""
+    p = success_probability(ability, difficulty)
+    return p * (1.0 - p)
+
+
+class AdaptiveState:
+    """Per-session ability estimate and item-selection bookkeeping."""
+
+    def __init__(self, ability: float = 0.0):
+        self.ability = ability
+        self.responses = 0
+        self.served: set = set()
+        self.answered: set = set()
+        self.topic_counts: Dict[str, int] = {}
+
+    def record_outcome(self, question: Dict[str, Any], analysis: Dict[str, Any]) -> float:
+        """
+        Update the ability estimate from a graded response and return it.
+
+        Uses is_correct from local grading when present, otherwise the
+        LLM correctness score scaled to 0-1. A repeat answer to a question
+        already recorded leaves the estimate unchanged.
+        """
+        question_id = question.get("question_id")
+        if question_id is not None:
+            if question_id in self.answered:
+                return self.ability
+            self.answered.add(question_id)
+
+        if "is_correct" in analysis:
+            observed = 1.0 if analysis["is_correct"] else 0.0
+        else:
+            try:
+                observed = max(0.0, min(1.0, float(analysis.get("correctness", 0)) / 100.0))
+            except Exception:
+                observed = 0.0
+
+        expected = success_probability(self.ability, item_difficulty(question))
+        k = max(K_MIN, K_INITIAL / math.sqrt(self.responses + 1))
+        self.ability += k * (observed - expected)
+        self.responses += 1
+        return self.ability
+
+    def mark_served(self, question: Dict[str, Any]) -> None:
+        self.served.add(question.get("question_id"))
+        topic = question.get("topic", "")
+        self.topic_counts[topic] = self.topic_counts.get(topic, 0) + 1
+
+    def next_question(self, bank: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Pick the unserved bank item with the highest information, discounted
+        by how often its topic has been served. Returns None when the bank
+        is exhausted.
+        """
+        # Only a handful of levels exist, so score each level once
+        level_info = {k: item_information(self.ability, b) for k, b in ITEM_DIFFICULTY.items()}
+        best = None
+        best_score = -1.0
+        for q in bank:
+            if q.get("question_id") in self.served:
+                continue
+            info = level_info.get((q.get("difficulty", "moderate"), q.get("segment", "MCQ")))
+            if info is None:
+                info = item_information(self.ability, item_difficulty(q))
+            score = info / (1 + self.topic_counts.get(q.get("topic", ""), 0))
+            if score > best_score:
+                best, best_score = q, score
+        if best is not None:
+            self.mark_served(best)
+        return best
+
+    def next_level(self) -> Tuple[str, Optional[str]]:
+        """(difficulty, segment) to generate when no bank item is available."""
+        key = max(ITEM_DIFFICULTY, key=lambda k: item_information(self.ability, ITEM_DIFFICULTY[k]))
+        return LEVEL_PARAMS[key]
+
+    def least_covered_topic(self, topics: List[str]) -> str:
+        return min(topics, key=lambda t: self.topic_counts.get(t, 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ability": round(self.ability, 3),
+            "responses": self.responses,
+            "topic_counts": dict(self.topic_counts),
+        }
@@ -0,0 +1,77 @@
+"""
+Local answer grading.
+
+Objective MCQ answers can be graded by comparing the selected option with
+the question's stored correct_answer, so no LLM call is needed. Only
+questions that require free-text reasoning are sent to Gemini.
+"""
+from typing import Dict, Any, Optional
+
+
+def needs_llm_grading(question: Dict[str, Any]) -> bool:
+    """True when the question cannot be graded from its answer key alone."""
+    if question.get("reasoning_required", False):
+        return True
+    return not _normalize_option(question.get("correct_answer"))
+
+
+def grade_mcq_response(
+    question: Dict[str, Any],
+    selected_option: Any,
+    self_confidence: Any = 50,
+) -> Optional[Dict[str, Any]]:
+    """
+    Grade an MCQ answer locally.
+
+    Returns an analysis dict with the same keys as analyze_response
+    ({clarity, correctness, confidence, reasoning_quality, short_feedback})
+    plus {is_correct, graded_locally}, or None if the question needs
+    LLM grading or no option was selected.
+    """
+    if needs_llm_grading(question):
+        return None
+
+    selected = _normalize_option(selected_option)
+    if not selected:
+        return None
+
+    correct_answer = _normalize_option(question.get("correct_answer"))
+    is_correct = selected == correct_answer
+    score = 100 if is_correct else 0
+
+    # Self-confidence alignment: high confidence on a correct answer (or low
+    # confidence on a wrong one) means the student knows what they know.
+    stated = _clamp_percent(self_confidence)
+    alignment = stated if is_correct else 100 - stated
+
+    if is_correct:
+        feedback = f"Correct. {correct_answer} is the right answer."
+    else:
+        feedback = f"Incorrect. You chose {selected}; the correct answer is {correct_answer}."
+
+    return {
+        "clarity": score,
+        "correctness": score,
+        "confidence": alignment,
+        "reasoning_quality": score,
+        "short_feedback": feedback,
+        "is_correct": is_correct,
+        "graded_locally": True,
+    }
+
+
+def _normalize_option(value: Any) -> str:
+    """Reduce "b", "B)", "B) some text" to the option letter "B"."""
+    if not isinstance(value, str):
+        return ""
+    value = value.strip().upper()
+    if value and value[0] in "ABCD" and (len(value) == 1 or not value[1].isalpha()):
+        return value[0]
+    return ""
+
+
+def _clamp_percent(value: Any) -> int:
+    try:
+        return max(0, min(100, int(round(float(value)))))
+    except Exception:
+        return 50
@@ -0,0 +1,202 @@
+"""
+Cohort analytics over many responses.
+
+Packs analyses into a NumPy structured array (one column per dimension plus
+session/topic/difficulty codes) and computes weighted scores, status labels,
+weak-point flags, percentiles and per-topic/per-difficulty breakdowns with
+vectorized operations instead of per-dict loops.
+"""
+from typing import Iterable, List, Dict, Any, Sequence
+
+from .confidence_engine import DIMENSIONS, SCORE_WEIGHTS, STATUS_THRESHOLDS, WEAK_POINT_RULES
+from app.lazy_imports import optional_import
+
+np = None  # imported on first use by _require_numpy()
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class CohortFrame:
+    """Columnar view of a cohort's analyses.
+
+    `rows` is a structured array with float64 columns per dimension and
+    int32 `session`, `topic`, `difficulty` codes indexing the label lists.
+    """
+
+    def __init__(self, rows, sessions: List[str], topics: List[str], difficulties: List[str]):
+        self.rows = rows
+        self.sessions = sessions
+        self.topics = topics
+        self.difficulties = difficulties
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+class NumpyUnavailable(RuntimeError):
+    """numpy is not installed, so cohort analytics cannot run."""
+
+
+def _require_numpy():
+    global np
+    if np is None:
+        np = optional_import("numpy")
+    if np is None:
+        raise NumpyUnavailable("numpy is not installed")
+
+
+def _dtype():
+    # float64 so weighted_scores blends exactly as evaluate_concept does;
+    # float32 shifts scores across a rounding (and status) boundary
+    return np.dtype(
+        [(k, np.float64) for k in DIMENSIONS]
+        + [("session", np.int32), ("topic", np.int32), ("difficulty", np.int32)]
+    )
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return 0.0
+
+
+def pack_analyses(records: Iterable[Dict[str, Any]]) -> CohortFrame:
+    """
+    Build a CohortFrame from records shaped like
+    {"session_id": str, "topic": str, "difficulty": str, "analysis": {clarity, ...}}.
+    Missing or non-numeric dimension values count as 0, as in evaluate_concept.
+    """
+    _require_numpy()
+    codes: List[Dict[str, int]] = [{}, {}, {}]
+    packed: List[tuple] = []
+    for r in records:
+        a = r.get("analysis") or {}
+        labels = (
+            str(r.get("session_id", "")),
+            str(r.get("topic") or "Concept"),
+            str(r.get("difficulty") or "unknown"),
+        )
+        ids = tuple(table.setdefault(label, len(table)) for table, label in zip(codes, labels))
+        packed.append(tuple(_to_float(a.get(k, 0)) for k in DIMENSIONS) + ids)
+
+    rows = np.array(packed, dtype=_dtype())
+    return CohortFrame(rows, *(list(table) for table in codes))
+
+
+def collect_session_records(sessions: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten the session store into pack_analyses records."""
+    records: List[Dict[str, Any]] = []
+    # Snapshot: requests may create or expire sessions while this runs
+    for session_id, session in list(sessions.items()):
+        difficulty_by_question = {
+            q.get("question_id"): q.get("difficulty") for q in session.get("questions", [])
+        }
+        for resp in session.get("responses", []):
+            if not resp.get("analysis"):
+                continue
+            records.append({
+                "session_id": session_id,
+                "topic": resp.get("topic") or session.get("topic"),
+                "difficulty": difficulty_by_question.get(resp.get("question_id")),
+                "analysis": resp["analysis"],
+            })
+    return records
+
+
+def weighted_scores(frame: CohortFrame):
+    """Blended 0-100 confidence score per row (same weights as evaluate_concept)."""
+    _require_numpy()
+    rows = frame.rows
+    score = np.zeros(len(rows), dtype=np.float64)
+    for k, w in SCORE_WEIGHTS.items():
+        score += w * rows[k]
+    return np.round(score)
+
+
+def status_labels(scores):
+    """Vectorized _status_label: array of "Strong"/"Medium"/"Weak"."""
+    _require_numpy()
+    labels = np.full(len(scores), "Weak", dtype=object)
+    # Walk thresholds low to high so higher labels overwrite lower ones
+    for minimum, label in reversed(STATUS_THRESHOLDS):
+        labels[scores >= minimum] = label
+    return labels
+
+
+def weak_point_flags(frame: CohortFrame) -> Dict[str, Any]:
+    """Boolean array per weak-point label, True where the row is below threshold."""
+    _require_numpy()
+    return {label: frame.rows[key] < threshold for key, threshold, label in WEAK_POINT_RULES}
+
+
+def _group_means(codes, n_groups: int, values):
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    return np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)
+
+
+def _breakdown(frame: CohortFrame, column: str, labels: List[str], scores) -> Dict[str, Any]:
+    codes = frame.rows[column]
+    n = len(labels)
+    counts = np.bincount(codes, minlength=n)
+    mean_score = _group_means(codes, n, scores)
+    dim_means = {k: _group_means(codes, n, frame.rows[k]) for k in DIMENSIONS}
+    out: Dict[str, Any] = {}
+    for i, label in enumerate(labels):
+        out[label] = {
+            "responses": int(counts[i]),
+            "confidence_score": round(float(mean_score[i]), 2),
+            "dimensions": {k: round(float(dim_means[k][i]), 2) for k in DIMENSIONS},
+        }
+    return out
+
+
+def cohort_report(frame: CohortFrame, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    """
+    Summarize a cohort:
+    {
+      "responses": int,
+      "sessions": int,
+      "score_percentiles": {"p50": float, ...},
+      "session_score_percentiles": {"p50": float, ...},
+      "status_counts": {"Strong": int, "Medium": int, "Weak": int},
+      "weak_point_rates": {label: float},   # fraction of responses flagged
+      "topics": {topic: {responses, confidence_score, dimensions}},
+      "difficulties": {difficulty: {...}},
+    }
+    """
+    _require_numpy()
+    if len(frame) == 0:
+        return {
+            "responses": 0,
+            "sessions": 0,
+            "score_percentiles": {},
+            "session_score_percentiles": {},
+            "status_counts": {},
+            "weak_point_rates": {},
+            "topics": {},
+            "difficulties": {},
+        }
+
+    scores = weighted_scores(frame)
+    labels = status_labels(scores)
+    names, counts = np.unique(labels, return_counts=True)
+    flags = weak_point_flags(frame)
+    session_scores = _group_means(frame.rows["session"], len(frame.sessions), scores)
+
+    return {
+        "responses": len(frame),
+        "sessions": len(frame.sessions),
+        "score_percentiles": _percentiles(scores, percentiles),
+        "session_score_percentiles": _percentiles(session_scores, percentiles),
+        "status_counts": {str(n): int(c) for n, c in zip(names, counts)},
+        "weak_point_rates": {label: round(float(f.mean()), 4) for label, f in flags.items()},
+        "topics": _breakdown(frame, "topic", frame.topics, scores),
+        "difficulties": _breakdown(frame, "difficulty", frame.difficulties, scores),
+    }
+
+
+def _percentiles(values, percentiles: Sequence[float]) -> Dict[str, float]:
+    points = np.percentile(values, percentiles)
+    return {f"p{p:g}": round(float(v), 2) for p, v in zip(percentiles, points)}
@@ -3,16 +3,25 @@ Concept extraction utilities.
 
 Given raw text, derive concept-level chunks with titles and summaries.
 """
-from typing import List, Dict, Any
-from .pdf_parser import normalize_text, split_into_sections
+from typing import List, Dict, Any, Optional
+from .pdf_parser import normalize_text, split_into_sections, section_hash
 
 
-def extract_concepts(text: str) -> List[Dict[str, Any]]:
-    """Return a list of concept dicts: {title, content, summary}."""
+def extract_concepts(text: str, previous: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Return a list of concept dicts: {title, content, summary}.
+
+    `previous` maps section_hash -> concept from an earlier ingest of the
+    same document; unchanged sections reuse that concept as-is.
+    """
     clean = normalize_text(text)
     sections = split_into_sections(clean)
     concepts: List[Dict[str, Any]] = []
     for title, content in sections:
+        if previous:
+            concept = previous.get(section_hash(title, content))
+            if concept is not None:
+                concepts.append(concept)
+                continue
         summary = summarize(content)
         concepts.append({"title": title, "content": content, "summary": summary})
     return concepts
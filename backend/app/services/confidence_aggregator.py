@@ -0,0 +1,97 @@
+"""
+Incremental confidence aggregation.
+
+Keeps running (Welford) statistics per concept and per analysis dimension
+so a session's confidence report can be served in O(topics) without
+re-scanning its responses. Each add() is O(1).
+"""
+import math
+from typing import Dict, Any, Optional
+
+from .confidence_engine import DIMENSIONS, evaluate_averages
+
+
+class RunningStats:
+    """Welford running mean/variance for a single stream of numbers."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Population variance; 0.0 until two values have been seen."""
+        if self.count < 2:
+            return 0.0
+        return self._m2 / self.count
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 2),
+            "stddev": round(self.stddev, 2),
+        }
+
+
+class ConfidenceAggregator:
+    """Per-session running confidence statistics, overall and per topic."""
+
+    def __init__(self):
+        self._overall = {k: RunningStats() for k in DIMENSIONS}
+        self._topics: Dict[str, Dict[str, RunningStats]] = {}
+
+    @property
+    def count(self) -> int:
+        return self._overall[DIMENSIONS[0]].count
+
+    def add(self, topic: str, analysis: Dict[str, Any]) -> None:
+        """Fold one analysis ({clarity, correctness, ...}) into the running stats."""
+        per_topic = self._topics.get(topic)
+        if per_topic is None:
+            per_topic = self._topics[topic] = {k: RunningStats() for k in DIMENSIONS}
+        for k in DIMENSIONS:
+            try:
+                value = float(analysis.get(k, 0))
+            except Exception:
+                value = 0.0
+            self._overall[k].add(value)
+            per_topic[k].add(value)
+
+    def report(self, concept: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return:
+        {
+          "responses": int,
+          "overall": evaluate_concept-shaped dict (+ "dimensions"),
+          "topics": {topic: evaluate_concept-shaped dict (+ "dimensions")},
+        }
+        """
+        return {
+            "responses": self.count,
+            "overall": self._evaluate(concept or "Session", self._overall),
+            "topics": {
+                topic: self._evaluate(topic, stats)
+                for topic, stats in self._topics.items()
+            },
+        }
+
+    def _evaluate(self, concept: str, stats: Dict[str, RunningStats]) -> Dict[str, Any]:
+        avg = {k: round(stats[k].mean, 2) for k in DIMENSIONS}
+        result = evaluate_averages(concept, avg)
+        if stats[DIMENSIONS[0]].count == 0:
+            result["weak_points"] = ["insufficient data"]
+        result["dimensions"] = {k: stats[k].to_dict() for k in DIMENSIONS}
+        return result
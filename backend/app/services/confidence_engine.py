@@ -6,6 +6,28 @@ structured JSON outputs for concept-level evaluation.
 """
 from typing import List, Dict, Any
 
+# Analysis dimensions produced by analyze_response (0-100 each)
+DIMENSIONS = ["clarity", "correctness", "confidence", "reasoning_quality"]
+
+# Weighted blend prioritizing correctness and clarity
+SCORE_WEIGHTS = {
+    "correctness": 0.4,
+    "clarity": 0.35,
+    "confidence": 0.15,
+    "reasoning_quality": 0.10,
+}
+
+# Status label cut-offs on the blended score: (minimum score, label)
+STATUS_THRESHOLDS = [(75, "Strong"), (50, "Medium")]
+
+# (dimension, threshold, label): a dimension averaging below threshold is a weak point
+WEAK_POINT_RULES = [
+    ("correctness", 60, "correctness"),
+    ("clarity", 60, "clarity"),
+    ("reasoning_quality", 60, "reasoning quality"),
+    ("confidence", 50, "self-confidence alignment"),
+]
+
 
 def evaluate_concept(concept: str, analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
@@ -29,11 +51,15 @@ def evaluate_concept(concept: str, analyses: List[Dict[str, Any]]) -> Dict[str,
             "recommendation": "Collect more responses and re-evaluate.",
         }
 
-    avg = _average_scores(analyses)
-    # Weighted blend prioritizing correctness and clarity
-    score = round(
-        0.4 * avg["correctness"] + 0.35 * avg["clarity"] + 0.15 * avg["confidence"] + 0.10 * avg["reasoning_quality"]
-    )
+    return evaluate_averages(concept, _average_scores(analyses))
+
+
+def evaluate_averages(concept: str, avg: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Same output as evaluate_concept, but from already-averaged dimension
+    scores (e.g. the running means kept by ConfidenceAggregator).
+    """
+    score = round(sum(w * avg[k] for k, w in SCORE_WEIGHTS.items()))
 
     status = _status_label(score)
     weak_points = _weak_points(avg)
@@ -49,7 +75,7 @@ def evaluate_concept(concept: str, analyses: List[Dict[str, Any]]) -> Dict[str,
 
 
 def _average_scores(analyses: List[Dict[str, Any]]) -> Dict[str, float]:
-    keys = ["clarity", "correctness", "confidence", "reasoning_quality"]
+    keys = DIMENSIONS
     totals = {k: 0.0 for k in keys}
     for a in analyses:
         for k in keys:
@@ -62,23 +88,14 @@ def _average_scores(analyses: List[Dict[str, Any]]) -> Dict[str, float]:
 
 
 def _status_label(score: int) -> str:
-    if score >= 75:
-        return "Strong"
-    if score >= 50:
-        return "Medium"
+    for minimum, label in STATUS_THRESHOLDS:
+        if score >= minimum:
+            return label
     return "Weak"
 
 
 def _weak_points(avg: Dict[str, float]) -> List[str]:
-    points: List[str] = []
-    if avg["correctness"] < 60:
-        points.append("correctness")
-    if avg["clarity"] < 60:
-        points.append("clarity")
-    if avg["reasoning_quality"] < 60:
-        points.append("reasoning quality")
-    if avg["confidence"] < 50:
-        points.append("self-confidence alignment")
+    points = [label for key, threshold, label in WEAK_POINT_RULES if avg[key] < threshold]
     return points or ["review fundamentals"]
 
 
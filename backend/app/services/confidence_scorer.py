@@ -1,45 +1,133 @@
-def compute_confidence(session):
-    responses = session["responses"]
-    analyses = session["analysis"]
+"""
+Timing-aware streaming confidence scorer.
 
-    if not responses or not analyses:
+Folds each answer's response latency and clarity into rolling statistics
+as it arrives, so the session-level timing confidence is always current
+and memory stays constant regardless of how many answers are recorded.
+"""
+import math
+from collections import deque
+from typing import Dict, Any, Optional
+
+from .confidence_aggregator import RunningStats
+
+# Answers at or under this latency get full speed credit; slower answers
+# are credited proportionally (30s -> 1.0, 60s -> 0.5).
+REFERENCE_SECONDS = 30.0
+
+# Self-confidence alignment (0-100) at or above which an answer counts as
+# confidently stated when the analysis has no confidence_language field.
+HIGH_CONFIDENCE_THRESHOLD = 70
+
+# Blend of the 0-1 signals into the 0-100 confidence score. Without latency
+# data the speed term is dropped and the other weights are scaled up.
+SCORE_WEIGHTS = {"clarity": 40, "speed": 30, "consistency": 30}
+
+# How many recent feedback lines to keep for the insights list
+MAX_INSIGHTS = 5
+
+
+class StreamingConfidenceScorer:
+    """Rolling latency/clarity/consistency stats for one session."""
+
+    def __init__(self):
+        self.latency = RunningStats()
+        self.clarity = RunningStats()
+        self.high_confidence = 0
+        self.insights: deque = deque(maxlen=MAX_INSIGHTS)
+
+    @property
+    def count(self) -> int:
+        return self.clarity.count
+
+    def record(self, time_taken_seconds: Optional[float], analysis: Dict[str, Any]) -> None:
+        """Fold one answer into the rolling statistics.
+
+        A missing, non-numeric, non-finite or non-positive time_taken_seconds
+        records the answer without a latency.
+        """
+        latency = _seconds(time_taken_seconds)
+        if latency is not None:
+            self.latency.add(latency)
+
+        self.clarity.add(_clarity_fraction(analysis))
+        if _confidence_language(analysis) == "high":
+            self.high_confidence += 1
+
+        insight = analysis.get("insight") or analysis.get("short_feedback")
+        if insight:
+            self.insights.append(insight)
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        if self.count == 0:
+            return None
+
+        consistency = self.high_confidence / self.count
+        signals = {"clarity": self.clarity.mean}
+
+        if self.latency.count:
+            avg_time = self.latency.mean
+            signals["speed"] = min(1.0, REFERENCE_SECONDS / max(avg_time, 1e-6))
+        else:
+            # No timing data: score on clarity and consistency alone
+            avg_time = 0.0
+        signals["consistency"] = consistency
+
+        # ---- Weighted Confidence Score ----
+        total_weight = sum(SCORE_WEIGHTS[k] for k in signals)
+        confidence_score = sum(SCORE_WEIGHTS[k] * v for k, v in signals.items()) * 100 / total_weight
+        confidence_score = min(round(confidence_score), 100)
+
+        # ---- Label ----
+        if confidence_score >= 75:
+            label = "Strong Confidence"
+        elif confidence_score >= 50:
+            label = "Moderate Confidence"
+        else:
+            label = "Needs Clarity"
+
+        return {
+            "confidence_score": confidence_score,
+            "confidence_label": label,
+            "average_response_time": round(avg_time),
+            "response_time_stddev": round(self.latency.stddev, 2),
+            "consistency_score": round(consistency * 100),
+            "answers": self.count,
+            "insights": list(self.insights),
+        }
+
+
+def compute_confidence(session: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the session's current timing-aware confidence, or None if no answers yet."""
+    scorer = session.get("timing")
+    if scorer is None:
         return None
+    return scorer.result()
+
+
+def _seconds(value: Any) -> Optional[float]:
+    """value as a positive, finite number of seconds, else None."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if math.isfinite(seconds) and seconds > 0 else None
+
+
+def _clarity_fraction(analysis: Dict[str, Any]) -> float:
+    """Clarity on a 0-1 scale: clarity_score if given, else clarity (0-100) / 100."""
+    try:
+        if "clarity_score" in analysis:
+            return max(0.0, min(1.0, float(analysis["clarity_score"])))
+        return max(0.0, min(1.0, float(analysis.get("clarity", 0)) / 100.0))
+    except Exception:
+        return 0.0
+
 
-    # ---- Average Response Time ----
-    avg_time = sum(r["time_taken_seconds"] for r in responses) / len(responses)
-
-    # ---- Gemini Clarity Score ----
-    avg_clarity = sum(a["clarity_score"] for a in analyses) / len(analyses)
-
-    # ---- Consistency Score ----
-    consistency = len(
-        [a for a in analyses if a["confidence_language"] == "high"]
-    ) / len(analyses)
-
-    # ---- Weighted Confidence Score ----
-    confidence_score = (
-        avg_clarity * 40 +
-        (1 / avg_time) * 30 +
-        consistency * 30
-    ) * 100
-
-    confidence_score = min(round(confidence_score), 100)
-
-    # ---- Label ----
-    if confidence_score >= 75:
-        label = "Strong Confidence"
-    elif confidence_score >= 50:
-        label = "Moderate Confidence"
-    else:
-        label = "Needs Clarity"
-
-    # ---- Insights ----
-    insights = [a["insight"] for a in analyses]
-
-    return {
-        "confidence_score": confidence_score,
-        "confidence_label": label,
-        "average_response_time": round(avg_time),
-        "consistency_score": round(consistency * 100),
-        "insights": insights
-    }
+def _confidence_language(analysis: Dict[str, Any]) -> str:
+    if "confidence_language" in analysis:
+        return analysis["confidence_language"]
+    try:
+        return "high" if float(analysis.get("confidence", 0)) >= HIGH_CONFIDENCE_THRESHOLD else "low"
+    except Exception:
+        return "low"
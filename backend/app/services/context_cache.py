@@ -0,0 +1,125 @@
+"""
+Provider-side context caching for static prompt prefixes.
+
+The static prefix of a prompt template (see app.services.prompts) is
+uploaded once as a Gemini cachedContents resource; later calls send only
+the dynamic tail plus the cache handle. Handles are refreshed (TTL
+extended) shortly before they expire, recreated if the provider has
+dropped them, and prefixes the provider refuses to cache (e.g. below the
+model's minimum size) are not retried until a back-off has passed.
+
+The actual HTTP calls are injected by gemini_analyzer, so this module only
+holds the bookkeeping.
+
+Environment:
+    GEMINI_CONTEXT_CACHE        "1" to enable (default 0)
+    GEMINI_CACHE_TTL_SECONDS    TTL requested for each handle (default 3600)
+    GEMINI_CACHE_MIN_TOKENS     skip prefixes smaller than this estimate (default 1024)
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .metrics import inc
+from .prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_CACHE_ENABLED = os.getenv("GEMINI_CONTEXT_CACHE", "0") == "1"
+CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", "3600"))
+CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CACHE_MIN_TOKENS", "1024"))
+# Refresh when less than this fraction of the TTL is left
+REFRESH_FRACTION = 0.1
+# After a failed create, send full prompts for this long before trying again
+FAILURE_BACKOFF_SECONDS = 600
+
+CreateFn = Callable[[str, str, int], str]  # (model, text, ttl) -> handle name
+RefreshFn = Callable[[str, int], None]  # (handle name, ttl) -> None, raises on failure
+
+
+class _Entry:
+    __slots__ = ("name", "expires_at", "failed_until")
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.expires_at = 0.0
+        self.failed_until = 0.0
+
+
+class ContextCache:
+    """Maps (model, prefix) to a live cachedContents handle."""
+
+    def __init__(self, create: CreateFn, refresh: RefreshFn, ttl: int = CACHE_TTL_SECONDS,
+                 min_tokens: int = CACHE_MIN_TOKENS, clock: Callable[[], float] = time.monotonic):
+        self._create = create
+        self._refresh = refresh
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self._clock = clock
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @staticmethod
+    def _key(model: str, prefix: str) -> Tuple[str, str]:
+        return model, hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+
+    def _slot(self, key) -> Tuple[_Entry, threading.Lock]:
+        with self._guard:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                self._locks[key] = threading.Lock()
+            return entry, self._locks[key]
+
+    def handle(self, model: str, prefix: str) -> Optional[str]:
+        """Return a usable handle for the prefix, creating/refreshing as needed.
+
+        Returns None when the prefix is too small or caching it failed
+        recently; the caller then sends the full prompt.
+        """
+        if estimate_tokens(prefix) < self.min_tokens:
+            return None
+        entry, lock = self._slot(self._key(model, prefix))
+        now = self._clock()
+        if entry.name and now < entry.expires_at - self.ttl * REFRESH_FRACTION:
+            inc("assessment_context_cache_total", event="hit")
+            return entry.name
+        if now < entry.failed_until:
+            return None
+
+        # One thread uploads/refreshes; others wait and reuse its handle
+        with lock:
+            now = self._clock()
+            if entry.name and now < entry.expires_at - self.ttl * REFRESH_FRACTION:
+                inc("assessment_context_cache_total", event="hit")
+                return entry.name
+            if entry.name and now < entry.expires_at:
+                try:
+                    self._refresh(entry.name, self.ttl)
+                    entry.expires_at = now + self.ttl
+                    inc("assessment_context_cache_total", event="refresh")
+                    return entry.name
+                except Exception as e:
+                    logger.info("Context cache refresh failed; recreating", extra={"handle": entry.name, "error": str(e)})
+            try:
+                entry.name = self._create(model, prefix, self.ttl)
+                entry.expires_at = now + self.ttl
+                inc("assessment_context_cache_total", event="create")
+                return entry.name
+            except Exception as e:
+                entry.name = None
+                entry.failed_until = now + FAILURE_BACKOFF_SECONDS
+                inc("assessment_context_cache_total", event="error")
+                logger.warning("Context cache create failed; sending full prompts", extra={"model": model, "error": str(e)})
+                return None
+
+    def invalidate(self, model: str, prefix: str) -> None:
+        """Forget a handle the provider no longer recognises."""
+        entry, _ = self._slot(self._key(model, prefix))
+        entry.name = None
+        entry.expires_at = 0.0
+        inc("assessment_context_cache_total", event="invalidated")
@@ -0,0 +1,179 @@
+"""
+In-memory store for ingested documents.
+
+/ingest keeps the parsed sections here under a document_id and returns only
+the outline; section content and per-section summaries are read back a
+page at a time through /documents/<id>/sections. Each document also keeps
+a BM25 index over its sections (see retrieval) for grounded question
+generation. Documents are immutable once stored, so a digest of the source
+text identifies every page of them (see page_etag) and clients can
+revalidate with If-None-Match.
+
+Re-ingesting an edited upload under the same document_id replaces the
+document in place. Every document keeps a manifest of section content
+hashes (pdf_parser.section_hash); the new sections are matched against it
+so unchanged sections keep their concept and summary (diff_sections
+reports what was reused), and the document-level LLM summary is kept when
+the edit is small (REINGEST_RESUMMARIZE_FRACTION).
+
+Environment:
+    DOCUMENT_STORE_MAX              documents kept before the oldest is evicted (default 100)
+    DOCUMENT_PAGE_MAX               largest page size /documents/<id>/sections serves (default 50)
+    REINGEST_RESUMMARIZE_FRACTION   share of changed text above which a re-ingest re-runs the
+                                    LLM summary (default 0.2)
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .pdf_parser import section_hash
+from .retrieval import BM25Index
+
+MAX_DOCUMENTS = int(os.getenv("DOCUMENT_STORE_MAX", "100"))
+MAX_PAGE_SIZE = int(os.getenv("DOCUMENT_PAGE_MAX", "50"))
+REINGEST_RESUMMARIZE_FRACTION = float(os.getenv("REINGEST_RESUMMARIZE_FRACTION", "0.2"))
+DEFAULT_PAGE_SIZE = 10
+
+# Section fields a page can be narrowed to with ?fields=
+SECTION_FIELDS = ("title", "content", "summary")
+
+# GLOBAL in-memory document store (insertion order = age)
+# NOTE: This is fine for development
+documents: Dict[str, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def create_document(text: str, sections: List[Dict[str, Any]], topics: List[str],
+                    summary: Dict[str, Any], source: str, document_id: Optional[str] = None,
+                    summary_pending: bool = False) -> str:
+    """Store parsed sections ({title, content, summary}) and return the document_id.
+
+    Passing an existing document_id replaces that document (re-ingest).
+    summary_pending marks a summary that a background LLM summary will
+    replace (see document_summary).
+    """
+    document_id = document_id or str(uuid.uuid4())
+    document = {
+        "document_id": document_id,
+        "digest": text_digest(text),
+        "source": source,
+        "topics": topics,
+        "summary": summary,
+        "summary_pending": summary_pending,
+        "sections": sections,
+        "manifest": [section_hash(s["title"], s["content"]) for s in sections],
+        "index": BM25Index.from_sections(sections),
+        # section_hash -> Future of a prefetched explanation (see explanation_prefetch)
+        "explanations": {},
+        "outline": [
+            {"index": i, "title": s["title"], "chars": len(s.get("content", ""))}
+            for i, s in enumerate(sections)
+        ],
+    }
+    with _lock:
+        # (re)insert as the newest document
+        documents.pop(document_id, None)
+        documents[document_id] = document
+        while len(documents) > MAX_DOCUMENTS:
+            del documents[next(iter(documents))]
+    return document_id
+
+
+def get_document(document_id: str) -> Dict[str, Any] | None:
+    return documents.get(document_id)
+
+
+def replace_summary(document: Dict[str, Any], summary: Optional[Dict[str, Any]]) -> None:
+    """Finish a pending summary: swap in `summary` (None keeps the current one).
+
+    Ignored if the document has since been re-ingested or evicted.
+    """
+    with _lock:
+        if documents.get(document["document_id"]) is not document:
+            return
+        if summary is not None:
+            document["summary"] = summary
+        document["summary_pending"] = False
+
+
+def reusable_sections(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """section_hash -> stored section, for extract_concepts(previous=...)."""
+    return dict(zip(document["manifest"], document["sections"]))
+
+
+def diff_sections(previous: Dict[str, Any], sections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """How a re-ingest's sections compare with the stored document's.
+
+    Returns {"reused", "recomputed", "removed"} section counts and
+    "changed_fraction": added plus removed characters over the larger of the
+    old and new document sizes. Sections are matched as a multiset, so a
+    duplicated section that loses a copy counts one removal (and an extra
+    copy counts as added text, though its concept is reused).
+    """
+    old = reusable_sections(previous)
+    unmatched = Counter(previous["manifest"])
+    reused = recomputed = changed_chars = 0
+    for section in sections:
+        key = section_hash(section["title"], section["content"])
+        if old.get(key) is section:
+            reused += 1
+        else:
+            recomputed += 1
+        if unmatched[key] > 0:
+            unmatched[key] -= 1
+        else:
+            changed_chars += len(section["content"])
+    removed = sum(unmatched.values())
+    changed_chars += sum(len(old[key]["content"]) * n for key, n in unmatched.items())
+    total = max(sum(len(s["content"]) for s in sections), sum(len(s["content"]) for s in previous["sections"]), 1)
+    return {
+        "reused": reused,
+        "recomputed": recomputed,
+        "removed": removed,
+        "changed_fraction": round(changed_chars / total, 4),
+    }
+
+
+def describe_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """The outline view returned by /ingest and GET /documents/<id>."""
+    return {
+        "document_id": document["document_id"],
+        "topics": document["topics"],
+        "outline": document["outline"],
+        "section_count": len(document["sections"]),
+        "summary": document["summary"],
+        "summary_pending": document["summary_pending"],
+    }
+
+
+def page_etag(document: Dict[str, Any], *parts: Any) -> str:
+    """Strong ETag for a view of the document; `parts` distinguish the view (offset, limit, fields)."""
+    return "-".join([document["digest"], *(str(p) for p in parts)])
+
+
+def get_sections(document: Dict[str, Any], offset: int, limit: int,
+                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """One page of sections, each narrowed to `fields` (all of SECTION_FIELDS by default)."""
+    sections = document["sections"]
+    total = len(sections)
+    fields = fields or SECTION_FIELDS
+    page = [
+        {"index": i, **{f: sections[i].get(f) for f in fields}}
+        for i in range(offset, min(offset + limit, total))
+    ]
+    next_offset = offset + limit if offset + limit < total else None
+    return {
+        "document_id": document["document_id"],
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "next_offset": next_offset,
+        "sections": page,
+    }
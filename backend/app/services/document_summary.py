@@ -0,0 +1,117 @@
+"""
+Summary tiers for ingested documents.
+
+    heuristic   build_structured_summary: first sentences, no dependencies
+    textrank    local extractive summary (app.services.textrank), ~tens of ms
+    vertex_ai   summarize_text: the LLM summary, seconds and billed
+
+SUMMARY_MODE picks how /ingest combines them:
+
+    llm     LLM summary, heuristic on failure (the original behaviour)
+    local   TextRank only (heuristic if numpy/scipy are missing)
+    auto    TextRank outright for documents up to SUMMARY_LOCAL_MAX_WORDS;
+            larger ones get the TextRank summary immediately and the LLM
+            summary replaces it in the background (summary_pending is true
+            on the document until then)
+
+Environment:
+    SUMMARY_MODE                "llm", "local" or "auto" (default auto)
+    SUMMARY_LOCAL_MAX_WORDS     largest document auto mode summarizes locally only (default 1500)
+    SUMMARY_BACKGROUND_WORKERS  concurrent background LLM summaries (default 2)
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from .document_store import get_document, replace_summary
+from .metrics import span, record_fallback
+from .pdf_parser import build_structured_summary
+from .textrank import textrank_summary
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "auto")
+LOCAL_MAX_WORDS = int(os.getenv("SUMMARY_LOCAL_MAX_WORDS", "1500"))
+BACKGROUND_WORKERS = int(os.getenv("SUMMARY_BACKGROUND_WORKERS", "2"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _heuristic_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]], source: str) -> Dict[str, Any]:
+    with span("summarize_heuristic"):
+        summary = build_structured_summary(text, topics, concepts)
+    summary["source"] = source or "heuristic"
+    return summary
+
+
+def _summarize_with_llm(text: str) -> Dict[str, Any]:
+    from app.services.vertex_summarizer import summarize_text
+
+    with span("summarize"):
+        summary = summarize_text(text)
+    summary["source"] = "vertex_ai"
+    return summary
+
+
+def llm_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]], source: str) -> Dict[str, Any]:
+    """LLM summary; heuristic summary if the LLM call fails."""
+    try:
+        return _summarize_with_llm(text)
+    except Exception as e:
+        logger.warning("Summarization fell back to heuristic", extra={"error": str(e)})
+        record_fallback("summarize")
+        return _heuristic_summary(text, topics, concepts, source)
+
+
+def local_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]], source: str) -> Dict[str, Any]:
+    """TextRank summary; heuristic summary if it can't run (e.g. scipy missing)."""
+    try:
+        with span("summarize_textrank"):
+            summary = textrank_summary(text, topics, concepts)
+        summary["source"] = "textrank"
+        return summary
+    except Exception as e:
+        logger.info("TextRank summary unavailable; using heuristic", extra={"error": str(e)})
+        return _heuristic_summary(text, topics, concepts, source)
+
+
+def initial_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]],
+                    source: str) -> Tuple[Dict[str, Any], bool]:
+    """The summary /ingest responds with, and whether an LLM summary should follow in the background."""
+    if SUMMARY_MODE == "llm":
+        return llm_summary(text, topics, concepts, source), False
+    summary = local_summary(text, topics, concepts, source)
+    refine = SUMMARY_MODE == "auto" and len(text.split()) > LOCAL_MAX_WORDS
+    return summary, refine
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="summary")
+        return _executor
+
+
+def summarize_in_background(document_id: str, text: str) -> None:
+    """Replace the stored document's summary with the LLM summary once it's ready.
+
+    If the LLM call fails the local summary stays; if the document was
+    replaced (re-ingest) or evicted meanwhile, the result is dropped.
+    """
+    document = get_document(document_id)
+
+    def run():
+        try:
+            summary = _summarize_with_llm(text)
+        except Exception as e:
+            logger.warning("Background summary failed; keeping local summary",
+                           extra={"document_id": document_id, "error": str(e)})
+            record_fallback("summarize")
+            summary = None
+        replace_summary(document, summary)
+
+    _get_executor().submit(run)
@@ -5,7 +5,21 @@ Generates simple-language explanations with real-world examples.
 Uses Gemini when available; falls back to rule-based formatting.
 """
 from typing import Dict
-from .gemini_analyzer import call_gemini
+from .gemini_analyzer import call_gemini_prompt
+from .llm_json import decode_llm_json
+from .metrics import span, record_fallback
+
+
+def explain_with_llm(title: str, content: str) -> Dict[str, str]:
+    """Gemini explanation; raises if the call or its JSON fails."""
+    with span("explain"):
+        text = call_gemini_prompt("explain", title=title, content=content)
+        data = decode_llm_json(text, expect=dict)
+    return {
+        "concept": title,
+        "explanation": data.get("explanation", ""),
+        "example": data.get("example", ""),
+    }
 
 
 def explain_concept(title: str, content: str) -> Dict[str, str]:
@@ -17,28 +31,10 @@ def explain_concept(title: str, content: str) -> Dict[str, str]:
       "example": str,
     }
     """
-    prompt = f"""
-You are a learning assistant.
-Explain the concept below in simple language and provide a practical example.
-
-Title: {title}
-Content: {content}
-
-Return STRICT JSON with keys:
-- explanation (string)
-- example (string)
-Only return JSON.
-"""
     try:
-        import json
-        text = call_gemini(prompt)
-        data = json.loads(text)
-        return {
-            "concept": title,
-            "explanation": data.get("explanation", ""),
-            "example": data.get("example", ""),
-        }
+        return explain_with_llm(title, content)
     except Exception:
+        record_fallback("explain")
         # Fallback: simple rephrasing
         explanation = f"{title}: In simple terms, this refers to {content[:180]}..."
         example = "For example, imagine applying this concept in a small project or daily task."
@@ -0,0 +1,123 @@
+"""
+Background prefetch of concept explanations for ingested documents.
+
+Students open explanations one concept at a time, and each one is a full
+Gemini round trip. After /ingest, prefetch_explanations queues the
+EXPLAIN_PREFETCH_COUNT largest sections of the document for
+explain_with_llm on a shared pool of EXPLAIN_PREFETCH_CONCURRENCY workers.
+The futures are kept on the document under "explanations", keyed by
+pdf_parser.section_hash, so they go away with the document (re-ingest or
+eviction) and unchanged sections carry theirs over on re-ingest.
+
+/explain asks cached_explanation first: a finished prefetch is returned
+as is and a running one is waited for, up to EXPLAIN_PREFETCH_WAIT_SECONDS.
+A prefetch that is still queued is cancelled and, like a failed or slow
+one or a concept that wasn't prefetched, counts as a miss; the route then
+generates the explanation live. A slow prefetch is left running for the
+next request.
+
+Environment:
+    EXPLAIN_PREFETCH_COUNT          sections explained in the background per ingest (default 0, off)
+    EXPLAIN_PREFETCH_CONCURRENCY    background explanation calls in flight (default 2)
+    EXPLAIN_PREFETCH_WAIT_SECONDS   longest /explain waits on a running prefetch (default 10)
+"""
+import heapq
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, Optional
+
+from .document_store import get_document
+from .explanation_engine import explain_with_llm
+from .metrics import inc
+from .pdf_parser import section_hash
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_COUNT = int(os.getenv("EXPLAIN_PREFETCH_COUNT", "0"))
+PREFETCH_CONCURRENCY = int(os.getenv("EXPLAIN_PREFETCH_CONCURRENCY", "2"))
+PREFETCH_WAIT_SECONDS = float(os.getenv("EXPLAIN_PREFETCH_WAIT_SECONDS", "10"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PREFETCH_CONCURRENCY, thread_name_prefix="explain")
+        return _executor
+
+
+def _succeeded(future: Future) -> bool:
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+def prefetch_explanations(document: Dict[str, Any], previous: Optional[Dict[str, Any]] = None,
+                          count: int = PREFETCH_COUNT) -> int:
+    """Queue background explanations for the `count` largest sections; returns how many were queued.
+
+    Explanations already made for `previous` (the document this one
+    re-ingests) are reused for sections whose content hasn't changed.
+    """
+    explanations = document["explanations"]
+    if previous is not None:
+        kept = set(document["manifest"])
+        for key, future in previous["explanations"].items():
+            if key in kept and _succeeded(future):
+                explanations[key] = future
+    if count <= 0:
+        return 0
+
+    sections = document["sections"]
+    largest = heapq.nlargest(count, range(len(sections)), key=lambda i: len(sections[i]["content"]))
+    queued = 0
+    for i in sorted(largest):
+        key = document["manifest"][i]
+        if key in explanations:
+            continue
+        title, content = sections[i]["title"], sections[i]["content"]
+        explanations[key] = _get_executor().submit(_explain, document, title, content)
+        queued += 1
+    inc("assessment_explain_prefetch_total", queued, event="queued")
+    return queued
+
+
+def _explain(document: Dict[str, Any], title: str, content: str) -> Dict[str, str]:
+    # Don't spend an LLM call on a document that was re-ingested or evicted while queued
+    if get_document(document["document_id"]) is not document:
+        raise LookupError("document no longer stored")
+    try:
+        return explain_with_llm(title, content)
+    except Exception as e:
+        logger.warning("Explanation prefetch failed",
+                       extra={"document_id": document["document_id"], "concept": title, "error": str(e)})
+        raise
+
+
+def cached_explanation(document: Dict[str, Any], title: str, content: str,
+                       wait: float = PREFETCH_WAIT_SECONDS) -> Optional[Dict[str, str]]:
+    """The prefetched explanation of one of `document`'s sections, or None on a miss."""
+    key = section_hash(title, content)
+    future = document["explanations"].get(key)
+    if future is None:
+        inc("assessment_explain_prefetch_total", event="miss")
+        return None
+    if future.cancel():
+        # Still queued behind other prefetches; the caller's live call is sooner
+        document["explanations"].pop(key, None)
+        inc("assessment_explain_prefetch_total", event="cancelled")
+        return None
+    try:
+        result = future.result(timeout=wait)
+    except FutureTimeout:
+        inc("assessment_explain_prefetch_total", event="miss")
+        return None
+    except Exception:
+        document["explanations"].pop(key, None)
+        inc("assessment_explain_prefetch_total", event="miss")
+        return None
+    inc("assessment_explain_prefetch_total", event="hit")
+    return result
@@ -1,14 +1,21 @@
 import os
+import logging
 import requests
-import json
-import re
+
+from app.services.metrics import span, record_llm_call, record_fallback
+from app.services.prompts import get_prompt
+from app.services.context_cache import ContextCache, CONTEXT_CACHE_ENABLED
+from app.services.llm_json import decode_llm_json
+
+logger = logging.getLogger(__name__)
 
 # Read Gemini config from environment
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 # Preferred model alias (without "models/" prefix). We'll auto-resolve if invalid.
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 GEMINI_API_VERSION = os.getenv("GEMINI_API_VERSION", "v1beta")
-GEMINI_BASE = "https://generativelanguage.googleapis.com"
+# Overridable so load tests can point at a local stand-in (benchmarks/fake_gemini_server.py)
+GEMINI_BASE = os.getenv("GEMINI_BASE", "https://generativelanguage.googleapis.com").rstrip("/")
 
 
 def _list_models() -> list:
@@ -20,7 +27,7 @@ def _list_models() -> list:
     try:
         data = resp.json()
     except Exception:
-        print("[Gemini] Failed to parse ListModels response:", resp.text[:500])
+        logger.warning("Failed to parse ListModels response", extra={"body": resp.text[:500]})
         return []
     models = data.get("models", [])
     return models
@@ -74,29 +81,72 @@ def _resolve_supported_model(preferred_alias: str) -> str:
     return preferred_alias
 
 
-def _strip_markdown_fences(text: str) -> str:
-    text = re.sub(r"^```json\s*", "", text, flags=re.MULTILINE)
-    text = re.sub(r"^```\s*", "", text, flags=re.MULTILINE)
-    text = re.sub(r"```\s*$", "", text, flags=re.MULTILINE)
-    return text.strip()
+def _create_cached_content(model: str, text: str, ttl: int) -> str:
+    """Upload a static prompt prefix as a cachedContents resource; returns its name."""
+    resp = requests.post(
+        f"{GEMINI_BASE}/{GEMINI_API_VERSION}/cachedContents",
+        params={"key": GEMINI_API_KEY},
+        json={
+            "model": f"models/{model}",
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+            "ttl": f"{ttl}s",
+        },
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return resp.json()["name"]
+
+
+def _refresh_cached_content(name: str, ttl: int) -> None:
+    resp = requests.patch(
+        f"{GEMINI_BASE}/{GEMINI_API_VERSION}/{name}",
+        params={"key": GEMINI_API_KEY, "updateMask": "ttl"},
+        json={"ttl": f"{ttl}s"},
+        timeout=20,
+    )
+    resp.raise_for_status()
+
+
+_context_cache = ContextCache(_create_cached_content, _refresh_cached_content)
 
 
-def call_gemini(prompt: str) -> str:
+def call_gemini(prompt: str, cacheable_prefix: str = "") -> str:
     """
     Low-level Gemini call. Returns raw text output. Auto-discovers a supported model
     and retries once on 404/not-supported errors. Falls back to generateText if needed.
+
+    If context caching is enabled and the prompt starts with `cacheable_prefix`,
+    the prefix is sent as a cached-content handle and only the rest inline.
     """
 
     if not GEMINI_API_KEY:
         raise RuntimeError("GEMINI_API_KEY is not set")
 
-    def _generate_content(model_name: str):
+    with span("llm"):
+        return _call_gemini(prompt, cacheable_prefix)
+
+
+def call_gemini_prompt(name: str, **values) -> str:
+    """Render a registered prompt and call Gemini with its static prefix cacheable."""
+    template = get_prompt(name)
+    return call_gemini(template.render(**values), cacheable_prefix=template.static)
+
+
+def _call_gemini(prompt: str, cacheable_prefix: str = "") -> str:
+    """Uninstrumented body of call_gemini."""
+
+    def _generate_content(model_name: str, handle: str = None):
         url = f"{GEMINI_BASE}/{GEMINI_API_VERSION}/models/{model_name}:generateContent"
+        if handle:
+            body = {
+                "cachedContent": handle,
+                "contents": [{"role": "user", "parts": [{"text": prompt[len(cacheable_prefix):]}]}],
+            }
+        else:
+            body = {"contents": [{"parts": [{"text": prompt}]}]}
         resp = requests.post(
             f"{url}?key={GEMINI_API_KEY}",
-            json={
-                "contents": [{"parts": [{"text": prompt}]}]
-            },
+            json=body,
             timeout=30,
         )
         return resp
@@ -115,24 +165,37 @@ def call_gemini(prompt: str) -> str:
 
     # First try with preferred or auto-resolved model
     model = _resolve_supported_model(GEMINI_MODEL)
-    print(f"[Gemini] Using model: {model} (version={GEMINI_API_VERSION})")
+    logger.debug("Using Gemini model", extra={"model": model, "api_version": GEMINI_API_VERSION})
+
+    handle = None
+    if CONTEXT_CACHE_ENABLED and cacheable_prefix and prompt.startswith(cacheable_prefix):
+        handle = _context_cache.handle(model, cacheable_prefix)
+
+    resp = _generate_content(model, handle)
+    if handle and resp.status_code in (400, 403, 404):
+        # Handle expired or was evicted provider-side; drop it and send the full prompt
+        logger.info("Cached content rejected; resending full prompt", extra={"handle": handle, "status": resp.status_code})
+        _context_cache.invalidate(model, cacheable_prefix)
+        resp = _generate_content(model)
 
-    resp = _generate_content(model)
     if resp.status_code == 404 or (resp.status_code == 400 and "not supported" in resp.text.lower()):
-        print("[Gemini] generateContent not supported or model not found. Auto-discovering...")
+        logger.info("generateContent not supported or model not found; auto-discovering", extra={"model": model})
         # Re-resolve and retry once
         model = _resolve_supported_model(model)
-        print(f"[Gemini] Retrying with model: {model}")
+        logger.info("Retrying with model", extra={"model": model})
         resp = _generate_content(model)
 
     # If still error, attempt generateText
     if resp.status_code >= 400:
-        print(f"[Gemini] generateContent failed ({resp.status_code}). Trying generateText...")
+        logger.warning("generateContent failed; trying generateText", extra={"status": resp.status_code})
         resp = _generate_text(model)
 
     # Raise if request ultimately failed
+    if resp.status_code >= 400:
+        record_llm_call(str(resp.status_code))
     resp.raise_for_status()
     data = resp.json()
+    record_llm_call("ok", data.get("usageMetadata"))
 
     # Try to parse text from generateContent response
     text = None
@@ -155,36 +218,10 @@ def analyze_response(question: str, user_answer: str) -> dict:
     Uses Gemini to analyze a user's answer and extract confidence signals.
     """
 
-    prompt = f"""
-You are an expert educational evaluator.
-
-Question: {question}
-
-Student's Answer:
-{user_answer}
-
-Evaluate the student's response on these dimensions:
-1. Clarity of explanation (0-100)
-2. Correctness of understanding (0-100)
-3. Self-confidence alignment (0-100)
-4. Quality of reasoning and examples (0-100)
-
-Provide constructive feedback focusing on strengths and areas for improvement.
-
-Output ONLY valid JSON (no markdown):
-{{
-  "clarity": <number>,
-  "correctness": <number>,
-  "confidence": <number>,
-  "reasoning_quality": <number>,
-  "short_feedback": "<your feedback>"
-}}
-"""
-
     try:
-        text = call_gemini(prompt)
-        text = _strip_markdown_fences(text)
-        result = json.loads(text)
+        with span("analyze"):
+            text = call_gemini_prompt("analyze", question=question, answer=user_answer)
+            result = decode_llm_json(text, expect=dict)
         # Validate required fields
         required = ["clarity", "correctness", "confidence", "reasoning_quality", "short_feedback"]
         if all(k in result for k in required):
@@ -192,7 +229,8 @@ Output ONLY valid JSON (no markdown):
         else:
             raise ValueError("Missing required fields in Gemini response")
     except Exception as e:
-        print(f"Gemini analysis failed: {e}")
+        logger.warning("Gemini analysis failed, using fallback scores", extra={"error": str(e)})
+        record_fallback("analyze")
         # Fallback when API fails
         return {
             "clarity": 55,
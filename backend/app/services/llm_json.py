@@ -0,0 +1,67 @@
+"""
+Decoding of JSON embedded in LLM responses.
+
+Models wrap JSON in ```json fences, prepend a sentence, or trail a note.
+decode_llm_json() handles all of these in one pass over the text: it jumps
+to the first '{' or '[' and parses from there with JSONDecoder.raw_decode,
+which stops at the end of the first complete value and ignores whatever
+follows (closing fence, commentary). Only if that fails (a stray brace in
+a preamble) does it move on to the next candidate.
+
+orjson is used for the common case where the value spans to the last
+closing bracket, when installed.
+"""
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except Exception:  # optional dependency
+    orjson = None  # type: ignore
+
+_OPENERS = re.compile(r"[\[{]")
+_CLOSER = {"{": "}", "[": "]"}
+# Give up after this many candidate start positions
+MAX_CANDIDATES = 8
+
+_decoder = json.JSONDecoder()
+_MISSING = object()
+
+
+def _loads(fragment: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(fragment)
+    return json.loads(fragment)
+
+
+def decode_llm_json(text: str, expect: type = None) -> Any:
+    """Return the first JSON object/array in `text`.
+
+    `expect` (dict or list) skips values of the other type, e.g. an
+    example array quoted in a preamble. Raises ValueError if none is found.
+    """
+    if not text:
+        raise ValueError("Empty LLM response")
+
+    for attempt, match in enumerate(_OPENERS.finditer(text)):
+        if attempt >= MAX_CANDIDATES:
+            break
+        start = match.start()
+        end = text.rfind(_CLOSER[text[start]])
+        value = _MISSING
+        if end > start:
+            # Fast path: the value runs to the last closing bracket (fences/whitespace after it)
+            try:
+                value = _loads(text[start:end + 1])
+            except ValueError:
+                pass
+        if value is _MISSING:
+            try:
+                value, _ = _decoder.raw_decode(text, start)
+            except ValueError:
+                continue
+        if expect is None or isinstance(value, expect):
+            return value
+    raise ValueError("No JSON value found in LLM response")
+
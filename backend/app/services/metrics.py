@@ -0,0 +1,173 @@
+"""
+Lightweight in-process metrics.
+
+Per-route request histograms, per-(route, stage) span histograms and
+counters for LLM calls, tokens and fallbacks, rendered in the Prometheus
+text exposition format at /metrics. No external client library needed.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple, List
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Route label for spans; set per request, "background" outside one
+_current_route: contextvars.ContextVar = contextvars.ContextVar("metrics_route", default="background")
+
+_lock = threading.Lock()
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+_histograms: Dict[str, Dict[LabelSet, _Histogram]] = {}
+_counters: Dict[str, Dict[LabelSet, float]] = {}
+
+_HELP = {
+    "assessment_request_duration_seconds": "HTTP request latency by route",
+    "assessment_stage_duration_seconds": "Service stage latency by route and stage",
+    "assessment_llm_requests_total": "LLM API calls by outcome",
+    "assessment_llm_tokens_total": "LLM tokens reported by the API, by kind",
+    "assessment_fallbacks_total": "Heuristic fallbacks taken instead of an LLM/cloud result, by stage",
+    "assessment_prompt_renders_total": "Prompts rendered, by template",
+    "assessment_context_cache_total": "Context cache handle events (hit, create, refresh, invalidated, error)",
+    "assessment_explain_prefetch_total": "Background explanation prefetches queued, and /explain lookups (hit, miss, cancelled)",
+    "assessment_question_lookahead_total": "Look-ahead questions queued, and /question lookups served from the buffer (hit, miss, cancelled)",
+    "assessment_pdf_pages_total": "PDF pages extracted, by extractor (pypdf2 text layer / document_ai OCR)",
+    "assessment_prompt_tokens_total": "Estimated prompt tokens rendered, by template and part (static prefix / dynamic tail)",
+}
+
+
+def observe(name: str, value: float, **labels: str) -> None:
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _histograms.setdefault(name, {})
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = _Histogram()
+        hist.observe(value)
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+@contextmanager
+def span(stage: str):
+    """Time a block and record it under the current route and the given stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(
+            "assessment_stage_duration_seconds",
+            time.perf_counter() - start,
+            route=_current_route.get(),
+            stage=stage,
+        )
+
+
+def record_fallback(stage: str) -> None:
+    inc("assessment_fallbacks_total", stage=stage)
+
+
+def record_llm_call(status: str, usage: Dict = None) -> None:
+    """Count one LLM call and the token counts from its usageMetadata, if any."""
+    inc("assessment_llm_requests_total", status=status)
+    if usage:
+        for kind, field in (("prompt", "promptTokenCount"), ("output", "candidatesTokenCount"),
+                            ("cached", "cachedContentTokenCount")):
+            if usage.get(field):
+                inc("assessment_llm_tokens_total", usage[field], kind=kind)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: LabelSet, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    with _lock:
+        for name, series in sorted(_histograms.items()):
+            lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in sorted(series.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS, hist.counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, (('le', '+Inf'),))} {hist.count}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {hist.total:.6f}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+        for name, series in sorted(_counters.items()):
+            lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def init_app(app) -> None:
+    """Install request timing hooks and the /metrics endpoint on a Flask app."""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+        rule = request.url_rule.rule if request.url_rule else "unmatched"
+        g._metrics_route_token = _current_route.set(rule)
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            observe(
+                "assessment_request_duration_seconds",
+                time.perf_counter() - start,
+                route=_current_route.get(),
+                method=request.method,
+                status=str(response.status_code),
+            )
+        token = g.pop("_metrics_route_token", None)
+        if token is not None:
+            _current_route.reset(token)
+        return response
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
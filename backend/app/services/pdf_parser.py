@@ -3,22 +3,71 @@ PDF and text ingestion utilities.
 
 Responsible for extracting raw text from PDFs and producing
 topic/concept level chunks suitable for downstream processing.
+
+PDF text is routed per page (extract_text_hybrid): PyPDF2 reads every
+page's text layer locally, and only pages whose text is missing or looks
+like garbage (scans, broken font encodings) are sent to Document AI, as
+small sub-PDFs processed in parallel. The results are stitched back in
+page order.
+
+Extracted PDF text keeps its page breaks (PAGE_BREAK) so that
+split_into_sections can drop running headers/footers and page numbers:
+lines in the first or last EDGE_LINES of a page that recur at the same
+position on many pages. It then coalesces its output (coalesce_sections),
+so noisy slide decks don't turn into hundreds of tiny sections for every
+later stage. Text without page breaks (pasted text) is never treated as
+having headers or footers.
+
+Environment:
+    PDF_OCR_MIN_CHARS           pages with fewer text-layer characters go to OCR (default 40)
+    DOCUMENT_AI_CHUNK_PAGES     pages per Document AI request (default 10)
+    DOCUMENT_AI_CONCURRENCY     Document AI requests in flight per upload (default 4)
+    SECTION_MIN_CHARS           sections with less content are merged into a neighbour (default 100)
+    SECTION_MAX_COUNT           at most this many sections per document (default 200)
+    BOILERPLATE_MIN_REPEATS     pages a short edge line must recur on to be a running header/footer
+                                (default 5; at least 3, fewer for documents under 10 pages)
 """
+import hashlib
+import io
+import logging
 import math
+import os
 import re
-from typing import List, Dict, Any, Tuple
+import unicodedata
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Sequence, Tuple
 
 from app.config import PROJECT_ID, DOC_AI_LOCATION, DOC_AI_PROCESSOR_ID
+from app.services.metrics import span, inc, record_fallback
+from app.lazy_imports import optional_import
+
+logger = logging.getLogger(__name__)
+
+# PyPDF2 and Document AI are imported on first use (see app.lazy_imports)
+
+OCR_MIN_CHARS = int(os.getenv("PDF_OCR_MIN_CHARS", "40"))
+DOCUMENT_AI_CHUNK_PAGES = int(os.getenv("DOCUMENT_AI_CHUNK_PAGES", "10"))
+DOCUMENT_AI_CONCURRENCY = int(os.getenv("DOCUMENT_AI_CONCURRENCY", "4"))
+# Below this share of letters/digits/whitespace (any script), common punctuation
+# and math symbols a page's text is garbage
+MIN_CLEAN_CHAR_RATIO = 0.8
+# Below this share of tokens that contain a vowel (or a non-Latin letter), a page's "words" are noise
+MIN_WORDLIKE_RATIO = 0.5
 
-try:
-    from PyPDF2 import PdfReader  # lightweight PDF text extraction
-except Exception:  # optional dependency
-    PdfReader = None  # type: ignore
+SECTION_MIN_CHARS = int(os.getenv("SECTION_MIN_CHARS", "100"))
+SECTION_MAX_COUNT = int(os.getenv("SECTION_MAX_COUNT", "200"))
+BOILERPLATE_MIN_REPEATS = int(os.getenv("BOILERPLATE_MIN_REPEATS", "5"))
+# Only lines up to this long can be running headers/footers
+BOILERPLATE_MAX_LEN = 80
+# Lines at each end of a page that may be a running header/footer
+EDGE_LINES = 2
+# Separates pages in extracted PDF text; normalize_text keeps it
+PAGE_BREAK = "\f"
 
-try:
-    from google.cloud import documentai
-except Exception:  # optional dependency
-    documentai = None  # type: ignore
+_PAGE_NUMBER = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$|^-\s*\d+\s*-$", re.IGNORECASE)
+_CLEAN_PUNCTUATION = frozenset(".,;:!?'\"()-")
+_VOWEL = re.compile(r"[aeiouyAEIOUY]")
 
 
 def extract_text_from_pdf_bytes(data: bytes) -> str:
@@ -26,33 +75,156 @@ def extract_text_from_pdf_bytes(data: bytes) -> str:
 
     Returns empty string if PyPDF2 is unavailable or parsing fails.
     """
-    if PdfReader is None:
-        return ""
+    _, pages = _read_pdf(data)
+    return PAGE_BREAK.join(pages) if pages is not None else ""
+
+
+def _read_pdf(data: bytes):
+    """(PdfReader, text layer of every page), or (None, None) if PyPDF2 is unavailable or can't read it."""
+    pypdf2 = optional_import("PyPDF2")
+    if pypdf2 is None or not data:
+        return None, None
     try:
-        import io
-        reader = PdfReader(io.BytesIO(data))
-        parts: List[str] = []
-        for page in reader.pages:
-            txt = page.extract_text() or ""
-            parts.append(txt)
-        return "\n".join(parts)
-    except Exception:
-        return ""
+        with span("pypdf2"):
+            reader = pypdf2.PdfReader(io.BytesIO(data))
+            return reader, [page.extract_text() or "" for page in reader.pages]
+    except Exception as e:
+        logger.info("PyPDF2 could not read PDF", extra={"error": str(e)})
+        return None, None
 
 
-def extract_text_with_document_ai(pdf_bytes: bytes) -> str:
+def _is_clean_char(c: str) -> bool:
+    return c.isalnum() or c.isspace() or c in _CLEAN_PUNCTUATION or unicodedata.category(c) == "Sm"
+
+
+def _is_wordlike(token: str) -> bool:
+    # The vowel test only means something for Latin script
+    return bool(_VOWEL.search(token)) or any(c.isalpha() and not c.isascii() for c in token)
+
+
+def page_needs_ocr(text: str) -> bool:
+    """True if a page's text layer is missing or looks like garbage."""
+    stripped = text.strip()
+    if len(stripped) < OCR_MIN_CHARS:
+        return True
+    if sum(1 for c in stripped if _is_clean_char(c)) / len(stripped) < MIN_CLEAN_CHAR_RATIO:
+        return True
+    tokens = stripped.split()
+    wordlike = sum(1 for t in tokens if _is_wordlike(t))
+    return wordlike / len(tokens) < MIN_WORDLIKE_RATIO
+
+
+def _document_ai_configured() -> bool:
+    return bool(PROJECT_ID and DOC_AI_PROCESSOR_ID) and optional_import("google.cloud.documentai") is not None
+
+
+def _process_with_document_ai(pdf_bytes: bytes, client=None):
+    """Run the configured Document AI processor; returns the Document."""
+    documentai = optional_import("google.cloud.documentai")
     if documentai is None:
         raise RuntimeError("google-cloud-documentai is not installed")
     if not (PROJECT_ID and DOC_AI_PROCESSOR_ID):
         raise RuntimeError("Document AI configuration missing PROJECT_ID or PROCESSOR_ID")
 
-    client = documentai.DocumentProcessorServiceClient()
+    client = client or documentai.DocumentProcessorServiceClient()
     name = client.processor_path(PROJECT_ID, DOC_AI_LOCATION, DOC_AI_PROCESSOR_ID)
     raw_document = documentai.RawDocument(content=pdf_bytes, mime_type="application/pdf")
     request = documentai.ProcessRequest(name=name, raw_document=raw_document)
-    result = client.process_document(request=request)
-    doc = result.document
-    return doc.text or ""
+    with span("document_ai"):
+        result = client.process_document(request=request)
+    return result.document
+
+
+def extract_text_with_document_ai(pdf_bytes: bytes) -> str:
+    return _process_with_document_ai(pdf_bytes).text or ""
+
+
+def _document_page_texts(doc, page_count: int) -> List[str]:
+    """Split a Document AI result back into per-page text via each page's text anchors."""
+    text = doc.text or ""
+    pages = list(getattr(doc, "pages", None) or [])
+    if len(pages) != page_count:
+        # No usable page layout: keep all text on the chunk's first page
+        return [text] + [""] * (page_count - 1)
+    out = []
+    for page in pages:
+        segments = page.layout.text_anchor.text_segments
+        out.append("".join(text[int(seg.start_index or 0):int(seg.end_index)] for seg in segments))
+    return out
+
+
+def _chunks(indices: Sequence[int], size: int) -> List[List[int]]:
+    return [list(indices[i:i + size]) for i in range(0, len(indices), size)]
+
+
+def _ocr_pages(reader, indices: List[int]) -> Dict[int, str]:
+    """OCR the given pages with Document AI, DOCUMENT_AI_CHUNK_PAGES per request, in parallel.
+
+    Pages whose request fails are left out of the result; if no client can
+    be created (e.g. missing credentials) the result is empty.
+    """
+    pypdf2 = optional_import("PyPDF2")
+    try:
+        client = optional_import("google.cloud.documentai").DocumentProcessorServiceClient()
+    except Exception as e:
+        logger.warning("Document AI client unavailable; keeping text layer",
+                       extra={"pages": len(indices), "error": str(e)})
+        record_fallback("document_ai")
+        return {}
+
+    def run(chunk: List[int]) -> Dict[int, str]:
+        writer = pypdf2.PdfWriter()
+        for i in chunk:
+            writer.add_page(reader.pages[i])
+        buf = io.BytesIO()
+        writer.write(buf)
+        doc = _process_with_document_ai(buf.getvalue(), client)
+        return dict(zip(chunk, _document_page_texts(doc, len(chunk))))
+
+    results: Dict[int, str] = {}
+    chunks = _chunks(indices, DOCUMENT_AI_CHUNK_PAGES)
+    with ThreadPoolExecutor(max_workers=max(1, min(DOCUMENT_AI_CONCURRENCY, len(chunks)))) as pool:
+        futures = [(chunk, pool.submit(run, chunk)) for chunk in chunks]
+        for chunk, future in futures:
+            try:
+                results.update(future.result())
+            except Exception as e:
+                logger.warning("Document AI failed for pages; keeping text layer",
+                               extra={"pages": f"{chunk[0] + 1}-{chunk[-1] + 1}", "error": str(e)})
+                record_fallback("document_ai")
+    return results
+
+
+def extract_text_hybrid(pdf_bytes: bytes) -> Tuple[str, str]:
+    """Local text layer for every page; Document AI only for pages that need OCR.
+
+    Returns tuple (text, source) with source "pypdf2" (no OCR needed or
+    possible), "hybrid" (some pages OCR'd) or "document_ai" (all pages).
+    PDFs PyPDF2 can't open at all go to Document AI whole.
+    """
+    reader, pages = _read_pdf(pdf_bytes)
+    if pages is None:
+        return extract_text_prefer_document_ai(pdf_bytes)
+
+    with span("route_pages"):
+        ocr_indices = [i for i, text in enumerate(pages) if page_needs_ocr(text)]
+    ocr_text: Dict[int, str] = {}
+    if ocr_indices and not _document_ai_configured():
+        logger.info("Pages need OCR but Document AI is not available", extra={"pages": len(ocr_indices)})
+        record_fallback("document_ai")
+    elif ocr_indices:
+        ocr_text = {i: t for i, t in _ocr_pages(reader, ocr_indices).items() if t.strip()}
+    inc("assessment_pdf_pages_total", len(pages) - len(ocr_text), extractor="pypdf2")
+    inc("assessment_pdf_pages_total", len(ocr_text), extractor="document_ai")
+
+    text = PAGE_BREAK.join(ocr_text.get(i, page) for i, page in enumerate(pages))
+    if not ocr_text:
+        source = "pypdf2"
+    elif len(ocr_text) == len(pages):
+        source = "document_ai"
+    else:
+        source = "hybrid"
+    return text, source
 
 
 def extract_text_prefer_document_ai(pdf_bytes: bytes) -> Tuple[str, str]:
@@ -66,15 +238,18 @@ def extract_text_prefer_document_ai(pdf_bytes: bytes) -> Tuple[str, str]:
             if text:
                 return text, "document_ai"
         except Exception as e:
-            print(f"[DocumentAI] Falling back to PyPDF2: {e}")
+            logger.warning("Document AI failed, falling back to PyPDF2", extra={"error": str(e)})
+            record_fallback("document_ai")
 
     text = extract_text_from_pdf_bytes(pdf_bytes)
     return text, "pypdf2"
 
 
 def normalize_text(text: str) -> str:
-    """Basic cleanup: collapse whitespace and strip."""
-    return "\n".join(line.strip() for line in text.splitlines()).strip()
+    """Basic cleanup: strip every line, keeping page breaks."""
+    return PAGE_BREAK.join(
+        "\n".join(line.strip() for line in page.splitlines()).strip() for page in text.split(PAGE_BREAK)
+    ).strip()
 
 
 def split_into_sections(text: str) -> List[Tuple[str, str]]:
@@ -84,7 +259,8 @@ def split_into_sections(text: str) -> List[Tuple[str, str]]:
     - Group subsequent lines as section content
     Returns list of (title, content).
     """
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    pages = [[l.strip() for l in page.splitlines() if l.strip()] for page in text.split(PAGE_BREAK)]
+    lines = remove_boilerplate_lines(pages)
     sections: List[Tuple[str, str]] = []
 
     def is_heading(line: str) -> bool:
@@ -111,9 +287,81 @@ def split_into_sections(text: str) -> List[Tuple[str, str]]:
     if current_buf:
         sections.append((current_title, " ".join(current_buf)))
 
+    return coalesce_sections(sections)
+
+
+def _edge(page: List[str], i: int) -> bool:
+    return i < EDGE_LINES or i >= len(page) - EDGE_LINES
+
+
+def remove_boilerplate_lines(pages: List[List[str]], min_repeats: int = BOILERPLATE_MIN_REPEATS) -> List[str]:
+    """Flatten pages of lines, dropping running headers/footers and page numbers.
+
+    Only the first and last EDGE_LINES lines of a page are candidates. One
+    is dropped if it is a page number ("12", "Page 3 of 10", "- 4 -") or if
+    the same short line sits at a page edge on at least `min_repeats` pages
+    (capped to about half the pages for short documents, never under 3).
+    Lines elsewhere on a page are always kept, so a heading that recurs in
+    every chapter ("Summary", "Example") stays a section boundary.
+    """
+    if len(pages) < 2:
+        return [l for page in pages for l in page]
+    counts = Counter(
+        l for page in pages
+        for l in {l for i, l in enumerate(page) if _edge(page, i) and len(l) <= BOILERPLATE_MAX_LEN}
+    )
+    threshold = max(3, min(min_repeats, len(pages) // 2 + 1))
+    return [
+        l for page in pages for i, l in enumerate(page)
+        if not (_edge(page, i) and len(l) <= BOILERPLATE_MAX_LEN
+                and (counts[l] >= threshold or _PAGE_NUMBER.match(l)))
+    ]
+
+
+def _group_sections(sections: List[Tuple[str, str]], target: float) -> List[Tuple[str, str]]:
+    """Join consecutive sections until each group holds at least `target` chars of content.
+
+    A group keeps its first title; the other titles stay in the text. A
+    short trailing group is folded into the one before it.
+    """
+    groups: List[List[Any]] = []  # [title, content parts, chars]
+    for title, content in sections:
+        if groups and groups[-1][2] < target:
+            groups[-1][1].append(f"{title}. {content}")
+            groups[-1][2] += len(content)
+        else:
+            groups.append([title, [content], len(content)])
+    if len(groups) > 1 and groups[-1][2] < target:
+        title, parts, chars = groups.pop()
+        groups[-1][1].append(f"{title}. {' '.join(parts)}")
+        groups[-1][2] += chars
+    return [(title, " ".join(p for p in parts if p)) for title, parts, _ in groups]
+
+
+def coalesce_sections(sections: List[Tuple[str, str]], min_chars: int = SECTION_MIN_CHARS,
+                      max_count: int = SECTION_MAX_COUNT) -> List[Tuple[str, str]]:
+    """Merge undersized sections into their neighbours, then cap the section count.
+
+    Sections under `min_chars` are joined with the ones after them; if more
+    than `max_count` remain they are grouped again to about 1/max_count of
+    the text each. Both passes are linear and keep every word.
+    """
+    sections = _group_sections(sections, min_chars)
+    if len(sections) > max_count > 0:
+        total = sum(len(content) for _, content in sections)
+        sections = _group_sections(sections, total / max_count)
     return sections
 
 
+def section_hash(title: str, content: str) -> str:
+    """Content hash of one section, used to match sections across re-ingests."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(title.encode("utf-8"))
+    h.update(b"\0")
+    h.update(content.encode("utf-8"))
+    return h.hexdigest()
+
+
 def parse_document(text: str) -> Dict[str, Any]:
     """Produce topics and concept-level chunks from raw text.
 
@@ -130,6 +378,21 @@ def parse_document(text: str) -> Dict[str, Any]:
     return {"topics": topics, "concepts": concepts}
 
 
+def estimate_difficulty(word_count: int, sentence_count: int) -> Tuple[str, int]:
+    """(difficulty_level, estimated_read_time_minutes) for a summary."""
+    # Difficulty heuristic based on sentence length and size
+    avg_sentence_len = word_count / max(1, sentence_count)
+    if word_count > 1800 or avg_sentence_len > 25:
+        difficulty = "Advanced"
+    elif word_count > 1000 or avg_sentence_len > 18:
+        difficulty = "Intermediate"
+    else:
+        difficulty = "Beginner"
+
+    # Estimated read time at ~200 words/min
+    return difficulty, max(1, math.ceil(word_count / 200))
+
+
 def build_structured_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Create a UI-friendly summary shape without external dependencies.
 
@@ -176,17 +439,7 @@ def build_structured_summary(text: str, topics: List[str], concepts: List[Dict[s
             "key_points": key_points if key_points else None,
         })
 
-    # Difficulty heuristic based on sentence length and size
-    avg_sentence_len = word_count / max(1, len(sentences))
-    if word_count > 1800 or avg_sentence_len > 25:
-        difficulty = "Advanced"
-    elif word_count > 1000 or avg_sentence_len > 18:
-        difficulty = "Intermediate"
-    else:
-        difficulty = "Beginner"
-
-    # Estimated read time at ~200 words/min
-    est_read_time = max(1, math.ceil(word_count / 200))
+    difficulty, est_read_time = estimate_difficulty(word_count, len(sentences))
 
     return {
         "title": title,
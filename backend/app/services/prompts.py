@@ -0,0 +1,393 @@
+"""
+Prompt registry.
+
+Every LLM prompt is a PromptTemplate: a literal static prefix (role,
+rules, output format) followed by a small dynamic tail holding the
+per-call fields (topic, seeds, document text). Templates are parsed once
+at import; render() only formats the tail and concatenates. Keeping all
+per-call data at the end means calls to the same template share an
+identical prefix, which is what provider-side prompt/context caching keys
+on.
+
+Shared sections (assessment role, uniqueness rules, JSON-only footer) are
+defined once and composed into each question template.
+
+Token counts are estimated (about 4 characters per token) and exported as
+assessment_prompt_tokens_total{template, part=static|dynamic}; run
+`python -m app.services.prompts` from backend/ for a per-template size table.
+"""
+import math
+import string
+from typing import Dict, Any, FrozenSet
+
+from .metrics import inc
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prompt text (~4 chars/token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class PromptTemplate:
+    """A static prefix plus a str.format() tail, parsed once."""
+
+    __slots__ = ("name", "static", "dynamic", "fields", "static_tokens")
+
+    def __init__(self, name: str, static: str, dynamic: str):
+        self.name = name
+        self.static = static
+        self.dynamic = dynamic
+        self.fields: FrozenSet[str] = frozenset(
+            field for _, field, _, _ in string.Formatter().parse(dynamic) if field
+        )
+        self.static_tokens = estimate_tokens(static)
+
+    def render(self, **values: Any) -> str:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"prompt '{self.name}' missing fields: {sorted(missing)}")
+        tail = self.dynamic.format(**values)
+        inc("assessment_prompt_renders_total", template=self.name)
+        inc("assessment_prompt_tokens_total", self.static_tokens, template=self.name, part="static")
+        inc("assessment_prompt_tokens_total", estimate_tokens(tail), template=self.name, part="dynamic")
+        return self.static + tail
+
+
+PROMPTS: Dict[str, PromptTemplate] = {}
+
+
+def register(name: str, static: str, dynamic: str) -> PromptTemplate:
+    template = PROMPTS[name] = PromptTemplate(name, static, dynamic)
+    return template
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    return PROMPTS[name]
+
+
+def render_prompt(name: str, **values: Any) -> str:
+    return PROMPTS[name].render(**values)
+
+
+def describe() -> Dict[str, Dict[str, Any]]:
+    """Static size of every registered template, for measuring prompt cost."""
+    return {
+        name: {"static_chars": len(t.static), "static_tokens": t.static_tokens, "fields": sorted(t.fields)}
+        for name, t in sorted(PROMPTS.items())
+    }
+
+
+# --- Shared sections ---------------------------------------------------------
+
+ASSESSMENT_ROLE = """
+You are an expert educational assessment designer. The subject domain and
+topic are given in the CONTEXT section at the end of this prompt.
+When CONTEXT includes SOURCE EXCERPTS from the learner's document, base the
+question and its correct answer only on facts stated in those excerpts.
+"""
+
+UNIQUENESS_RULES = """
+CRITICAL - UNIQUENESS REQUIREMENT:
+This is a FRESH assessment attempt, identified by the Assessment ID in CONTEXT.
+You MUST generate a COMPLETELY NEW and UNIQUE question.
+DO NOT repeat, rephrase, or recycle ANY previously generated questions.
+Approach the topic from the Angle given in CONTEXT.
+"""
+
+JSON_ONLY = "\nOutput ONLY valid JSON (no markdown, no code blocks):\n"
+
+MCQ_OPTIONS_JSON = '  "options": ["A) option 1", "B) option 2", "C) option 3", "D) option 4"],\n'
+TOPIC_JSON = '  "topic": "<the Topic from CONTEXT>",\n'
+
+QUESTION_CONTEXT = """
+CONTEXT:
+Domain: {domain}
+Angle: {perspective}. {style}.
+Assessment ID: {seed}, Timestamp: {timestamp}, Variation: {variation}
+{sources}Generate the question about: {topic}
+"""
+
+# Filled into QUESTION_CONTEXT's {sources} for document-grounded questions ("" otherwise)
+SOURCES_BLOCK = "SOURCE EXCERPTS:\n{excerpts}\n"
+
+
+# --- Question generation -----------------------------------------------------
+
+register(
+    "question.easy",
+    ASSESSMENT_ROLE + UNIQUENESS_RULES + """
+Generate ONE EASY multiple-choice question about the Topic.
+
+STRICT REQUIREMENTS:
+- Format: Multiple Choice Question (MCQ) ONLY
+- Test surface-level understanding (definitions, basic concepts, terminology)
+- Question style: "What is...", "Which of the following...", "Define..."
+- Provide EXACTLY 4 options labeled A, B, C, D
+- Single correct answer
+- NO reasoning required
+- NO application scenarios
+- NO complex analysis
+""" + JSON_ONLY + "{\n" + '  "question": "your MCQ question text here",\n' + MCQ_OPTIONS_JSON
+    + '  "correct_answer": "A",\n' + TOPIC_JSON + '  "difficulty": "easy"\n}\n',
+    QUESTION_CONTEXT,
+)
+
+register(
+    "question.moderate",
+    ASSESSMENT_ROLE + UNIQUENESS_RULES + """
+Generate ONE MODERATE multiple-choice question about the Topic.
+
+STRICT REQUIREMENTS:
+- Format: Multiple Choice Question (MCQ) ONLY
+- Test application + understanding of concepts
+- Include real-world context or practical scenarios
+- Question style: "How would...", "Why does...", "When would you..."
+- Provide EXACTLY 4 options labeled A, B, C, D
+- Single correct answer
+- Requires logical elimination and domain application
+- More difficult than basic concept recall
+- NO pure definition questions
+""" + JSON_ONLY + "{\n" + '  "question": "your MCQ question text here",\n' + MCQ_OPTIONS_JSON
+    + '  "correct_answer": "B",\n' + TOPIC_JSON + '  "difficulty": "moderate"\n}\n',
+    QUESTION_CONTEXT,
+)
+
+register(
+    "question.hard.mcq_reasoning",
+    ASSESSMENT_ROLE + UNIQUENESS_RULES + """
+Generate ONE HARD multiple-choice question with reasoning requirement about the Topic.
+
+STRICT REQUIREMENTS - SEGMENT 1 (MCQ + REASONING):
+- Format: Multiple Choice Question with MANDATORY reasoning explanation
+- Test complex objective reasoning
+- Require multi-step logical thinking
+- Interview-level difficulty
+- Provide EXACTLY 4 options labeled A, B, C, D
+- Single correct answer
+- User MUST provide reasoning explanation in addition to selecting option
+- Question should be answerable only with deep logical deduction
+""" + JSON_ONLY + "{\n" + '  "question": "your complex MCQ question text here",\n' + MCQ_OPTIONS_JSON
+    + '  "correct_answer": "C",\n'
+    + '  "reasoning_explanation": "Brief explanation of why this is correct and why others are wrong",\n'
+    + TOPIC_JSON + '  "difficulty": "hard"\n}\n',
+    QUESTION_CONTEXT,
+)
+
+register(
+    "question.hard.assertion_reason",
+    ASSESSMENT_ROLE + UNIQUENESS_RULES + """
+Generate ONE HARD assertion-reasoning question about the Topic.
+
+STRICT REQUIREMENTS - SEGMENT 2 (ASSERTION-REASONING):
+- Format: Assertion-Reasoning type question
+- Provide two statements:
+  - Assertion (A): A statement about the concept
+  - Reason (R): A reasoning or explanation statement
+- Test logical relationships and conceptual correctness
+- Use case-based or hypothetical scenarios
+- Provide EXACTLY 4 standard options:
+  A) Both A and R are true, and R is the correct explanation of A
+  B) Both A and R are true, but R is NOT the correct explanation of A
+  C) A is true, but R is false
+  D) A is false, but R is true
+- Single correct answer
+- Test logical dependency and concept validation
+""" + JSON_ONLY + """{
+  "assertion": "Assertion (A): statement about concept",
+  "reason": "Reason (R): explanation or reasoning statement",
+  "options": [
+    "A) Both A and R are true, and R is the correct explanation of A",
+    "B) Both A and R are true, but R is NOT the correct explanation of A",
+    "C) A is true, but R is false",
+    "D) A is false, but R is true"
+  ],
+  "correct_answer": "A",
+""" + TOPIC_JSON + '  "difficulty": "hard"\n}\n',
+    QUESTION_CONTEXT,
+)
+
+register(
+    "question.fallback",
+    "",
+    "\n{sources}Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 options.\n",
+)
+
+register(
+    "question.open",
+    """
+You are an expert educational assessment designer. The subject, topic and
+difficulty are given in the CONTEXT section at the end of this prompt.
+
+IMPORTANT: This is a fresh assessment attempt, identified by the ID in CONTEXT.
+Generate a UNIQUE question that is different from any previous questions, even if the domain and difficulty are the same.
+DO NOT repeat previously generated questions. Cover different subtopics, angles, or perspectives.
+
+Guidelines:
+- Ask a question that tests conceptual understanding, not memorization
+- For medium/hard: include scenario-based or real-world application context
+- The question should reveal depth of understanding when answered
+- Make it suitable for interview or professional assessment
+- Ensure conceptual variety and uniqueness
+
+Output ONLY valid JSON (no markdown, no extra text):
+{
+  "question": "your question here",
+  "difficulty": "<the Difficulty level from CONTEXT>"
+}
+""",
+    """
+CONTEXT:
+Subject: {subject}
+ID: {seed}, timestamp: {timestamp}
+Difficulty level: {difficulty}
+Generate ONE industry-relevant, thought-provoking question about: {topic}
+""",
+)
+
+
+# --- Answer analysis and explanations ----------------------------------------
+
+register(
+    "analyze",
+    """
+You are an expert educational evaluator.
+
+Evaluate the student's response to the question below on these dimensions:
+1. Clarity of explanation (0-100)
+2. Correctness of understanding (0-100)
+3. Self-confidence alignment (0-100)
+4. Quality of reasoning and examples (0-100)
+
+Provide constructive feedback focusing on strengths and areas for improvement.
+
+Output ONLY valid JSON (no markdown):
+{
+  "clarity": <number>,
+  "correctness": <number>,
+  "confidence": <number>,
+  "reasoning_quality": <number>,
+  "short_feedback": "<your feedback>"
+}
+""",
+    """
+Question: {question}
+
+Student's Answer:
+{answer}
+""",
+)
+
+register(
+    "explain",
+    """
+You are a learning assistant.
+Explain the concept below in simple language and provide a practical example.
+
+Return STRICT JSON with keys:
+- explanation (string)
+- example (string)
+Only return JSON.
+""",
+    """
+Title: {title}
+Content: {content}
+""",
+)
+
+
+# --- Document summarization --------------------------------------------------
+
+SUMMARY_INSTRUCTIONS = """
+You are a world-class educational content analyst and technical writer. Your mission is to create an exceptionally detailed, comprehensive summary that transforms complex documents into clear, accessible learning resources.
+
+CRITICAL INSTRUCTIONS - READ CAREFULLY:
+
+1. TITLE: 
+   - Create a precise, descriptive title that captures the document's core subject and scope
+   - Should be clear enough that a reader immediately understands what they'll learn
+
+2. OVERVIEW (VERY IMPORTANT - BE COMPREHENSIVE):
+   - Write 5-8 detailed, well-structured sentences (150-250 words total)
+   - First sentence: Introduce the document's primary purpose and what problem/topic it addresses
+   - Next 2-3 sentences: Explain the document's scope, approach, and methodology
+   - Following 2-3 sentences: Highlight key insights, unique perspectives, or important context
+   - Final 1-2 sentences: Explain who benefits from this material and why it matters
+   - Use clear, educational language that sets proper context for learning
+
+3. KEY CONCEPTS (8-12 concepts):
+   - Extract the most important technical terms, frameworks, principles, or methodologies
+   - Include both fundamental concepts and advanced topics
+   - Order them logically (foundational concepts first, then advanced ones)
+   - These should represent the essential vocabulary needed to understand the material
+
+4. MAIN TOPICS (5-10 comprehensive topics):
+   For EACH topic provide:
+   
+   a) NAME: Clear, specific topic heading (not generic)
+   
+   b) DESCRIPTION (CRITICAL - BE DETAILED):
+      - Write 4-7 complete sentences (100-180 words) explaining:
+        * What this topic covers in depth
+        * Why this topic is important in the larger context
+        * How it connects to other topics/concepts in the document
+        * Real-world applications or implications (when relevant)
+        * Any nuances, challenges, or important considerations
+      - Use concrete examples and specific details
+      - Avoid vague statements - be precise and informative
+   
+   c) KEY POINTS (4-7 specific points per topic):
+      - Each point should be a complete, meaningful statement (not just a word)
+      - Include specific details, facts, techniques, or principles
+      - Make each point actionable or clearly educational
+      - Examples: "OAuth 2.0 provides token-based authentication with refresh capabilities" (GOOD)
+                   vs "Authentication" (TOO VAGUE - BAD)
+
+5. DIFFICULTY LEVEL:
+   - Beginner: Basic concepts, minimal prerequisites, introductory material
+   - Intermediate: Requires foundational knowledge, moderate technical depth
+   - Advanced: Complex topics, significant prerequisites, expert-level material
+
+6. ESTIMATED READ TIME:
+   - Calculate realistically based on content density and complexity
+   - Account for technical difficulty (advanced topics take longer to absorb)
+
+QUALITY STANDARDS:
+- Prioritize clarity, accuracy, and educational value above all
+- Every sentence should add meaningful information
+- Avoid generic filler text or obvious statements
+- Write as if teaching someone who wants to deeply understand the material
+- Use proper technical terminology while remaining accessible
+- Create a summary that could serve as comprehensive study notes
+
+Return ONLY valid JSON (no markdown, no code blocks):
+{
+  "title": "Precise, descriptive title of the document",
+  "overview": "5-8 detailed sentences (150-250 words) providing comprehensive context, scope, key insights, and importance of the material",
+  "key_concepts": ["concept1", "concept2", "concept3", "concept4", "concept5", "concept6", "concept7", "concept8"],
+  "main_topics": [
+    {
+      "name": "Specific Topic Name",
+      "description": "4-7 sentences (100-180 words) thoroughly explaining what this topic covers, why it matters, how it connects to other concepts, real-world applications, and important nuances or considerations",
+      "key_points": [
+        "Detailed point 1 with specific information",
+        "Detailed point 2 with specific information",
+        "Detailed point 3 with specific information",
+        "Detailed point 4 with specific information",
+        "Detailed point 5 with specific information"
+      ]
+    }
+  ],
+  "difficulty_level": "Beginner|Intermediate|Advanced",
+  "estimated_read_time_minutes": number
+}
+"""
+
+register("summary", SUMMARY_INSTRUCTIONS, "\n\nDocument to analyze:\n{text}")
+
+
+if __name__ == "__main__":
+    print(f"{'template':34} {'chars':>7} {'tokens':>7}  fields")
+    for name, info in describe().items():
+        print(f"{name:34} {info['static_chars']:>7} {info['static_tokens']:>7}  {', '.join(info['fields'])}")
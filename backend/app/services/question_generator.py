@@ -1,11 +1,66 @@
-from app.services.gemini_analyzer import call_gemini
+from app.services.gemini_analyzer import call_gemini_prompt
+from app.services.llm_json import decode_llm_json
 from app.services.question_validator import validate_and_fix_question
-import json
-import re
+from app.services.metrics import span, record_fallback
+from app.services.prompts import SOURCES_BLOCK
+from app.services.retrieval import TOP_K, format_passages
+from app.schemas.assessment import ASSERTION_REASON_OPTIONS, register_option_set
+import logging
 import uuid
 import random
 import time
 
+logger = logging.getLogger(__name__)
+
+# Fallback MCQ option sets, registered so stored questions share one tuple per set
+FALLBACK_OPTION_SETS = tuple(register_option_set(opts) for opts in [
+    [
+        "A) It optimizes resource allocation",
+        "B) It enhances system modularity",
+        "C) It improves maintainability",
+        "D) It reduces computational complexity"
+    ],
+    [
+        "A) When scalability is the primary concern",
+        "B) When performance optimization is needed",
+        "C) When maintainability outweighs efficiency",
+        "D) When security is the top priority"
+    ],
+    [
+        "A) High throughput with moderate latency",
+        "B) Low latency with variable throughput",
+        "C) Balanced performance across metrics",
+        "D) Maximum reliability with minimal overhead"
+    ],
+    [
+        "A) It provides a structured approach to problem decomposition",
+        "B) It enables parallel processing capabilities",
+        "C) It simplifies error handling mechanisms",
+        "D) It facilitates rapid prototyping"
+    ],
+])
+
+HARD_FALLBACK_OPTION_SETS = tuple(register_option_set(opts) for opts in [
+    [
+        "A) Performance optimization takes precedence",
+        "B) Resource allocation constraints dominate",
+        "C) Contextual requirements drive the decision",
+        "D) Scalability concerns override other factors"
+    ],
+    [
+        "A) Minimizing latency while maintaining throughput",
+        "B) Balancing complexity with maintainability",
+        "C) Ensuring reliability without excessive overhead",
+        "D) Achieving modularity while preserving efficiency"
+    ],
+    [
+        "A) System architecture compatibility",
+        "B) Development team expertise",
+        "C) Long-term maintenance costs",
+        "D) Immediate performance gains"
+    ],
+])
+
 
 def generate_question(subject: str, topic: str, difficulty: str = "medium") -> dict:
     """
@@ -17,55 +72,27 @@ def generate_question(subject: str, topic: str, difficulty: str = "medium") -> d
     timestamp = int(time.time() * 1000)
     unique_seed = str(uuid.uuid4())[:8]
 
-    prompt = f"""
-You are an expert educational assessment designer specializing in {subject}.
-
-IMPORTANT: This is a fresh assessment attempt (ID: {unique_seed}, timestamp: {timestamp}). 
-Generate a UNIQUE question that is different from any previous questions, even if the domain and difficulty are the same.
-DO NOT repeat previously generated questions. Cover different subtopics, angles, or perspectives.
-
-Generate ONE industry-relevant, thought-provoking question about: {topic}
-
-Difficulty level: {difficulty}
-
-Guidelines:
-- Ask a question that tests conceptual understanding, not memorization
-- For medium/hard: include scenario-based or real-world application context
-- The question should reveal depth of understanding when answered
-- Make it suitable for interview or professional assessment
-- Ensure conceptual variety and uniqueness
-
-Output ONLY valid JSON (no markdown, no extra text):
-{{
-  "question": "your question here",
-  "difficulty": "{difficulty}"
-}}
-"""
+    fields = dict(subject=subject, topic=topic, difficulty=difficulty, seed=unique_seed, timestamp=timestamp)
 
     try:
-        import traceback
-        text = call_gemini(prompt)
-        print(f"[DEBUG] Gemini raw response: {text[:200]}")
-        
-        # Strip markdown code blocks if present
-        text = re.sub(r'^```json\s*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'```\s*$', '', text, flags=re.MULTILINE)
-        text = text.strip()
-        
-        data = json.loads(text)
+        with span("generate"):
+            text = call_gemini_prompt("question.open", **fields)
+        logger.debug("Gemini raw response", extra={"text": text[:200]})
+        data = decode_llm_json(text, expect=dict)
         question_text = data.get("question", "").strip()
         
         if not question_text:
             raise ValueError("Empty question from Gemini")
         
-        print(f"[SUCCESS] Generated question: {question_text[:100]}")
+        logger.debug("Generated question", extra={"question": question_text[:100]})
         return {
             "question": question_text,
             "difficulty": data.get("difficulty", difficulty),
         }
     except Exception as e:
-        print(f"[ERROR] Gemini question generation failed: {e}")
-        traceback.print_exc()
+        logger.warning("Gemini question generation failed, using fallback", extra={"error": str(e)})
+        logger.debug("Question generation traceback", exc_info=True)
+        record_fallback("generate")
         # Fallback only when Gemini completely fails
         return {
             "question": f"Explain the key principles of {topic} in {subject} and provide a real-world example demonstrating your understanding.",
@@ -73,9 +100,13 @@ Output ONLY valid JSON (no markdown, no extra text):
         }
 
 
-def generate_question_with_answer(domain: str, topic: str, difficulty: str = "moderate", segment: str = None) -> dict:
+def generate_question_with_answer(domain: str, topic: str, difficulty: str = "moderate", segment: str = None,
+                                  excerpts: str = "") -> dict:
     """
     Generate a complete question with STRICT format enforcement.
+
+    `excerpts` (see retrieval.format_passages) grounds the question in an
+    ingested document; the model is told to use only those passages.
     
     Easy: MCQ only (4 options, definitions/terminology)
     Moderate: MCQ only (4 options, application-based)
@@ -129,164 +160,30 @@ def generate_question_with_answer(domain: str, topic: str, difficulty: str = "mo
     else:  # easy
         segment_type = "MCQ"
     
-    # Build difficulty-specific prompt instructions
-    if difficulty == "easy":
-        prompt = f"""
-You are an expert educational assessment designer for {domain}.
-
-CRITICAL - UNIQUENESS REQUIREMENT (Assessment ID: {unique_seed}, Timestamp: {timestamp}, Variation: {random_variation}):
-This is a FRESH assessment attempt. You MUST generate a COMPLETELY NEW and UNIQUE question.
-DO NOT repeat, rephrase, or recycle ANY previously generated questions.
-Use {selected_perspective} to create a fresh angle on {topic}.
-{selected_style}.
-
-Generate ONE EASY multiple-choice question about: {topic}
-
-STRICT REQUIREMENTS:
-- Format: Multiple Choice Question (MCQ) ONLY
-- Test surface-level understanding (definitions, basic concepts, terminology)
-- Question style: "What is...", "Which of the following...", "Define..."
-- Provide EXACTLY 4 options labeled A, B, C, D
-- Single correct answer
-- NO reasoning required
-- NO application scenarios
-- NO complex analysis
-
-Output ONLY valid JSON (no markdown, no code blocks):
-{{
-  "question": "your MCQ question text here",
-  "options": ["A) option 1", "B) option 2", "C) option 3", "D) option 4"],
-  "correct_answer": "A",
-  "topic": "{topic}",
-  "difficulty": "easy"
-}}
-"""
-    
-    elif difficulty == "moderate":
-        prompt = f"""
-You are an expert educational assessment designer for {domain}.
-
-CRITICAL - UNIQUENESS REQUIREMENT (Assessment ID: {unique_seed}, Timestamp: {timestamp}, Variation: {random_variation}):
-This is a FRESH assessment attempt. You MUST generate a COMPLETELY NEW and UNIQUE question.
-DO NOT repeat, rephrase, or recycle ANY previously generated questions.
-Use {selected_perspective} to create a fresh angle on {topic}.
-{selected_style}.
-
-Generate ONE MODERATE multiple-choice question about: {topic}
-
-STRICT REQUIREMENTS:
-- Format: Multiple Choice Question (MCQ) ONLY
-- Test application + understanding of concepts
-- Include real-world context or practical scenarios
-- Question style: "How would...", "Why does...", "When would you..."
-- Provide EXACTLY 4 options labeled A, B, C, D
-- Single correct answer
-- Requires logical elimination and domain application
-- More difficult than basic concept recall
-- NO pure definition questions
-
-Output ONLY valid JSON (no markdown, no code blocks):
-{{
-  "question": "your MCQ question text here",
-  "options": ["A) option 1", "B) option 2", "C) option 3", "D) option 4"],
-  "correct_answer": "B",
-  "topic": "{topic}",
-  "difficulty": "moderate"
-}}
-"""
-    
-    elif difficulty == "hard" and segment_type == "MCQ_REASONING":
-        # HARD - SEGMENT 1: MCQ + Reasoning
-        prompt = f"""
-You are an expert educational assessment designer for {domain}.
-
-CRITICAL - UNIQUENESS REQUIREMENT (Assessment ID: {unique_seed}, Timestamp: {timestamp}, Variation: {random_variation}):
-This is a FRESH assessment attempt. You MUST generate a COMPLETELY NEW and UNIQUE question.
-DO NOT repeat, rephrase, or recycle ANY previously generated questions.
-Use {selected_perspective} to create a fresh angle on {topic}.
-{selected_style}.
-
-Generate ONE HARD multiple-choice question with reasoning requirement about: {topic}
-
-STRICT REQUIREMENTS - SEGMENT 1 (MCQ + REASONING):
-- Format: Multiple Choice Question with MANDATORY reasoning explanation
-- Test complex objective reasoning
-- Require multi-step logical thinking
-- Interview-level difficulty
-- Provide EXACTLY 4 options labeled A, B, C, D
-- Single correct answer
-- User MUST provide reasoning explanation in addition to selecting option
-- Question should be answerable only with deep logical deduction
-
-Output ONLY valid JSON (no markdown, no code blocks):
-{{
-  "question": "your complex MCQ question text here",
-  "options": ["A) option 1", "B) option 2", "C) option 3", "D) option 4"],
-  "correct_answer": "C",
-  "reasoning_explanation": "Brief explanation of why this is correct and why others are wrong",
-  "topic": "{topic}",
-  "difficulty": "hard"
-}}
-"""
-    
-    elif difficulty == "hard" and segment_type == "ASSERTION_REASON":
-        # HARD - SEGMENT 2: Assertion-Reasoning
-        prompt = f"""
-You are an expert educational assessment designer for {domain}.
-
-CRITICAL - UNIQUENESS REQUIREMENT (Assessment ID: {unique_seed}, Timestamp: {timestamp}, Variation: {random_variation}):
-This is a FRESH assessment attempt. You MUST generate a COMPLETELY NEW and UNIQUE question.
-DO NOT repeat, rephrase, or recycle ANY previously generated questions.
-Use {selected_perspective} to create a fresh angle on {topic}.
-{selected_style}.
-
-Generate ONE HARD assertion-reasoning question about: {topic}
-
-STRICT REQUIREMENTS - SEGMENT 2 (ASSERTION-REASONING):
-- Format: Assertion-Reasoning type question
-- Provide two statements:
-  - Assertion (A): A statement about the concept
-  - Reason (R): A reasoning or explanation statement
-- Test logical relationships and conceptual correctness
-- Use case-based or hypothetical scenarios
-- Provide EXACTLY 4 standard options:
-  A) Both A and R are true, and R is the correct explanation of A
-  B) Both A and R are true, but R is NOT the correct explanation of A
-  C) A is true, but R is false
-  D) A is false, but R is true
-- Single correct answer
-- Test logical dependency and concept validation
-
-Output ONLY valid JSON (no markdown, no code blocks):
-{{
-  "assertion": "Assertion (A): statement about concept",
-  "reason": "Reason (R): explanation or reasoning statement",
-  "options": [
-    "A) Both A and R are true, and R is the correct explanation of A",
-    "B) Both A and R are true, but R is NOT the correct explanation of A",
-    "C) A is true, but R is false",
-    "D) A is false, but R is true"
-  ],
-  "correct_answer": "A",
-  "topic": "{topic}",
-  "difficulty": "hard"
-}}
-"""
-    
+    # Pick the template for this difficulty/segment; per-call fields go in its tail
+    if difficulty in ("easy", "moderate"):
+        template = f"question.{difficulty}"
+    elif difficulty == "hard":
+        template = f"question.hard.{segment_type.lower()}"
     else:
         # Fallback to moderate
         segment_type = "MCQ"
-        prompt = f"""
-Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 options.
-"""
+        template = "question.fallback"
+    fields = dict(
+        domain=domain,
+        topic=topic,
+        perspective=selected_perspective,
+        style=selected_style,
+        seed=unique_seed,
+        timestamp=timestamp,
+        variation=random_variation,
+        sources=SOURCES_BLOCK.format(excerpts=excerpts) if excerpts else "",
+    )
     
     try:
-        text = call_gemini(prompt)
-        text = re.sub(r'^```json\s*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'```\s*$', '', text, flags=re.MULTILINE)
-        text = text.strip()
-        
-        data = json.loads(text)
+        with span("generate"):
+            text = call_gemini_prompt(template, **fields)
+        data = decode_llm_json(text, expect=dict)
         
         # Validate and structure response based on segment type
         if segment_type == "ASSERTION_REASON":
@@ -338,9 +235,9 @@ Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 opti
             }
             
     except Exception as e:
-        print(f"[ERROR] Question generation failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.warning("Question generation failed, using fallback", extra={"error": str(e), "topic": topic})
+        logger.debug("Question generation traceback", exc_info=True)
+        record_fallback("generate")
         
         # Generate varied fallback questions to avoid repetition
         fallback_starters = [
@@ -354,36 +251,9 @@ Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 opti
             f"What trade-off is associated with applying {topic} in {domain} systems?",
         ]
         
-        fallback_options_sets = [
-            [
-                "A) It optimizes resource allocation",
-                "B) It enhances system modularity",
-                "C) It improves maintainability",
-                "D) It reduces computational complexity"
-            ],
-            [
-                "A) When scalability is the primary concern",
-                "B) When performance optimization is needed",
-                "C) When maintainability outweighs efficiency",
-                "D) When security is the top priority"
-            ],
-            [
-                "A) High throughput with moderate latency",
-                "B) Low latency with variable throughput",
-                "C) Balanced performance across metrics",
-                "D) Maximum reliability with minimal overhead"
-            ],
-            [
-                "A) It provides a structured approach to problem decomposition",
-                "B) It enables parallel processing capabilities",
-                "C) It simplifies error handling mechanisms",
-                "D) It facilitates rapid prototyping"
-            ]
-        ]
-        
         # Randomly select fallback question and options
         selected_question = random.choice(fallback_starters)
-        selected_options = random.choice(fallback_options_sets)
+        selected_options = list(random.choice(FALLBACK_OPTION_SETS))
         correct_answers = ["A", "B", "C", "D"]
         selected_answer = random.choice(correct_answers)
         
@@ -429,12 +299,7 @@ Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 opti
                 return {
                     "question_id": str(uuid.uuid4()),
                     "question": f"Assertion (A): {random.choice(assertion_starters)}\n\nReason (R): {random.choice(reason_starters)}",
-                    "options": [
-                        "A) Both A and R are true, and R is the correct explanation of A",
-                        "B) Both A and R are true, but R is NOT the correct explanation of A",
-                        "C) A is true, but R is false",
-                        "D) A is false, but R is true"
-                    ],
+                    "options": list(ASSERTION_REASON_OPTIONS),
                     "correct_answer": random.choice(["A", "B"]),
                     "topic": topic,
                     "difficulty": "hard",
@@ -449,31 +314,10 @@ Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 opti
                     f"When optimizing for both performance and maintainability in {domain}, how does {topic} influence the balance?"
                 ]
                 
-                hard_options_sets = [
-                    [
-                        "A) Performance optimization takes precedence",
-                        "B) Resource allocation constraints dominate",
-                        "C) Contextual requirements drive the decision",
-                        "D) Scalability concerns override other factors"
-                    ],
-                    [
-                        "A) Minimizing latency while maintaining throughput",
-                        "B) Balancing complexity with maintainability",
-                        "C) Ensuring reliability without excessive overhead",
-                        "D) Achieving modularity while preserving efficiency"
-                    ],
-                    [
-                        "A) System architecture compatibility",
-                        "B) Development team expertise",
-                        "C) Long-term maintenance costs",
-                        "D) Immediate performance gains"
-                    ]
-                ]
-                
                 return {
                     "question_id": str(uuid.uuid4()),
                     "question": random.choice(hard_questions),
-                    "options": random.choice(hard_options_sets),
+                    "options": list(random.choice(HARD_FALLBACK_OPTION_SETS)),
                     "correct_answer": random.choice(["A", "B", "C", "D"]),
                     "topic": topic,
                     "difficulty": "hard",
@@ -483,9 +327,140 @@ Generate a moderate difficulty MCQ about {topic} in {domain} with exactly 4 opti
 
 
 
-def generate_batch_questions(domain: str, count: int = 10, difficulty: str = "moderate") -> list:
+# Define topic pools per domain
+DOMAIN_TOPICS = {
+    "machine-learning": [
+        "Supervised Learning", "Unsupervised Learning", "Neural Networks",
+        "Model Evaluation", "Overfitting & Regularization", "Feature Engineering",
+        "Ensemble Methods", "Deep Learning", "Transfer Learning", "Model Deployment"
+    ],
+    "data-science": [
+        "Data Preprocessing", "Statistical Analysis", "Data Visualization",
+        "Hypothesis Testing", "Regression Analysis", "Classification",
+        "Clustering", "Time Series Analysis", "A/B Testing", "ETL Pipelines"
+    ],
+    "operating-systems": [
+        "Process Management", "Memory Management", "File Systems",
+        "Concurrency", "Deadlocks", "Scheduling Algorithms",
+        "Virtual Memory", "I/O Management", "System Calls", "Synchronization"
+    ],
+    "web-development": [
+        "HTTP Protocol", "RESTful APIs", "Frontend Frameworks",
+        "Backend Architecture", "Database Design", "Authentication",
+        "State Management", "Responsive Design", "Performance Optimization", "Security"
+    ],
+    "computer-networks": [
+        "OSI Model", "TCP/IP Protocol", "Routing Algorithms",
+        "Network Security", "DNS", "Load Balancing",
+        "Network Topologies", "Firewalls", "VPN", "Quality of Service"
+    ],
+}
+
+# Difficulty/segment levels an adaptive bank is spread across, easiest first
+ADAPTIVE_LEVELS = [("easy", None), ("moderate", None), ("hard", "A"), ("hard", "B")]
+
+
+def domain_topic_pool(domain: str) -> list:
+    """Topic list for a domain; custom domains get varied topic angles."""
+    if domain in DOMAIN_TOPICS:
+        return DOMAIN_TOPICS[domain]
+
+    # Generate varied aspects/subtopics for custom domains
+    return [
+        f"{domain} - Fundamentals",
+        f"{domain} - Architecture & Design",
+        f"{domain} - Implementation Strategies",
+        f"{domain} - Best Practices",
+        f"{domain} - Common Challenges",
+        f"{domain} - Performance & Optimization",
+        f"{domain} - Security Considerations",
+        f"{domain} - Real-World Applications",
+        f"{domain} - Advanced Concepts",
+        f"{domain} - Industry Standards"
+    ]
+
+
+def document_topic_pool(document: dict) -> list:
+    """Distinct section titles of an ingested document (see document_store)."""
+    return list(dict.fromkeys(document["topics"])) or [document["summary"].get("title", "Document")]
+
+
+def _select_topics(domain: str, count: int, document: dict = None) -> list:
+    # SHUFFLE topics to ensure different subtopic selection each time
+    pool = document_topic_pool(document) if document is not None else domain_topic_pool(domain)
+    topics_copy = pool.copy()
+    random.shuffle(topics_copy)
+
+    # Cycle through shuffled topics if we need more questions than topics available
+    return [topics_copy[i % len(topics_copy)] for i in range(count)]
+
+
+def retrieve_excerpts(document: dict, topic: str, k: int = TOP_K) -> str:
+    """Top-k passages of an ingested document for a topic, formatted for a prompt."""
+    if document is None:
+        return ""
+    with span("retrieve"):
+        hits = document["index"].search(topic, k)
+    return format_passages(hits)
+
+
+def generate_validated_question(domain: str, topic: str, diff: str, segment: str = None, label: str = "",
+                                document: dict = None) -> dict:
+    """Generate one question, validating/auto-fixing it with up to 3 attempts.
+
+    With an ingested `document`, the question is grounded in the passages
+    retrieved for the topic.
+    """
+    max_retries = 3
+    excerpts = retrieve_excerpts(document, topic)
+
+    for attempt in range(max_retries):
+        try:
+            question = generate_question_with_answer(domain, topic, diff, segment, excerpts)
+
+            # Validate and auto-fix the question
+            with span("validate"):
+                is_valid, fixed_question, error = validate_and_fix_question(question)
+
+            if is_valid:
+                logger.debug("Generated batch question", extra={
+                    "position": label, "topic": topic, "difficulty": diff, "segment": fixed_question.get("segment"),
+                })
+                return fixed_question
+            else:
+                logger.info("Batch question failed validation", extra={
+                    "attempt": attempt + 1, "max_retries": max_retries, "error": error, "topic": topic,
+                })
+                if attempt == max_retries - 1:
+                    # Use the fixed version anyway on last attempt
+                    logger.info("Using auto-fixed question despite validation warning", extra={"topic": topic})
+                    return fixed_question
+        except Exception as e:
+            logger.warning("Batch generation error", extra={
+                "attempt": attempt + 1, "max_retries": max_retries, "error": str(e), "topic": topic,
+            })
+
+    # On final attempt, create a simple fallback
+    logger.warning("Using fallback question", extra={"topic": topic})
+    record_fallback("batch")
+    return {
+        "question_id": str(uuid.uuid4()),
+        "question": f"Explain the key concepts of {topic} in {domain}.",
+        "options": ["A) Option 1", "B) Option 2", "C) Option 3", "D) Option 4"],
+        "correct_answer": "A",
+        "topic": topic,
+        "difficulty": diff,
+        "segment": "MCQ" if diff != "hard" else ("MCQ_REASONING" if segment == "A" else "ASSERTION_REASON"),
+        "reasoning_required": (diff == "hard" and segment == "A"),
+    }
+
+
+def generate_batch_questions(domain: str, count: int = 10, difficulty: str = "moderate", document: dict = None) -> list:
     """
     Generate a batch of questions for a given domain with difficulty-aware logic.
+
+    With an ingested `document` (document_store), topics are its section
+    titles and each question is grounded in the passages retrieved for its topic.
     
     Difficulty behavior:
     - "easy": All questions are easy (definitions, basic concepts)
@@ -494,65 +469,7 @@ def generate_batch_questions(domain: str, count: int = 10, difficulty: str = "mo
     
     Returns list of question dicts with: question_id, question, correct_answer, topic, difficulty
     """
-    
-    # Define topic pools per domain
-    domain_topics = {
-        "machine-learning": [
-            "Supervised Learning", "Unsupervised Learning", "Neural Networks",
-            "Model Evaluation", "Overfitting & Regularization", "Feature Engineering",
-            "Ensemble Methods", "Deep Learning", "Transfer Learning", "Model Deployment"
-        ],
-        "data-science": [
-            "Data Preprocessing", "Statistical Analysis", "Data Visualization",
-            "Hypothesis Testing", "Regression Analysis", "Classification",
-            "Clustering", "Time Series Analysis", "A/B Testing", "ETL Pipelines"
-        ],
-        "operating-systems": [
-            "Process Management", "Memory Management", "File Systems",
-            "Concurrency", "Deadlocks", "Scheduling Algorithms",
-            "Virtual Memory", "I/O Management", "System Calls", "Synchronization"
-        ],
-        "web-development": [
-            "HTTP Protocol", "RESTful APIs", "Frontend Frameworks",
-            "Backend Architecture", "Database Design", "Authentication",
-            "State Management", "Responsive Design", "Performance Optimization", "Security"
-        ],
-        "computer-networks": [
-            "OSI Model", "TCP/IP Protocol", "Routing Algorithms",
-            "Network Security", "DNS", "Load Balancing",
-            "Network Topologies", "Firewalls", "VPN", "Quality of Service"
-        ],
-    }
-    
-    topics = domain_topics.get(domain, ["General Concepts"] * count)
-    
-    # For custom domains (not in predefined list), create varied topic angles
-    if domain not in domain_topics:
-        # Generate varied aspects/subtopics for custom domains
-        custom_angles = [
-            f"{domain} - Fundamentals",
-            f"{domain} - Architecture & Design",
-            f"{domain} - Implementation Strategies",
-            f"{domain} - Best Practices",
-            f"{domain} - Common Challenges",
-            f"{domain} - Performance & Optimization",
-            f"{domain} - Security Considerations",
-            f"{domain} - Real-World Applications",
-            f"{domain} - Advanced Concepts",
-            f"{domain} - Industry Standards"
-        ]
-        topics = custom_angles
-    
-    # SHUFFLE topics to ensure different subtopic selection each time
-    topics_copy = topics.copy()
-    random.shuffle(topics_copy)
-    
-    # Cycle through shuffled topics if we need more questions than topics available
-    selected_topics = []
-    for i in range(count):
-        selected_topics.append(topics_copy[i % len(topics_copy)])
-    
-    questions = []
+    selected_topics = _select_topics(domain, count, document)
     
     # Set difficulty distribution based on user's chosen level
     if difficulty == "easy":
@@ -571,45 +488,23 @@ def generate_batch_questions(domain: str, count: int = 10, difficulty: str = "mo
         difficulties = difficulties[:count]
         segments = [None] * count
     
-    for idx, (topic, diff, segment) in enumerate(zip(selected_topics, difficulties, segments)):
-        max_retries = 3
-        question = None
-        
-        for attempt in range(max_retries):
-            try:
-                question = generate_question_with_answer(domain, topic, diff, segment)
-                
-                # Validate and auto-fix the question
-                is_valid, fixed_question, error = validate_and_fix_question(question)
-                
-                if is_valid:
-                    questions.append(fixed_question)
-                    print(f"[BATCH] Generated {idx + 1}/{count}: {topic} (difficulty={diff}, segment={fixed_question.get('segment')})")
-                    break
-                else:
-                    print(f"[BATCH] Validation failed (attempt {attempt + 1}/{max_retries}): {error}")
-                    if attempt < max_retries - 1:
-                        print(f"[BATCH] Regenerating question for {topic}...")
-                    else:
-                        # Use the fixed version anyway on last attempt
-                        print(f"[BATCH] Using auto-fixed question despite validation warning")
-                        questions.append(fixed_question)
-            except Exception as e:
-                print(f"[BATCH] Generation error (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt == max_retries - 1:
-                    # On final attempt, create a simple fallback
-                    print(f"[BATCH] Using fallback question for {topic}")
-                    fallback = {
-                        "question_id": str(uuid.uuid4()),
-                        "question": f"Explain the key concepts of {topic} in {domain}.",
-                        "options": ["A) Option 1", "B) Option 2", "C) Option 3", "D) Option 4"],
-                        "correct_answer": "A",
-                        "topic": topic,
-                        "difficulty": diff,
-                        "segment": "MCQ" if diff != "hard" else ("MCQ_REASONING" if segment == "A" else "ASSERTION_REASON"),
-                        "reasoning_required": (diff == "hard" and segment == "A"),
-                    }
-                    questions.append(fallback)
-    
-    return questions
+    return [
+        generate_validated_question(domain, topic, diff, segment, f"{idx + 1}/{count}", document)
+        for idx, (topic, diff, segment) in enumerate(zip(selected_topics, difficulties, segments))
+    ]
+
 
+def generate_adaptive_bank(domain: str, count: int = 12, document: dict = None) -> list:
+    """
+    Pre-generate a question bank for adaptive sequencing.
+
+    Questions are spread evenly across ADAPTIVE_LEVELS so the adaptive
+    engine always has items near the student's current ability. A
+    `document` grounds the bank as in generate_batch_questions.
+    """
+    selected_topics = _select_topics(domain, count, document)
+    return [
+        generate_validated_question(domain, topic, *ADAPTIVE_LEVELS[idx % len(ADAPTIVE_LEVELS)], f"{idx + 1}/{count}",
+                                    document)
+        for idx, topic in enumerate(selected_topics)
+    ]
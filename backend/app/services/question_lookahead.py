@@ -0,0 +1,108 @@
+"""
+Speculative question generation for the /question/<session_id> flow.
+
+Every /question call used to wait for a fresh generate_question round
+trip. next_question serves the oldest question in the session's
+look-ahead buffer and then tops the buffer back up to QUESTION_LOOKAHEAD
+questions, generated in the background on a shared pool, so the next
+call usually finds its question ready.
+
+A buffered question that is already generated is served as is and one
+being generated is waited for, up to QUESTION_LOOKAHEAD_WAIT_SECONDS. One
+still queued behind other sessions' work is cancelled, and one that takes
+longer than that is dropped; either way the question is generated live
+instead. The buffer lives on the session under its lookahead_lock, and
+expiring the session cancels whatever is still queued (see session_store).
+The lock is never held while waiting on a question.
+
+Environment:
+    QUESTION_LOOKAHEAD               questions generated ahead per session (default 1, 0 disables)
+    QUESTION_LOOKAHEAD_WORKERS       background question generations in flight (default 4)
+    QUESTION_LOOKAHEAD_WAIT_SECONDS  longest /question waits on a buffered question (default 10)
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, Optional
+
+from .metrics import inc
+from .question_generator import generate_question
+from .session_store import sessions
+
+logger = logging.getLogger(__name__)
+
+LOOKAHEAD = int(os.getenv("QUESTION_LOOKAHEAD", "1"))
+LOOKAHEAD_WORKERS = int(os.getenv("QUESTION_LOOKAHEAD_WORKERS", "4"))
+LOOKAHEAD_WAIT_SECONDS = float(os.getenv("QUESTION_LOOKAHEAD_WAIT_SECONDS", "10"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=LOOKAHEAD_WORKERS, thread_name_prefix="lookahead")
+        return _executor
+
+
+def _generate(session_id: str, session: Dict[str, Any], subject: str, topic: str, difficulty: str) -> dict:
+    # The session may have expired while this was queued
+    if sessions.get(session_id) is not session:
+        raise LookupError("session expired")
+    return generate_question(subject, topic, difficulty)
+
+
+def _buffered(session: Dict[str, Any], wait: float = LOOKAHEAD_WAIT_SECONDS) -> Optional[dict]:
+    """The oldest buffered question, or None if there is none ready in time."""
+    with session["lookahead_lock"]:
+        try:
+            future = session["lookahead"].popleft()
+        except IndexError:
+            future = None
+        cancelled = future is not None and future.cancel()
+    if future is None:
+        inc("assessment_question_lookahead_total", event="miss")
+        return None
+    if cancelled:
+        # Still queued; generating it here is sooner than waiting for a worker
+        inc("assessment_question_lookahead_total", event="cancelled")
+        return None
+    try:
+        question = future.result(timeout=wait)
+    except FutureTimeout:
+        logger.warning("Look-ahead question timed out", extra={"wait_seconds": wait})
+        inc("assessment_question_lookahead_total", event="miss")
+        return None
+    except Exception as e:
+        logger.warning("Look-ahead question failed", extra={"error": str(e)})
+        inc("assessment_question_lookahead_total", event="miss")
+        return None
+    inc("assessment_question_lookahead_total", event="hit")
+    return question
+
+
+def next_question(session_id: str, session: Dict[str, Any], difficulty: str = "medium",
+                  depth: int = LOOKAHEAD) -> dict:
+    """The next question ({question, difficulty}) for the session's subject and topic.
+
+    Served from the look-ahead buffer when possible; afterwards the buffer
+    is refilled to `depth` questions in the background.
+    """
+    subject = session.get("subject", "General")
+    topic = session.get("topic", "Concept")
+    question = _buffered(session)
+    if question is None:
+        question = generate_question(subject, topic, difficulty)
+
+    queued = 0
+    with session["lookahead_lock"]:
+        buffer = session["lookahead"]
+        # An expired session is no longer in the store; don't queue work for it
+        while len(buffer) < depth and sessions.get(session_id) is session:
+            buffer.append(_get_executor().submit(_generate, session_id, session, subject, topic, difficulty))
+            queued += 1
+    inc("assessment_question_lookahead_total", queued, event="queued")
+    return question
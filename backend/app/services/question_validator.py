@@ -2,179 +2,233 @@
 Question validation utilities for strict difficulty-based enforcement.
 
 Ensures all generated questions conform to the required format for each difficulty level.
+
+The rules are declarative: DIFFICULTY_RULES says which segments and style
+hints apply to each difficulty, SEGMENT_RULES what each segment requires.
+Keyword lists are compiled once into a single alternation regex each, and a
+question's text/options are lowercased once per check. Failures carry a
+stable error code (see ERROR_MESSAGES) as well as a readable message;
+validate_batch() checks and fixes many questions at once (e.g. when
+filling a question bank).
 """
+import logging
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
+logger = logging.getLogger(__name__)
 
-def validate_question(question: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+OPTION_LABELS = ("A)", "B)", "C)", "D)")
+ANSWER_LETTERS = frozenset("ABCD")
+
+ERROR_MESSAGES = {
+    "text_too_short": "Question text is too short or empty",
+    "option_count": "Expected exactly 4 options, got {count}",
+    "option_label": "Option {index} must start with '{label}'",
+    "correct_answer": "Invalid correct_answer: {value}. Must be A, B, C, or D",
+    "difficulty": "Invalid difficulty level: {difficulty}. Must be easy, moderate, or hard",
+    "segment": "{difficulty} questions must be MCQ segment, got {segment}",
+    "reasoning_unexpected": "{difficulty} questions should not require reasoning",
+    "reasoning_missing": "Hard {segment} segment must require reasoning",
+    "assertion_reason_missing": "ASSERTION_REASON must contain both Assertion and Reason statements",
+    "assertion_reason_options": "ASSERTION_REASON options must follow standard A-R format",
+}
+
+# Soft checks: reported as warnings, never fail validation
+WARNING_MESSAGES = {
+    "style_definition": "Easy question may not be definition-style",
+    "style_application": "Moderate question may not be application-based",
+}
+
+
+def _keyword_regex(keywords: Sequence[str]) -> "re.Pattern":
+    # Longest first so overlapping keywords match the more specific one
+    return re.compile("|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)))
+
+
+_DEFINITION_KEYWORDS = _keyword_regex(["what is", "which of the following", "define", "identify", "name"])
+_APPLICATION_KEYWORDS = _keyword_regex(["how", "why", "when would", "scenario", "apply", "use"])
+_AR_OPTION_KEYWORDS = _keyword_regex(["both a and r are true", "correct explanation", "a is true", "a is false"])
+AR_MIN_OPTION_KEYWORDS = 2
+
+# "messages" override ERROR_MESSAGES for that difficulty/segment (segment rules win)
+DIFFICULTY_RULES = {
+    "easy": {"segments": ("MCQ",), "default_segment": "MCQ",
+             "style": ("style_definition", _DEFINITION_KEYWORDS), "messages": {}},
+    "moderate": {"segments": ("MCQ",), "default_segment": "MCQ",
+                 "style": ("style_application", _APPLICATION_KEYWORDS),
+                 "messages": {"reasoning_unexpected": "Moderate questions should not require reasoning "
+                                                      "(use hard for that)"}},
+    "hard": {"segments": ("MCQ_REASONING", "ASSERTION_REASON"), "default_segment": "MCQ_REASONING",
+             "style": None,
+             "messages": {"segment": "Hard difficulty must use MCQ_REASONING or ASSERTION_REASON segment, "
+                                     "got {segment}"}},
+}
+
+SEGMENT_RULES = {
+    "MCQ": {"reasoning_required": False, "assertion_reason": False, "messages": {}},
+    "MCQ_REASONING": {"reasoning_required": True, "assertion_reason": False, "messages": {}},
+    "ASSERTION_REASON": {"reasoning_required": False, "assertion_reason": True,
+                         "messages": {"reasoning_unexpected": "ASSERTION_REASON questions should not require "
+                                                              "additional reasoning"}},
+}
+
+
+class ValidationIssue(NamedTuple):
+    code: str
+    message: str
+
+
+def _issue(code: str, *overrides: Dict[str, str], **details: Any) -> ValidationIssue:
+    template = next((m[code] for m in overrides if code in m), ERROR_MESSAGES[code])
+    return ValidationIssue(code, template.format(**details))
+
+
+def check_question(question: Dict[str, Any]) -> Tuple[Optional[ValidationIssue], List[str]]:
     """
-    Validate a question against strict difficulty rules.
-    
-    Returns: (is_valid, error_message)
-    
-    Rules:
-    - Easy: MCQ only, 4 options, no reasoning
-    - Moderate: MCQ only, 4 options, application-based
-    - Hard: Segment A (MCQ + reasoning) or Segment B (Assertion-Reasoning)
+    Run every rule against a question in one pass.
+
+    Returns: (first failing issue or None, list of warning codes)
     """
-    
+    warnings: List[str] = []
     difficulty = question.get("difficulty", "").lower()
     segment = question.get("segment", "MCQ")
     options = question.get("options", [])
     question_text = question.get("question", "")
     reasoning_required = question.get("reasoning_required", False)
-    
+
     # Common validations
     if not question_text or len(question_text.strip()) < 10:
-        return False, "Question text is too short or empty"
-    
+        return _issue("text_too_short"), warnings
     if not options or len(options) != 4:
-        return False, f"Expected exactly 4 options, got {len(options)}"
-    
-    # Validate options are properly labeled A, B, C, D
-    expected_prefixes = ["A)", "B)", "C)", "D)"]
+        return _issue("option_count", count=len(options) if options else 0), warnings
     for i, option in enumerate(options):
-        if not option.strip().startswith(expected_prefixes[i]):
-            return False, f"Option {i+1} must start with '{expected_prefixes[i]}'"
-    
+        if not option.strip().startswith(OPTION_LABELS[i]):
+            return _issue("option_label", index=i + 1, label=OPTION_LABELS[i]), warnings
     correct_answer = question.get("correct_answer", "").strip().upper()
-    if correct_answer not in ["A", "B", "C", "D"]:
-        return False, f"Invalid correct_answer: {correct_answer}. Must be A, B, C, or D"
-    
-    # Difficulty-specific validations
-    if difficulty == "easy":
-        if segment != "MCQ":
-            return False, f"Easy questions must be MCQ segment, got {segment}"
-        
-        if reasoning_required:
-            return False, "Easy questions should not require reasoning"
-        
-        # Check for definition/terminology style (basic check)
-        definition_keywords = ["what is", "which of the following", "define", "identify", "name"]
-        is_definition_style = any(keyword in question_text.lower() for keyword in definition_keywords)
-        
-        if not is_definition_style:
-            # Soft warning - don't fail validation but log
-            print(f"[VALIDATION WARNING] Easy question may not be definition-style: {question_text[:50]}")
-    
-    elif difficulty == "moderate":
-        if segment != "MCQ":
-            return False, f"Moderate questions must be MCQ segment, got {segment}"
-        
-        if reasoning_required:
-            return False, "Moderate questions should not require reasoning (use hard for that)"
-        
-        # Check for application/scenario style (basic check)
-        application_keywords = ["how", "why", "when would", "scenario", "apply", "use"]
-        is_application_style = any(keyword in question_text.lower() for keyword in application_keywords)
-        
-        if not is_application_style:
-            print(f"[VALIDATION WARNING] Moderate question may not be application-based: {question_text[:50]}")
-    
-    elif difficulty == "hard":
-        if segment == "MCQ_REASONING":
-            # Segment A: MCQ + Reasoning required
-            if not reasoning_required:
-                return False, "Hard MCQ_REASONING segment must require reasoning"
-            
-            # Should have standard 4 options
-            if len(options) != 4:
-                return False, "MCQ_REASONING must have exactly 4 options"
-        
-        elif segment == "ASSERTION_REASON":
-            # Segment B: Assertion-Reasoning format
-            if reasoning_required:
-                return False, "ASSERTION_REASON questions should not require additional reasoning"
-            
-            # Check for assertion/reason structure
-            has_assertion = "assertion" in question_text.lower() or "assertion (a)" in question_text.lower()
-            has_reason = "reason" in question_text.lower() or "reason (r)" in question_text.lower()
-            
-            if not (has_assertion and has_reason):
-                return False, "ASSERTION_REASON must contain both Assertion and Reason statements"
-            
-            # Validate options follow A-R format
-            required_ar_keywords = [
-                "both a and r are true",
-                "correct explanation",
-                "a is true",
-                "a is false"
-            ]
-            
-            options_text = " ".join([opt.lower() for opt in options])
-            ar_match_count = sum(1 for keyword in required_ar_keywords if keyword in options_text)
-            
-            if ar_match_count < 2:
-                return False, "ASSERTION_REASON options must follow standard A-R format"
-        
-        else:
-            return False, f"Hard difficulty must use MCQ_REASONING or ASSERTION_REASON segment, got {segment}"
-    
-    else:
-        return False, f"Invalid difficulty level: {difficulty}. Must be easy, moderate, or hard"
-    
-    # All validations passed
+    if correct_answer not in ANSWER_LETTERS:
+        return _issue("correct_answer", value=correct_answer), warnings
+
+    # Difficulty and segment tables
+    rules = DIFFICULTY_RULES.get(difficulty)
+    if rules is None:
+        return _issue("difficulty", difficulty=difficulty), warnings
+    if segment not in rules["segments"]:
+        return _issue("segment", rules["messages"], difficulty=difficulty.capitalize(), segment=segment), warnings
+    seg = SEGMENT_RULES[segment]
+    if reasoning_required and not seg["reasoning_required"]:
+        return _issue("reasoning_unexpected", seg["messages"], rules["messages"],
+                      difficulty=difficulty.capitalize(), segment=segment), warnings
+    if seg["reasoning_required"] and not reasoning_required:
+        return _issue("reasoning_missing", segment=segment), warnings
+
+    text_lower = question_text.lower()
+    if seg["assertion_reason"]:
+        if "assertion" not in text_lower or "reason" not in text_lower:
+            return _issue("assertion_reason_missing"), warnings
+        options_lower = " ".join(options).lower()
+        found = {m.group(0) for m in _AR_OPTION_KEYWORDS.finditer(options_lower)}
+        if len(found) < AR_MIN_OPTION_KEYWORDS:
+            return _issue("assertion_reason_options"), warnings
+
+    if rules["style"] is not None:
+        code, pattern = rules["style"]
+        if pattern.search(text_lower) is None:
+            warnings.append(code)
+
+    return None, warnings
+
+
+def validate_question(question: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+    """
+    Validate a question against strict difficulty rules.
+
+    Returns: (is_valid, error_message)
+
+    Rules:
+    - Easy: MCQ only, 4 options, no reasoning
+    - Moderate: MCQ only, 4 options, application-based
+    - Hard: Segment A (MCQ + reasoning) or Segment B (Assertion-Reasoning)
+    """
+    issue, warnings = check_question(question)
+    for code in warnings:
+        logger.debug(WARNING_MESSAGES[code], extra={"question": question.get("question", "")[:50]})
+    if issue is not None:
+        return False, issue.message
     return True, None
 
 
+def _strip_label(option: str) -> str:
+    text = option.strip()
+    if len(text) >= 2 and text[1] == ")" and text[0] in ANSWER_LETTERS:
+        text = text[2:].lstrip()
+    return text
+
+
 def auto_fix_question(question: Dict[str, Any]) -> Dict[str, Any]:
     """
     Attempt to auto-fix common validation issues.
     Returns fixed question or original if cannot fix.
     """
-    
-    # Fix option labeling if missing
+
+    # Relabel the first 4 options A) .. D), replacing any existing label
     options = question.get("options", [])
-    labels = ["A)", "B)", "C)", "D)"]
-    
-    fixed_options = []
-    for i, option in enumerate(options[:4]):  # Ensure only 4 options
-        opt_text = option.strip()
-        # Remove existing label if present
-        opt_text = re.sub(r'^[A-D]\)\s*', '', opt_text)
-        # Add correct label
-        fixed_options.append(f"{labels[i]} {opt_text}")
-    
-    question["options"] = fixed_options
-    
-    # Normalize correct_answer
+    question["options"] = [f"{OPTION_LABELS[i]} {_strip_label(opt)}" for i, opt in enumerate(options[:4])]
+
+    # Normalize correct_answer to just the letter
     if "correct_answer" in question:
         answer = question["correct_answer"].strip().upper()
-        # Extract just the letter
-        match = re.match(r'^([A-D])', answer)
-        if match:
-            question["correct_answer"] = match.group(1)
-    
+        if answer[:1] in ANSWER_LETTERS:
+            question["correct_answer"] = answer[0]
+
     # Set segment based on difficulty if missing
     difficulty = question.get("difficulty", "moderate").lower()
-    if "segment" not in question:
-        if difficulty == "easy":
-            question["segment"] = "MCQ"
-        elif difficulty == "moderate":
-            question["segment"] = "MCQ"
-        elif difficulty == "hard":
-            # Default to MCQ_REASONING for hard if not specified
-            question["segment"] = "MCQ_REASONING"
-    
+    if "segment" not in question and difficulty in DIFFICULTY_RULES:
+        question["segment"] = DIFFICULTY_RULES[difficulty]["default_segment"]
+
     # Set reasoning_required based on segment
     segment = question.get("segment", "MCQ")
     question["reasoning_required"] = (segment == "MCQ_REASONING")
-    
+
     return question
 
 
 def validate_and_fix_question(question: Dict[str, Any]) -> tuple[bool, Dict[str, Any], Optional[str]]:
     """
     Validate and attempt to auto-fix a question.
-    
+
     Returns: (is_valid, fixed_question, error_message)
     """
-    
+
     # First attempt auto-fix
     fixed_question = auto_fix_question(question.copy())
-    
+
     # Then validate
     is_valid, error = validate_question(fixed_question)
-    
+
     return is_valid, fixed_question, error
+
+
+def validate_batch(questions: Iterable[Dict[str, Any]], fix: bool = True) -> List[Dict[str, Any]]:
+    """
+    Check (and by default auto-fix copies of) many questions.
+
+    Returns one entry per question:
+    {
+      "valid": bool,
+      "question": dict,           # fixed copy when fix=True, else the input
+      "error": {"code", "message"} | None,
+      "warnings": [str],          # soft style codes, see WARNING_MESSAGES
+    }
+    """
+    results = []
+    for question in questions:
+        if fix:
+            question = auto_fix_question(question.copy())
+        issue, warnings = check_question(question)
+        results.append({
+            "valid": issue is None,
+            "question": question,
+            "error": issue._asdict() if issue is not None else None,
+            "warnings": warnings,
+        })
+    return results
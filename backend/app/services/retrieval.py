@@ -0,0 +1,104 @@
+"""
+Local BM25 retrieval over ingested document sections.
+
+At ingest time each section from split_into_sections is cut into passages
+of about RETRIEVAL_PASSAGE_WORDS words and indexed in an in-memory inverted
+index (term -> [(passage, term frequency)]). Document-grounded question
+generation then sends only the top-k passages for a topic to the LLM
+instead of the whole document, so prompt size does not grow with the
+upload. Scoring is Okapi BM25; only the postings of the query's terms are
+visited.
+
+Environment:
+    RETRIEVAL_PASSAGE_WORDS     words per indexed passage (default 180)
+    RETRIEVAL_TOP_K             passages sent with each grounded question (default 3)
+"""
+import heapq
+import math
+import os
+import re
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+PASSAGE_WORDS = int(os.getenv("RETRIEVAL_PASSAGE_WORDS", "180"))
+TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+
+# Okapi BM25 parameters
+K1 = 1.5
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the their this to was were "
+    "which with what when how why".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class Passage(NamedTuple):
+    section: int  # index into the document's sections
+    title: str
+    text: str
+
+
+def split_passages(sections: Iterable[Dict[str, str]], words: int = PASSAGE_WORDS) -> List[Passage]:
+    """Cut each section's content into passages of at most `words` words."""
+    passages = []
+    for i, section in enumerate(sections):
+        tokens = section.get("content", "").split()
+        for start in range(0, len(tokens), words):
+            passages.append(Passage(i, section["title"], " ".join(tokens[start:start + words])))
+    return passages
+
+
+class BM25Index:
+    """Inverted index over passages, scored with BM25."""
+
+    __slots__ = ("passages", "_postings", "_idf", "_norms")
+
+    def __init__(self, passages: Sequence[Passage]):
+        self.passages = list(passages)
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = []
+        for i, passage in enumerate(self.passages):
+            # Titles are indexed with the text so topic names match their own section
+            counts = Counter(tokenize(passage.title + " " + passage.text))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((i, tf))
+
+        n = len(self.passages)
+        avg_len = sum(lengths) / n if n else 0.0
+        self._postings = postings
+        self._idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in postings.items()}
+        # Per-passage length normalisation, K1 * (1 - B + B * len / avg_len)
+        self._norms = [K1 * (1 - B + B * length / avg_len) if avg_len else K1 for length in lengths]
+
+    @classmethod
+    def from_sections(cls, sections: Iterable[Dict[str, str]], words: int = PASSAGE_WORDS) -> "BM25Index":
+        return cls(split_passages(sections, words))
+
+    def __len__(self) -> int:
+        return len(self.passages)
+
+    def search(self, query: str, k: int = TOP_K) -> List[Tuple[Passage, float]]:
+        """The k best-scoring passages for `query`, best first."""
+        scores: Dict[int, float] = {}
+        norms = self._norms
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc, tf in self._postings[term]:
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norms[doc])
+        top = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        return [(self.passages[i], score) for i, score in top]
+
+
+def format_passages(hits: Sequence[Tuple[Passage, float]]) -> str:
+    """Numbered excerpts for a prompt's SOURCE EXCERPTS block."""
+    return "\n".join(f"[{n}] {p.title}: {p.text}" for n, (p, _) in enumerate(hits, 1))
@@ -1,35 +1,139 @@
+"""
+In-memory assessment sessions.
+
+Sessions idle for longer than SESSION_TTL_SECONDS expire: get_session
+treats them as gone, and create_session sweeps them out (at most once a
+SESSION_SWEEP_SECONDS). Expiring a session cancels the questions still
+queued in its look-ahead buffer (see question_lookahead).
+
+Environment:
+    SESSION_TTL_SECONDS     idle time after which a session expires (default 7200)
+    SESSION_SWEEP_SECONDS   minimum interval between expiry sweeps (default 60)
+"""
+import os
+import threading
+import time
 import uuid
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, List
+
+from app.services.confidence_aggregator import ConfidenceAggregator
+from app.services.adaptive_engine import AdaptiveState
+from app.services.confidence_scorer import StreamingConfidenceScorer
+from app.schemas.assessment import Question, Response
 
 # GLOBAL in-memory session store
 # NOTE: This is fine for development
 sessions: Dict[str, Dict[str, Any]] = {}
 
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "7200"))
+SESSION_SWEEP_SECONDS = float(os.getenv("SESSION_SWEEP_SECONDS", "60"))
+
+_last_sweep = 0.0
+
+
+def create_session(subject: str, topic: str, document_id: str | None = None) -> str:
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep >= SESSION_SWEEP_SECONDS:
+        _last_sweep = now
+        expire_sessions(now)
 
-def create_session(subject: str, topic: str) -> str:
     session_id = str(uuid.uuid4())
 
     sessions[session_id] = {
         "subject": subject,
         "topic": topic,
+        # ingested document the session's questions are grounded in, if any
+        "document_id": document_id,
         "questions": [],
         "responses": [],
+        # Report stored by set_confidence; GET /confidence builds its own from the aggregator
         "confidence": None,
+        "aggregator": ConfidenceAggregator(),
+        "adaptive": AdaptiveState(),
+        "timing": StreamingConfidenceScorer(),
+        # question_id -> monotonic time the question was last served
+        "served_at": {},
+        # Futures of questions generated ahead of /question (see question_lookahead),
+        # guarded by lookahead_lock: concurrent requests and expiry all touch it
+        "lookahead": deque(),
+        "lookahead_lock": threading.Lock(),
+        "last_active": now,
     }
 
     return session_id
 
 
 def get_session(session_id: str) -> Dict[str, Any] | None:
-    return sessions.get(session_id)
+    session = sessions.get(session_id)
+    if session is None:
+        return None
+    now = time.monotonic()
+    if now - session["last_active"] > SESSION_TTL_SECONDS:
+        _expire(session_id)
+        return None
+    session["last_active"] = now
+    return session
+
+
+def _expire(session_id: str) -> None:
+    session = sessions.pop(session_id, None)
+    if session is not None:
+        with session["lookahead_lock"]:
+            for future in session["lookahead"]:
+                future.cancel()
+            session["lookahead"].clear()
 
 
-def add_question(session_id: str, question: dict):
-    sessions[session_id]["questions"].append(question)
+def expire_sessions(now: float | None = None) -> List[str]:
+    """Drop sessions idle for longer than SESSION_TTL_SECONDS; returns their ids."""
+    now = time.monotonic() if now is None else now
+    expired = [sid for sid, s in list(sessions.items()) if now - s["last_active"] > SESSION_TTL_SECONDS]
+    for session_id in expired:
+        _expire(session_id)
+    return expired
+
+
+def add_question(session_id: str, question: dict, served: bool = True) -> Question:
+    """Store a question in its compact form and return the stored Question.
+
+    served=False stores it without starting its latency clock (questions
+    generated ahead of being shown, e.g. a batch); mark_question_served
+    starts it later.
+    """
+    stored = Question.from_dict(question)
+    sessions[session_id]["questions"].append(stored)
+    if served:
+        mark_question_served(session_id, stored.get("question_id"))
+    return stored
+
+
+def mark_question_served(session_id: str, question_id: str | None):
+    """Start (or restart) the response-latency clock for a question."""
+    session = sessions[session_id]
+    session["last_active"] = time.monotonic()
+    if question_id:
+        session["served_at"][question_id] = session["last_active"]
 
 
 def add_response(session_id: str, response: dict):
-    sessions[session_id]["responses"].append(response)
+    session = sessions[session_id]
+    session["last_active"] = time.monotonic()
+
+    # Prefer client-measured latency; otherwise time since the question was served
+    served_at = session["served_at"].pop(response.get("question_id"), None)
+    if response.get("time_taken_seconds") is None and served_at is not None:
+        response["time_taken_seconds"] = round(time.monotonic() - served_at, 3)
+
+    session["responses"].append(Response.from_dict(response))
+
+    # Fold the analysis into the running aggregate (O(1)); the report is
+    # built from it on demand by GET /confidence/<session_id>.
+    analysis = response.get("analysis")
+    if analysis:
+        session["aggregator"].add(response.get("topic") or session["topic"], analysis)
+        session["timing"].record(response.get("time_taken_seconds"), analysis)
 
 
 def set_confidence(session_id: str, confidence: dict):
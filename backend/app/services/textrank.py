@@ -0,0 +1,216 @@
+"""
+Local extractive summarizer: TextRank over TF-IDF sentence vectors.
+
+Sentences of every concept become rows of a sparse TF-IDF matrix X
+(L2-normalised, so X @ X.T is cosine similarity). PageRank runs on that
+similarity graph without ever building it: each power iteration is two
+sparse mat-vecs, X @ (X.T @ w), so time and memory stay linear in the
+number of (sentence, term) pairs rather than quadratic in sentences.
+
+The ranks then drive the same summary shape as build_structured_summary
+and the LLM summarizer: the overview is the top sentences in document
+order, main_topics are the sections holding the most rank mass (with
+their best sentences as description and key_points), and key_concepts are
+keyphrases (runs of content words) scored by rank-weighted TF-IDF.
+
+numpy and scipy are imported on first use; without them textrank_summary
+raises RuntimeError and callers fall back to the heuristic summary.
+"""
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.lazy_imports import optional_import
+from .pdf_parser import normalize_text, estimate_difficulty
+from .retrieval import STOPWORDS, tokenize
+
+np = None  # imported on first use by _require_scipy()
+sparse = None
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+OVERVIEW_SENTENCES = 6
+OVERVIEW_MAX_CHARS = 960
+MAX_MAIN_TOPICS = 6
+MAX_KEY_CONCEPTS = 8
+MAX_PHRASE_WORDS = 3
+# Keywords considered for phrases: this many times the number of key concepts,
+# at most a third of the vocabulary
+KEYWORD_POOL_FACTOR = 4
+# Keyphrase candidates come from this many top-ranked sentences
+KEYPHRASE_SENTENCES = 100
+# Overview sentences this similar (cosine) to one already picked are skipped
+MAX_OVERVIEW_SIMILARITY = 0.7
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+# Words that never start, end or join a keyphrase, on top of retrieval's stopwords
+_PHRASE_STOPWORDS = STOPWORDS | frozenset(
+    "can could would should may might must will not but if then than so also into more most such "
+    "these those other each all any some one two many much very every only same used using".split()
+)
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9]*")
+
+
+def _require_scipy():
+    global np, sparse
+    if sparse is None:
+        np = optional_import("numpy")
+        sparse = optional_import("scipy.sparse")
+    if np is None or sparse is None:
+        raise RuntimeError("numpy and scipy are required for the TextRank summarizer")
+
+
+def _sentences(concepts: Sequence[Dict[str, Any]]) -> Tuple[List[str], List[int]]:
+    """All sentences of all concepts, with the concept index of each."""
+    sentences, owners = [], []
+    for i, concept in enumerate(concepts):
+        for s in _SENTENCE_SPLIT.split(concept.get("content", "").strip()):
+            if s:
+                sentences.append(s)
+                owners.append(i)
+    return sentences, owners
+
+
+def tfidf_matrix(sentences: Sequence[str]):
+    """Row-normalised TF-IDF CSR matrix (sentences x terms) and the vocabulary."""
+    _require_scipy()
+    token_lists = [tokenize(s) for s in sentences]
+    vocab: Dict[str, int] = {}
+    setdefault = vocab.setdefault
+    indices = [setdefault(term, len(vocab)) for tokens in token_lists for term in tokens]
+    indptr = np.zeros(len(sentences) + 1, dtype=np.int64)
+    np.cumsum([len(tokens) for tokens in token_lists], out=indptr[1:])
+    data = np.ones(len(indices), dtype=np.float64)
+    x = sparse.csr_matrix((data, np.asarray(indices, dtype=np.int64), indptr),
+                          shape=(len(sentences), len(vocab)))
+    x.sum_duplicates()  # repeated terms in a sentence -> term counts
+
+    df = np.bincount(x.indices, minlength=len(vocab))
+    idf = np.log((1 + x.shape[0]) / (1 + df)) + 1
+    x.data *= idf[x.indices]
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    x = sparse.diags(1 / norms) @ x
+    return x.tocsr(), vocab
+
+
+def textrank(x) -> "np.ndarray":
+    """PageRank scores over the cosine-similarity graph of X's rows."""
+    n = x.shape[0]
+    xt = x.T.tocsr()
+    # A sentence's similarity to itself is 1 (0 for sentences with no terms); exclude it
+    self_sim = (np.diff(x.indptr) > 0).astype(np.float64)
+    degree = x @ (xt @ np.ones(n)) - self_sim
+    degree[degree <= 0] = 1.0
+
+    rank = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        w = rank / degree
+        new = (1 - DAMPING) / n + DAMPING * (x @ (xt @ w) - self_sim * w)
+        new /= new.sum()
+        if np.abs(new - rank).sum() < TOLERANCE:
+            return new
+        rank = new
+    return rank
+
+
+def keyphrases(sentences: Sequence[str], word_scores: Dict[str, float], limit: int = MAX_KEY_CONCEPTS) -> List[str]:
+    """Keyphrases as in TextRank: the top-weighted words, merged with adjacent top words.
+
+    Candidates are runs of up to MAX_PHRASE_WORDS keywords that appear next
+    to each other in the text; a run scores the sum of its words' weights.
+    """
+    pool = max(limit, min(limit * KEYWORD_POOL_FACTOR, len(word_scores) // 3))
+    top = sorted(word_scores, key=word_scores.get, reverse=True)[:pool]
+    keywords = {w for w in top if len(w) > 2 and w not in _PHRASE_STOPWORDS}
+    surface: Dict[Tuple[str, ...], str] = {}
+    for s in sentences:
+        run: List[str] = []
+        for word in _WORD.findall(s) + [""]:
+            if word.lower() in keywords and len(run) < MAX_PHRASE_WORDS:
+                run.append(word)
+                continue
+            if run:
+                surface.setdefault(tuple(w.lower() for w in run), " ".join(run))
+            run = [word] if word.lower() in keywords else []
+
+    chosen: List[str] = []
+    covered: List[set] = []
+    for key in sorted(surface, key=lambda k: sum(word_scores[w] for w in k), reverse=True):
+        words = set(key)
+        # Skip phrases that repeat a word, or only repeat words of a better one
+        if len(words) < len(key) or any(words <= c or c <= words for c in covered):
+            continue
+        chosen.append(surface[key])
+        covered.append(words)
+        if len(chosen) >= limit:
+            break
+    return chosen
+
+
+def textrank_summary(text: str, topics: List[str], concepts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary with the build_structured_summary / summarize_text fields, extracted locally.
+
+    Fields: title, overview, key_concepts, main_topics, difficulty_level, estimated_read_time_minutes
+    """
+    _require_scipy()
+    sentences, owners = _sentences(concepts)
+    if not sentences:
+        raise ValueError("No sentences to summarize")
+    x, vocab = tfidf_matrix(sentences)
+    rank = textrank(x)
+    order = np.argsort(-rank, kind="stable")
+
+    # Overview: best sentences that don't repeat each other, shown in document order
+    picked, total_len = [], 0
+    for i in order:
+        if len(picked) >= OVERVIEW_SENTENCES or total_len + len(sentences[i]) > OVERVIEW_MAX_CHARS:
+            break
+        if picked and (x[picked] @ x[i].T).max() > MAX_OVERVIEW_SIMILARITY:
+            continue
+        picked.append(i)
+        total_len += len(sentences[i])
+    overview = " ".join(sentences[i] for i in sorted(picked)) or sentences[order[0]][:OVERVIEW_MAX_CHARS]
+
+    # Main topics: distinct sections with the most rank mass, in document order
+    mass = np.bincount(np.asarray(owners), weights=rank, minlength=len(concepts))
+    top_sections, titles = [], set()
+    for c in np.argsort(-mass, kind="stable"):
+        title = concepts[c].get("title", "Topic")
+        if title not in titles:
+            titles.add(title)
+            top_sections.append(c)
+            if len(top_sections) >= MAX_MAIN_TOPICS:
+                break
+    ranked_by_section: Dict[int, List[int]] = {c: [] for c in top_sections}
+    for i in order:
+        if owners[i] in ranked_by_section:
+            ranked_by_section[owners[i]].append(i)
+    main_topics = []
+    for c in sorted(top_sections):
+        ranked = ranked_by_section[c]
+        description = " ".join(sentences[i] for i in sorted(ranked[:2]))
+        key_points = [sentences[i] for i in ranked[2:] if len(sentences[i]) > 30][:3]
+        main_topics.append({
+            "name": concepts[c].get("title", "Topic"),
+            "description": description[:840],
+            "key_points": key_points or None,
+        })
+
+    # Keyphrases weighted by how central the sentences using them are
+    word_weights = x.T @ rank
+    terms = list(vocab)
+    word_scores = {terms[j]: float(word_weights[j]) for j in range(len(terms))}
+
+    clean = normalize_text(text)
+    difficulty, read_time = estimate_difficulty(len(clean.split()), len(sentences))
+    return {
+        "title": topics[0] if topics else "Document Summary",
+        "overview": overview,
+        "key_concepts": keyphrases([sentences[i] for i in order[:KEYPHRASE_SENTENCES]], word_scores)
+        or topics[:MAX_KEY_CONCEPTS],
+        "main_topics": main_topics,
+        "difficulty_level": difficulty,
+        "estimated_read_time_minutes": read_time,
+    }
@@ -1,99 +1,23 @@
-import json
-import vertexai
-from vertexai.language_models import TextGenerationModel
-from app.config import PROJECT_ID, VERTEX_LOCATION, VERTEX_API_KEY
+from app.config import PROJECT_ID, VERTEX_LOCATION, VERTEX_API_KEY, SUMMARY_PROVIDER
+from app.services.gemini_analyzer import call_gemini_prompt
+from app.services.llm_json import decode_llm_json
+from app.lazy_imports import optional_import
+from app.services.prompts import render_prompt
 
-SYSTEM_PROMPT = """
-You are a world-class educational content analyst and technical writer. Your mission is to create an exceptionally detailed, comprehensive summary that transforms complex documents into clear, accessible learning resources.
-
-CRITICAL INSTRUCTIONS - READ CAREFULLY:
-
-1. TITLE: 
-   - Create a precise, descriptive title that captures the document's core subject and scope
-   - Should be clear enough that a reader immediately understands what they'll learn
-
-2. OVERVIEW (VERY IMPORTANT - BE COMPREHENSIVE):
-   - Write 5-8 detailed, well-structured sentences (150-250 words total)
-   - First sentence: Introduce the document's primary purpose and what problem/topic it addresses
-   - Next 2-3 sentences: Explain the document's scope, approach, and methodology
-   - Following 2-3 sentences: Highlight key insights, unique perspectives, or important context
-   - Final 1-2 sentences: Explain who benefits from this material and why it matters
-   - Use clear, educational language that sets proper context for learning
-
-3. KEY CONCEPTS (8-12 concepts):
-   - Extract the most important technical terms, frameworks, principles, or methodologies
-   - Include both fundamental concepts and advanced topics
-   - Order them logically (foundational concepts first, then advanced ones)
-   - These should represent the essential vocabulary needed to understand the material
-
-4. MAIN TOPICS (5-10 comprehensive topics):
-   For EACH topic provide:
-   
-   a) NAME: Clear, specific topic heading (not generic)
-   
-   b) DESCRIPTION (CRITICAL - BE DETAILED):
-      - Write 4-7 complete sentences (100-180 words) explaining:
-        * What this topic covers in depth
-        * Why this topic is important in the larger context
-        * How it connects to other topics/concepts in the document
-        * Real-world applications or implications (when relevant)
-        * Any nuances, challenges, or important considerations
-      - Use concrete examples and specific details
-      - Avoid vague statements - be precise and informative
-   
-   c) KEY POINTS (4-7 specific points per topic):
-      - Each point should be a complete, meaningful statement (not just a word)
-      - Include specific details, facts, techniques, or principles
-      - Make each point actionable or clearly educational
-      - Examples: "OAuth 2.0 provides token-based authentication with refresh capabilities" (GOOD)
-                   vs "Authentication" (TOO VAGUE - BAD)
-
-5. DIFFICULTY LEVEL:
-   - Beginner: Basic concepts, minimal prerequisites, introductory material
-   - Intermediate: Requires foundational knowledge, moderate technical depth
-   - Advanced: Complex topics, significant prerequisites, expert-level material
-
-6. ESTIMATED READ TIME:
-   - Calculate realistically based on content density and complexity
-   - Account for technical difficulty (advanced topics take longer to absorb)
-
-QUALITY STANDARDS:
-- Prioritize clarity, accuracy, and educational value above all
-- Every sentence should add meaningful information
-- Avoid generic filler text or obvious statements
-- Write as if teaching someone who wants to deeply understand the material
-- Use proper technical terminology while remaining accessible
-- Create a summary that could serve as comprehensive study notes
-
-Return ONLY valid JSON (no markdown, no code blocks):
-{
-  "title": "Precise, descriptive title of the document",
-  "overview": "5-8 detailed sentences (150-250 words) providing comprehensive context, scope, key insights, and importance of the material",
-  "key_concepts": ["concept1", "concept2", "concept3", "concept4", "concept5", "concept6", "concept7", "concept8"],
-  "main_topics": [
-    {
-      "name": "Specific Topic Name",
-      "description": "4-7 sentences (100-180 words) thoroughly explaining what this topic covers, why it matters, how it connects to other concepts, real-world applications, and important nuances or considerations",
-      "key_points": [
-        "Detailed point 1 with specific information",
-        "Detailed point 2 with specific information",
-        "Detailed point 3 with specific information",
-        "Detailed point 4 with specific information",
-        "Detailed point 5 with specific information"
-      ]
-    }
-  ],
-  "difficulty_level": "Beginner|Intermediate|Advanced",
-  "estimated_read_time_minutes": number
-}
-"""
 
 def summarize_text(text: str) -> dict:
+    if SUMMARY_PROVIDER == "gemini":
+        return _summarize_with_gemini(text)
+
+    vertexai = optional_import("vertexai")
+    language_models = optional_import("vertexai.language_models")
+    if vertexai is None or language_models is None:
+        raise RuntimeError("google-cloud-aiplatform is not installed")
     vertexai.init(project=PROJECT_ID, location=VERTEX_LOCATION)
-    model = TextGenerationModel.from_pretrained("gemini-1.5-flash-002")
+    model = language_models.TextGenerationModel.from_pretrained("gemini-1.5-flash-002")
     
     # Increase input context for better understanding
-    prompt = SYSTEM_PROMPT + "\n\nDocument to analyze:\n" + text[:18000]
+    prompt = render_prompt("summary", text=text[:18000])
     
     response = model.predict(
         prompt,
@@ -102,5 +26,9 @@ def summarize_text(text: str) -> dict:
         top_p=0.9,
         top_k=50
     )
-    cleaned = response.text.replace("```json", "").replace("```", "").strip()
-    return json.loads(cleaned)
\ No newline at end of file
+    return decode_llm_json(response.text, expect=dict)
+
+
+def _summarize_with_gemini(text: str) -> dict:
+    text = call_gemini_prompt("summary", text=text[:18000])
+    return decode_llm_json(text, expect=dict)
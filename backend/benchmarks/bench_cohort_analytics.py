@@ -0,0 +1,81 @@
+"""
+Benchmark: vectorized cohort analytics vs the per-dict confidence_engine path.
+
+Run from backend/:
+    python -m benchmarks.bench_cohort_analytics [responses]
+"""
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+from app.services.confidence_engine import evaluate_concept
+from app.services.cohort_analytics import pack_analyses, cohort_report
+
+TOPICS = ["Process Management", "Memory Management", "File Systems", "Concurrency", "Deadlocks"]
+DIFFICULTIES = ["easy", "moderate", "hard"]
+
+
+def make_records(n: int, responses_per_session: int = 10):
+    rng = random.Random(42)
+    return [
+        {
+            "session_id": f"s{i // responses_per_session}",
+            "topic": rng.choice(TOPICS),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "analysis": {
+                "clarity": rng.randint(0, 100),
+                "correctness": rng.randint(0, 100),
+                "confidence": rng.randint(0, 100),
+                "reasoning_quality": rng.randint(0, 100),
+            },
+        }
+        for i in range(n)
+    ]
+
+
+def per_dict_report(records):
+    """Equivalent report built with evaluate_concept, one dict at a time."""
+    status_counts = defaultdict(int)
+    by_topic = defaultdict(list)
+    by_session = defaultdict(list)
+    for r in records:
+        result = evaluate_concept(r["topic"], [r["analysis"]])
+        status_counts[result["status"]] += 1
+        by_topic[r["topic"]].append(r["analysis"])
+        by_session[r["session_id"]].append(r["analysis"])
+    topics = {t: evaluate_concept(t, a) for t, a in by_topic.items()}
+    sessions = sorted(evaluate_concept(s, a)["confidence_score"] for s, a in by_session.items())
+    return status_counts, topics, sessions
+
+
+def vectorized_report(records):
+    return cohort_report(pack_analyses(records))
+
+
+def _time(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n: int = 100_000):
+    records = make_records(n)
+    frame = pack_analyses(records)
+    results = {
+        "responses": n,
+        "per_dict_seconds": round(_time(per_dict_report, records), 4),
+        "vectorized_seconds": round(_time(vectorized_report, records), 4),
+        "pack_seconds": round(_time(pack_analyses, records), 4),
+        "report_only_seconds": round(_time(cohort_report, frame), 4),
+    }
+    results["speedup"] = round(results["per_dict_seconds"] / max(results["vectorized_seconds"], 1e-9), 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
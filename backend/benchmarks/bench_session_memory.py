@@ -0,0 +1,90 @@
+"""
+Benchmark: per-session memory of questions/responses as plain dicts vs the
+compact slotted models in app.schemas.assessment.
+
+Each question and response goes through a JSON round trip first, as it
+would arriving from the LLM or the client, so the dict baseline holds its
+own copy of every string (including the repeated Assertion-Reason
+options) just like the running app did.
+
+Run from backend/:
+    python -m benchmarks.bench_session_memory [questions_per_session] [sessions]
+"""
+import json
+import random
+import sys
+import tracemalloc
+
+from app.schemas.assessment import Question, Response
+from app.services.answer_grader import grade_mcq_response
+from benchmarks.corpora import make_questions
+
+
+def make_session_payloads(n_questions: int, seed: int = 5):
+    """Questions as decoded from the LLM, plus one answered response per question."""
+    rng = random.Random(seed)
+    questions = [json.loads(json.dumps(q)) for q in make_questions(n_questions, seed=seed)]
+    responses = []
+    for q in questions:
+        option = rng.choice("ABCD")
+        analysis = grade_mcq_response({**q, "reasoning_required": False}, option, rng.randint(0, 100))
+        responses.append(json.loads(json.dumps({
+            "question_id": q["question_id"],
+            "topic": q["topic"],
+            "selected_option": option,
+            "explanation": "",
+            "self_confidence": rng.randint(0, 100),
+            "time_taken_seconds": round(rng.uniform(5, 60), 3),
+            "analysis": analysis,
+        })))
+    return questions, responses
+
+
+def _measure(build, payloads) -> int:
+    """Bytes still allocated by build(payloads) once it returns."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        kept = build(payloads)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def _as_dicts(payloads):
+    # Fresh decode per session, as before: nothing shared between sessions
+    return [(json.loads(qs), json.loads(rs)) for qs, rs in payloads]
+
+
+def _as_models(payloads):
+    return [
+        ([Question(q) for q in json.loads(qs)], [Response(r) for r in json.loads(rs)])
+        for qs, rs in payloads
+    ]
+
+
+def main(n_questions: int = 50, n_sessions: int = 200):
+    questions, responses = make_session_payloads(n_questions)
+    payloads = [(json.dumps(questions), json.dumps(responses))] * n_sessions
+
+    dict_bytes = _measure(_as_dicts, payloads)
+    model_bytes = _measure(_as_models, payloads)
+    sample = _as_models(payloads[:1])[0]
+    assert [q.to_dict() for q in sample[0]] == questions
+    assert [r.to_dict() for r in sample[1]] == responses
+
+    results = {
+        "sessions": n_sessions,
+        "questions_per_session": n_questions,
+        "dict_kb_per_session": round(dict_bytes / n_sessions / 1024, 1),
+        "compact_kb_per_session": round(model_bytes / n_sessions / 1024, 1),
+    }
+    results["reduction"] = round(1 - model_bytes / max(dict_bytes, 1), 3)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
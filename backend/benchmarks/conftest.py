@@ -0,0 +1,89 @@
+"""
+Shared fixtures for the microbenchmarks.
+
+Uses pytest-benchmark's `benchmark` fixture when the plugin is installed.
+Otherwise a minimal compatible fixture (call + pedantic + extra_info) times
+the function and prints an ops/sec table at the end of the run.
+Every benchmark also records one traced run's allocation peak/count in
+`benchmark.extra_info`.
+"""
+import time
+import tracemalloc
+
+import pytest
+
+try:
+    import pytest_benchmark  # noqa: F401
+    HAVE_PYTEST_BENCHMARK = True
+except ImportError:
+    HAVE_PYTEST_BENCHMARK = False
+
+_fallback_results = []
+
+
+def measure_allocations(fn, *args, **kwargs) -> dict:
+    """Run fn once under tracemalloc and return its peak and block count."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        fn(*args, **kwargs)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return {
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "retained_blocks": sum(max(0, s.count_diff) for s in diff),
+    }
+
+
+@pytest.fixture
+def allocations(benchmark):
+    """Call as allocations(fn, *args) to record allocation stats on the benchmark."""
+    def _record(fn, *args, **kwargs):
+        benchmark.extra_info.update(measure_allocations(fn, *args, **kwargs))
+    return _record
+
+
+if not HAVE_PYTEST_BENCHMARK:
+
+    class _FallbackBenchmark:
+        min_rounds = 5
+        min_time = 0.2
+
+        def __init__(self, name: str):
+            self.name = name
+            self.extra_info = {}
+
+        def _run(self, fn, args, kwargs, rounds, min_time=0.0):
+            timings = []
+            result = None
+            deadline = time.perf_counter() + min_time
+            while len(timings) < rounds or time.perf_counter() < deadline:
+                start = time.perf_counter()
+                result = fn(*args, **kwargs)
+                timings.append(time.perf_counter() - start)
+            mean = sum(timings) / len(timings)
+            _fallback_results.append((self.name, len(timings), min(timings), mean, self.extra_info))
+            return result
+
+        def __call__(self, fn, *args, **kwargs):
+            return self._run(fn, args, kwargs, self.min_rounds, self.min_time)
+
+        def pedantic(self, fn, args=(), kwargs=None, rounds=1, iterations=1, **_):
+            return self._run(fn, args, kwargs or {}, max(1, rounds * iterations))
+
+    @pytest.fixture
+    def benchmark(request):
+        return _FallbackBenchmark(request.node.name)
+
+    def pytest_terminal_summary(terminalreporter):
+        if not _fallback_results:
+            return
+        terminalreporter.section("microbenchmarks (fallback timer)")
+        terminalreporter.write_line(f"{'name':60} {'rounds':>6} {'min ms':>10} {'mean ms':>10} {'ops/s':>10}  alloc")
+        for name, rounds, best, mean, extra in _fallback_results:
+            terminalreporter.write_line(
+                f"{name:60} {rounds:>6} {best * 1000:>10.3f} {mean * 1000:>10.3f} {1 / mean:>10.1f}  {extra}"
+            )
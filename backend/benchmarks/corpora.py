@@ -0,0 +1,112 @@
+"""
+Deterministic synthetic inputs for the benchmarks.
+
+Text corpora mimic extracted lecture notes (a Title Case heading followed by
+paragraph lines per page); question batches mimic generate_question_with_answer
+output across every difficulty/segment, including some that need auto-fixing.
+"""
+import random
+import uuid
+from typing import List, Dict, Any
+
+WORDS = (
+    "process memory thread cache latency scheduler kernel buffer queue lock "
+    "page table virtual address request response index query transaction "
+    "replica partition gradient model feature vector network packet route"
+).split()
+
+HEADINGS = [
+    "Process Management", "Memory Hierarchy", "Virtual Memory Basics", "Scheduling Policies",
+    "Deadlock Prevention", "File System Layout", "Network Layers", "Model Evaluation",
+]
+
+# Roughly one printed page of prose
+SENTENCES_PER_PAGE = 24
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+
+def make_text(pages: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    lines: List[str] = []
+    for page in range(pages):
+        lines.append(f"{rng.choice(HEADINGS)} {page + 1}")
+        for _ in range(SENTENCES_PER_PAGE // 3):
+            lines.append("  " + " ".join(_sentence(rng) for _ in range(3)) + "  ")
+    return "\n".join(lines)
+
+
+def make_slides(slides: int, seed: int = 5) -> str:
+    """A noisy slide deck as PDF extraction returns it: one page per slide (form-feed
+    separated), each with a running header, a page number and a one-line body."""
+    rng = random.Random(seed)
+    pages = [
+        "\n".join([
+            "Operating Systems Lecture Notes",
+            f"{rng.choice(HEADINGS)} {slide + 1}",
+            _sentence(rng),
+            f"Page {slide + 1} of {slides}",
+        ])
+        for slide in range(slides)
+    ]
+    return "\f".join(pages)
+
+
+TEXT_SIZES = {"small": 1, "100_pages": 100, "1000_pages": 1000}
+
+
+def make_questions(count: int, seed: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    ar_options = [
+        "A) Both A and R are true, and R is the correct explanation of A",
+        "B) Both A and R are true, but R is NOT the correct explanation of A",
+        "C) A is true, but R is false",
+        "D) A is false, but R is true",
+    ]
+    questions = []
+    for i in range(count):
+        kind = i % 4
+        topic = rng.choice(HEADINGS)
+        if kind == 3:
+            q = {
+                "question": f"Assertion (A): {topic} reduces latency.\n\nReason (R): {_sentence(rng)}",
+                "options": list(ar_options),
+                "difficulty": "hard",
+                "segment": "ASSERTION_REASON",
+                "reasoning_required": False,
+            }
+        else:
+            difficulty = ["easy", "moderate", "hard"][kind]
+            stem = {"easy": "What is", "moderate": "How would you use", "hard": "Why does"}[difficulty]
+            # Every other question has unlabeled options so auto_fix has work to do
+            labels = ["A) ", "B) ", "C) ", "D) "] if i % 2 else ["", "", "", ""]
+            q = {
+                "question": f"{stem} {topic.lower()} in {_sentence(rng)}",
+                "options": [labels[j] + _sentence(rng) for j in range(4)],
+                "difficulty": difficulty,
+                "segment": "MCQ_REASONING" if difficulty == "hard" else "MCQ",
+                "reasoning_required": difficulty == "hard",
+            }
+        q.update({
+            "question_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "correct_answer": rng.choice(["A", "b", "C) x", "D"]),
+            "topic": topic,
+        })
+        questions.append(q)
+    return questions
+
+
+def make_analyses(count: int, seed: int = 13) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "clarity": rng.randint(0, 100),
+            "correctness": rng.randint(0, 100),
+            "confidence": rng.randint(0, 100),
+            "reasoning_quality": rng.randint(0, 100),
+        }
+        for _ in range(count)
+    ]
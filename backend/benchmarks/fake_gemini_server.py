@@ -0,0 +1,340 @@
+"""
+Offline stand-in for the Gemini REST API.
+
+Implements the endpoints call_gemini uses (ListModels, :generateContent,
+:generateText, cachedContents create/patch/get/delete) plus
+:streamGenerateContent, and answers each prompt kind (question,
+question-with-answer, analysis, explanation, summary) with schema-valid
+JSON. Latency, error rate and 429 injection are configurable. Cached
+contents expire after their TTL like the real API, and generate calls that
+use one report cachedContentTokenCount.
+
+Run from backend/:
+    python -m benchmarks.fake_gemini_server --port 8089 --latency-ms 300 --error-rate 0.01
+    GEMINI_BASE=http://127.0.0.1:8089 GEMINI_API_KEY=fake SUMMARY_PROVIDER=gemini python -m app.main
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+MODELS = [
+    {"name": "models/gemini-1.5-flash", "supportedGenerationMethods": ["generateContent", "streamGenerateContent"]},
+    {"name": "models/gemini-1.5-pro", "supportedGenerationMethods": ["generateContent", "streamGenerateContent"]},
+    {"name": "models/text-bison-001", "supportedGenerationMethods": ["generateText"]},
+]
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 0.0
+    # "fixed", "uniform" (0..2x mean) or "lognormal" (median latency_ms, spread latency_sigma)
+    latency_dist: str = "fixed"
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0  # fraction of generate calls answered with HTTP 500
+    rate_limit_rate: float = 0.0  # fraction answered with HTTP 429
+    seed: int = 0
+    cache_min_tokens: int = 0  # reject cachedContents smaller than this (HTTP 400)
+
+
+def _sample_latency(cfg: FakeConfig, rng: random.Random) -> float:
+    mean = cfg.latency_ms / 1000.0
+    if mean <= 0:
+        return 0.0
+    if cfg.latency_dist == "uniform":
+        return rng.uniform(0, 2 * mean)
+    if cfg.latency_dist == "lognormal":
+        return mean * rng.lognormvariate(0, cfg.latency_sigma)
+    return mean
+
+
+def _field(pattern: str, prompt: str, default: str) -> str:
+    m = re.search(pattern, prompt)
+    return m.group(1).strip() if m else default
+
+
+def _options(rng: random.Random):
+    return [f"{k}) Option {k} for this scenario" for k in "ABCD"], rng.choice("ABCD")
+
+
+def fake_payload(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    """Return a JSON-serializable answer shaped for the prompt kind."""
+    topic = _field(r"about: (.+)", prompt, "the concept")
+    difficulty = _field(r'"difficulty": "(\w+)"', prompt, "moderate")
+
+    if "Evaluate the student's response" in prompt:
+        return {
+            "clarity": rng.randint(40, 95),
+            "correctness": rng.randint(40, 95),
+            "confidence": rng.randint(40, 95),
+            "reasoning_quality": rng.randint(40, 95),
+            "short_feedback": "Good structure; add a concrete example to strengthen the reasoning.",
+        }
+    if "Explain the concept below" in prompt:
+        return {
+            "explanation": "In simple terms, the concept breaks a problem into smaller steps.",
+            "example": "For example, looking up a word in a dictionary by opening it in the middle.",
+        }
+    if "educational content analyst" in prompt:
+        return {
+            "title": "Document Summary",
+            "overview": "This document introduces the core ideas and explains how they fit together.",
+            "key_concepts": ["Concept A", "Concept B", "Concept C"],
+            "main_topics": [
+                {
+                    "name": "Concept A",
+                    "description": "Concept A is the foundation the rest of the material builds on.",
+                    "key_points": ["Concept A defines the basic vocabulary used throughout."],
+                }
+            ],
+            "difficulty_level": "Intermediate",
+            "estimated_read_time_minutes": 5,
+        }
+    if "assertion-reasoning question" in prompt:
+        return {
+            "assertion": f"Assertion (A): {topic} improves predictability.",
+            "reason": f"Reason (R): {topic} enforces explicit constraints.",
+            "options": [
+                "A) Both A and R are true, and R is the correct explanation of A",
+                "B) Both A and R are true, but R is NOT the correct explanation of A",
+                "C) A is true, but R is false",
+                "D) A is false, but R is true",
+            ],
+            "correct_answer": rng.choice("AB"),
+            "topic": topic,
+            "difficulty": "hard",
+        }
+    if "multiple-choice question" in prompt:
+        options, answer = _options(rng)
+        starter = "What is" if difficulty == "easy" else "How would you apply"
+        return {
+            "question": f"{starter} {topic} in a typical production scenario?",
+            "options": options,
+            "correct_answer": answer,
+            "reasoning_explanation": "The correct option follows from the definition.",
+            "topic": topic,
+            "difficulty": difficulty,
+        }
+    if "Generate ONE industry-relevant" in prompt:
+        return {
+            "question": f"How would you explain {topic} to a new team member, and when would you use it?",
+            "difficulty": _field(r"Difficulty level: (\w+)", prompt, "medium"),
+        }
+    return {"text": "ok"}
+
+
+def _usage(prompt: str, text: str, cached: str = "") -> Dict[str, int]:
+    # Rough 4-chars-per-token estimate, good enough for accounting tests
+    prompt_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    usage = {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": output_tokens,
+        "totalTokenCount": prompt_tokens + output_tokens,
+    }
+    if cached:
+        usage["cachedContentTokenCount"] = len(cached) // 4
+    return usage
+
+
+def create_fake_app(config: FakeConfig = None) -> Flask:
+    cfg = config or FakeConfig()
+    rng = random.Random(cfg.seed)
+    lock = threading.Lock()
+    stats = {"requests": 0, "errors": 0, "rate_limited": 0, "caches_created": 0, "cache_hits": 0}
+    caches: Dict[str, Dict[str, Any]] = {}  # name -> {"text", "model", "expires_at"}
+    app = Flask(__name__)
+
+    def _inject_faults():
+        """Sleep per the latency distribution; return an error response or None."""
+        with lock:
+            stats["requests"] += 1
+            delay = _sample_latency(cfg, rng)
+            roll = rng.random()
+        if delay:
+            time.sleep(delay)
+        if roll < cfg.rate_limit_rate:
+            with lock:
+                stats["rate_limited"] += 1
+            return jsonify({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}), 429
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            with lock:
+                stats["errors"] += 1
+            return jsonify({"error": {"code": 500, "status": "INTERNAL"}}), 500
+        return None
+
+    def _prompt_text(body: Dict[str, Any]) -> str:
+        if "prompt" in body:
+            return body["prompt"].get("text", "")
+        return _parts_text(body.get("contents"))
+
+    def _parts_text(contents) -> str:
+        return "\n".join(p.get("text", "") for c in contents or [] for p in c.get("parts", []))
+
+    def _ttl_seconds(body: Dict[str, Any]) -> float:
+        return float(str(body.get("ttl", "3600s")).rstrip("s"))
+
+    def _live_cache(name: str):
+        with lock:
+            entry = caches.get(name)
+            if entry is not None and entry["expires_at"] <= time.time():
+                del caches[name]
+                entry = None
+        return entry
+
+    @app.route("/<version>/cachedContents", methods=["POST"])
+    def create_cache(version):
+        body = request.get_json(silent=True) or {}
+        text = _parts_text(body.get("contents"))
+        if len(text) // 4 < cfg.cache_min_tokens:
+            return jsonify({"error": {"code": 400, "message": "Cached content is too small"}}), 400
+        with lock:
+            stats["caches_created"] += 1
+            name = f"cachedContents/fake-{stats['caches_created']}"
+            caches[name] = {"text": text, "model": body.get("model"), "expires_at": time.time() + _ttl_seconds(body)}
+        return jsonify({"name": name, "model": body.get("model"), "usageMetadata": {"totalTokenCount": len(text) // 4}})
+
+    @app.route("/<version>/cachedContents/<cache_id>", methods=["GET", "PATCH", "DELETE"])
+    def cache_resource(version, cache_id):
+        name = f"cachedContents/{cache_id}"
+        entry = _live_cache(name)
+        if entry is None:
+            return jsonify({"error": {"code": 404, "message": f"{name} not found"}}), 404
+        if request.method == "DELETE":
+            with lock:
+                caches.pop(name, None)
+            return jsonify({})
+        if request.method == "PATCH":
+            with lock:
+                entry["expires_at"] = time.time() + _ttl_seconds(request.get_json(silent=True) or {})
+        return jsonify({"name": name, "model": entry["model"]})
+
+    @app.route("/<version>/models", methods=["GET"])
+    def list_models(version):
+        return jsonify({"models": MODELS})
+
+    @app.route("/<version>/models/<model_action>", methods=["POST"])
+    def generate(version, model_action):
+        model, _, action = model_action.partition(":")
+        failure = _inject_faults()
+        if failure is not None:
+            return failure
+
+        body = request.get_json(silent=True) or {}
+        prompt = _prompt_text(body)
+        cached = ""
+        if body.get("cachedContent"):
+            entry = _live_cache(body["cachedContent"])
+            if entry is None:
+                return jsonify({"error": {"code": 403, "message": "CachedContent not found or expired"}}), 403
+            cached = entry["text"]
+            prompt = cached + prompt
+        with lock:
+            if cached:
+                stats["cache_hits"] += 1
+            text = json.dumps(fake_payload(prompt, rng))
+
+        if action == "generateContent":
+            return jsonify({
+                "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP"}],
+                "usageMetadata": _usage(prompt, text, cached),
+                "modelVersion": model,
+            })
+        if action == "generateText":
+            return jsonify({"candidates": [{"output": text}]})
+        if action == "streamGenerateContent":
+            # Split the answer into a few chunks, sent as SSE when alt=sse
+            size = max(1, len(text) // 3)
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            events = [
+                {"candidates": [{"content": {"parts": [{"text": c}], "role": "model"}}]}
+                for c in chunks
+            ]
+            events[-1]["usageMetadata"] = _usage(prompt, text, cached)
+            if request.args.get("alt") == "sse":
+                body = "".join(f"data: {json.dumps(e)}\r\n\r\n" for e in events)
+                return Response(body, mimetype="text/event-stream")
+            return jsonify(events)
+        return jsonify({"error": {"code": 404, "message": f"unknown method {action}"}}), 404
+
+    @app.route("/_fake/config", methods=["GET", "POST"])
+    def fake_config():
+        """Inspect or update the fault/latency config at runtime."""
+        if request.method == "POST":
+            with lock:
+                for k, v in (request.get_json(silent=True) or {}).items():
+                    if hasattr(cfg, k):
+                        setattr(cfg, k, type(getattr(cfg, k))(v))
+        return jsonify({"config": asdict(cfg), "stats": dict(stats)})
+
+    return app
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class FakeGeminiServer:
+    """Run the fake API on a background thread (for load tests)."""
+
+    def __init__(self, config: FakeConfig = None, host: str = "127.0.0.1", port: int = 0, quiet: bool = True):
+        handler = _QuietHandler if quiet else WSGIRequestHandler
+        self._server = make_server(host, port, create_fake_app(config), threaded=True, request_handler=handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self._server.host}:{self._server.port}"
+
+    def start(self) -> "FakeGeminiServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-min-tokens", type=int, default=0)
+    args = parser.parse_args()
+
+    cfg = FakeConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+        cache_min_tokens=args.cache_min_tokens,
+    )
+    server = FakeGeminiServer(cfg, args.host, args.port, quiet=False)
+    print(f"[FakeGemini] Listening on {server.base_url}")
+    server._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+End-to-end load test for the assessment API.
+
+Starts the fake Gemini server and the Flask app in-process (or targets an
+already running backend with --base-url), drives realistic session flows
+with a thread pool, and prints one JSON report with throughput,
+p50/p95/p99 latency per endpoint and peak-RSS growth per scenario.
+
+Run from backend/:
+    python -m benchmarks.load_test --concurrency 8 --iterations 50 --output bench.json
+    python -m benchmarks.load_test --scenarios ingest,answer_flow --llm-latency-ms 200
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import requests
+
+from benchmarks.fake_gemini_server import FakeConfig, FakeGeminiServer
+
+SAMPLE_TEXT = """Binary Search
+Binary search is a divide-and-conquer algorithm used on sorted arrays. It finds a target by halving the search space on every comparison.
+Complexity Analysis
+Each step discards half of the remaining elements, so the running time is logarithmic in the input size. The algorithm needs constant extra memory.
+Common Pitfalls
+Off-by-one errors in the loop bounds are the most frequent bug. Computing the midpoint with low + high can overflow in fixed-width integer languages.
+""" * 20
+
+
+class Recorder:
+    """Thread-safe per-endpoint latency and error collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def call(self, name: str, fn: Callable[[], requests.Response]) -> requests.Response:
+        start = time.perf_counter()
+        resp = None
+        try:
+            resp = fn()
+            ok = resp.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return resp
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[idx], 2)
+
+
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "p50_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "p99_ms": _percentile(ordered, 99),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+# ---- Session flows -----------------------------------------------------------
+
+def flow_ingest(api: str, rec: Recorder) -> None:
+    """ingest -> first page of sections -> revalidate it with its ETag."""
+    resp = rec.call("ingest", lambda: requests.post(f"{api}/ingest", json={"text": SAMPLE_TEXT}, timeout=60))
+    if resp is None or not resp.ok:
+        return
+    url = f"{api}/documents/{resp.json()['document_id']}/sections"
+    resp = rec.call("sections", lambda: requests.get(url, timeout=30))
+    if resp is None or not resp.ok:
+        return
+    etag = resp.headers.get("ETag", "")
+    rec.call("sections-revalidate", lambda: requests.get(url, headers={"If-None-Match": etag}, timeout=30))
+
+
+def flow_explain(api: str, rec: Recorder) -> None:
+    payload = {"title": "Binary Search", "content": "Halve the sorted search space until the target is found."}
+    rec.call("explain", lambda: requests.post(f"{api}/explain", json=payload, timeout=60))
+
+
+def flow_batch_assessment(api: str, rec: Recorder) -> None:
+    """generate-batch, then answer every question (local MCQ grading or LLM reasoning)."""
+    resp = rec.call("generate-batch", lambda: requests.post(
+        f"{api}/generate-batch", json={"domain": "operating-systems", "count": 5, "difficulty": "hard"}, timeout=120))
+    if resp is None or not resp.ok:
+        return
+    data = resp.json()
+    for q in data.get("questions", []):
+        payload = {
+            "session_id": data["session_id"],
+            "question_id": q["question_id"],
+            "selected_option": q.get("correct_answer", "A"),
+            "explanation": "Because the invariant holds after each step.",
+            "self_confidence": 70,
+        }
+        rec.call("answer", lambda: requests.post(f"{api}/answer", json=payload, timeout=60))
+
+
+def flow_answer(api: str, rec: Recorder) -> None:
+    """start -> question/<id> -> answer -> evaluate, the /select page flow."""
+    resp = rec.call("start", lambda: requests.post(
+        f"{api}/start", json={"subject": "Algorithms", "topic": "Binary Search"}, timeout=30))
+    if resp is None or not resp.ok:
+        return
+    session_id = resp.json()["session_id"]
+    resp = rec.call("question", lambda: requests.get(f"{api}/question/{session_id}", timeout=60))
+    if resp is None or not resp.ok:
+        return
+    q = resp.json()
+    payload = {
+        "session_id": session_id,
+        "question_id": q["question_id"],
+        "selected_option": "A",
+        "explanation": "Binary search halves the interval, so it runs in logarithmic time.",
+        "self_confidence": 60,
+    }
+    rec.call("answer", lambda: requests.post(f"{api}/answer", json=payload, timeout=60))
+    rec.call("evaluate", lambda: requests.post(f"{api}/evaluate", json={
+        "question": q["question"], "answer": payload["explanation"], "concept": "Binary Search"}, timeout=60))
+
+
+SCENARIOS: Dict[str, Callable[[str, Recorder], None]] = {
+    "ingest": flow_ingest,
+    "explain": flow_explain,
+    "batch_assessment": flow_batch_assessment,
+    "answer_flow": flow_answer,
+}
+
+
+def run_scenario(api: str, name: str, concurrency: int, iterations: int, trace_memory: bool = False) -> Dict:
+    flow = SCENARIOS[name]
+    rec = Recorder()
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = _max_rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: flow(api, rec), range(iterations)))
+    duration = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    all_latencies = [v for values in rec.latencies.values() for v in values]
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "iterations": iterations,
+        "duration_s": round(duration, 3),
+        "flows_per_s": round(iterations / duration, 2),
+        "requests": len(all_latencies),
+        "throughput_rps": round(len(all_latencies) / duration, 2),
+        "errors": sum(rec.errors.values()),
+        "latency": _latency_summary(all_latencies),
+        "endpoints": {
+            ep: {**_latency_summary(values), "errors": rec.errors.get(ep, 0)}
+            for ep, values in sorted(rec.latencies.items())
+        },
+        # Peak Python allocations during the scenario (in-process runs include the server)
+        "tracemalloc_peak_mb": round(peak / 1e6, 2) if peak is not None else None,
+        # How far this scenario raised the process's peak RSS. ru_maxrss is a
+        # process-wide high-water mark, so a scenario lighter than an earlier
+        # one reports 0; use --trace-memory for a per-scenario peak.
+        "max_rss_growth_mb": round(_max_rss_mb() - rss_before, 2),
+    }
+
+
+def _max_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss / 1e6 if sys.platform == "darwin" else rss / 1024
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+@contextlib.contextmanager
+def local_stack(cfg: FakeConfig):
+    """Fake Gemini + the backend app on background threads; yields the API base URL."""
+    with FakeGeminiServer(cfg) as fake:
+        # Service modules read these at import time, so set them first
+        os.environ["GEMINI_BASE"] = fake.base_url
+        os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+        os.environ["SUMMARY_PROVIDER"] = "gemini"
+
+        from werkzeug.serving import make_server
+        from app.main import create_app
+        from benchmarks.fake_gemini_server import _QuietHandler
+
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True, request_handler=_QuietHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://127.0.0.1:{server.port}/api/assessment"
+        finally:
+            server.shutdown()
+            thread.join(timeout=5)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated: " + ", ".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20, help="session flows per scenario")
+    parser.add_argument("--base-url", help="target a running backend (e.g. http://127.0.0.1:5000/api/assessment)")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--llm-latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-429-rate", type=float, default=0.0)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record per-scenario tracemalloc peaks (slows requests; RSS growth is always reported)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="keep backend log output")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    cfg = FakeConfig(
+        latency_ms=args.llm_latency_ms,
+        latency_dist=args.llm_latency_dist,
+        error_rate=args.llm_error_rate,
+        rate_limit_rate=args.llm_429_rate,
+    )
+    stack = contextlib.nullcontext(args.base_url) if args.base_url else local_stack(cfg)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    results = []
+    # Enter quiet first so the app's log handler binds to the captured stream
+    with quiet, stack as api:
+        for name in names:
+            results.append(run_scenario(api, name, args.concurrency, args.iterations, args.trace_memory))
+
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "llm": None if args.base_url else vars(cfg),
+        "process_max_rss_mb": round(_max_rss_mb(), 2),
+        "scenarios": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
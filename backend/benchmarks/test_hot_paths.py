@@ -0,0 +1,160 @@
+"""
+Microbenchmarks for the pure-Python functions on every request path.
+
+Run from backend/:
+    python -m pytest benchmarks/test_hot_paths.py
+    python -m pytest benchmarks/test_hot_paths.py --benchmark-json=micro.json   # with pytest-benchmark
+    python -m pytest benchmarks/test_hot_paths.py -k "not 1000_pages"           # skip the largest corpus
+"""
+import json
+import random
+
+import pytest
+
+from app.services.pdf_parser import normalize_text, split_into_sections, build_structured_summary, SECTION_MAX_COUNT
+from app.services.concept_extractor import extract_concepts, summarize
+from app.services.question_validator import validate_question, auto_fix_question, validate_and_fix_question, validate_batch
+from app.services.confidence_engine import evaluate_concept
+from app.services.llm_json import decode_llm_json
+from app.services.retrieval import BM25Index
+from app.services.textrank import textrank_summary
+from benchmarks.fake_gemini_server import fake_payload
+from benchmarks.corpora import TEXT_SIZES, make_text, make_slides, make_questions, make_analyses
+
+QUESTION_BATCH = 1000
+
+
+@pytest.fixture(scope="module", params=list(TEXT_SIZES), ids=list(TEXT_SIZES))
+def corpus(request):
+    return request.param, make_text(TEXT_SIZES[request.param])
+
+
+def _rounds(size: str) -> int:
+    # Keep the 1000-page runs to a few rounds
+    return 3 if size == "1000_pages" else 10
+
+
+@pytest.fixture(scope="module")
+def question_batch():
+    return make_questions(QUESTION_BATCH)
+
+
+def test_normalize_text(benchmark, allocations, corpus):
+    size, text = corpus
+    allocations(normalize_text, text)
+    out = benchmark.pedantic(normalize_text, args=(text,), rounds=_rounds(size))
+    assert out
+
+
+def test_split_into_sections(benchmark, allocations, corpus):
+    size, text = corpus
+    clean = normalize_text(text)
+    allocations(split_into_sections, clean)
+    sections = benchmark.pedantic(split_into_sections, args=(clean,), rounds=_rounds(size))
+    assert sections
+
+
+def test_split_noisy_slides(benchmark, allocations):
+    clean = normalize_text(make_slides(2000))
+    allocations(split_into_sections, clean)
+    sections = benchmark.pedantic(split_into_sections, args=(clean,), rounds=3)
+    assert 0 < len(sections) <= SECTION_MAX_COUNT
+    assert not any("Lecture Notes" in content or "Page 7 of" in content for _, content in sections)
+
+
+def test_extract_concepts(benchmark, allocations, corpus):
+    size, text = corpus
+    allocations(extract_concepts, text)
+    concepts = benchmark.pedantic(extract_concepts, args=(text,), rounds=_rounds(size))
+    assert concepts
+
+
+def test_build_structured_summary(benchmark, allocations, corpus):
+    size, text = corpus
+    concepts = extract_concepts(text)
+    topics = [c["title"] for c in concepts]
+    allocations(build_structured_summary, text, topics, concepts)
+    summary = benchmark.pedantic(build_structured_summary, args=(text, topics, concepts), rounds=_rounds(size))
+    assert summary["overview"]
+
+
+def test_bm25_build_index(benchmark, allocations, corpus):
+    size, text = corpus
+    concepts = extract_concepts(text)
+    allocations(BM25Index.from_sections, concepts)
+    index = benchmark.pedantic(BM25Index.from_sections, args=(concepts,), rounds=_rounds(size))
+    assert len(index)
+
+
+def test_bm25_search(benchmark, allocations, corpus):
+    size, text = corpus
+    concepts = extract_concepts(text)
+    index = BM25Index.from_sections(concepts)
+    queries = [c["title"] for c in concepts[:50]]
+    run = lambda qs: [index.search(q) for q in qs]
+    allocations(run, queries)
+    hits = benchmark(run, queries)
+    assert all(hits)
+
+
+def test_textrank_summary(benchmark, allocations, corpus):
+    size, text = corpus
+    concepts = extract_concepts(text)
+    topics = [c["title"] for c in concepts]
+    allocations(textrank_summary, text, topics, concepts)
+    summary = benchmark.pedantic(textrank_summary, args=(text, topics, concepts), rounds=_rounds(size))
+    assert summary["overview"] and summary["main_topics"]
+
+
+def test_concept_summarize(benchmark, allocations, corpus):
+    size, text = corpus
+    content = " ".join(normalize_text(text).splitlines())
+    allocations(summarize, content)
+    assert benchmark(summarize, content)
+
+
+def test_validate_question_batch(benchmark, allocations, question_batch):
+    fixed = [auto_fix_question(dict(q)) for q in question_batch]
+    run = lambda qs: [validate_question(q) for q in qs]
+    allocations(run, fixed)
+    results = benchmark(run, fixed)
+    assert len(results) == QUESTION_BATCH
+
+
+def test_auto_fix_question_batch(benchmark, allocations, question_batch):
+    run = lambda qs: [auto_fix_question(dict(q)) for q in qs]
+    allocations(run, question_batch)
+    assert len(benchmark(run, question_batch)) == QUESTION_BATCH
+
+
+def test_validate_and_fix_question_batch(benchmark, allocations, question_batch):
+    run = lambda qs: [validate_and_fix_question(q) for q in qs]
+    allocations(run, question_batch)
+    results = benchmark(run, question_batch)
+    assert sum(1 for ok, _, _ in results if ok) > QUESTION_BATCH // 2
+
+
+def test_validate_batch(benchmark, allocations, question_batch):
+    allocations(validate_batch, question_batch)
+    results = benchmark(validate_batch, question_batch)
+    assert sum(1 for r in results if r["valid"]) > QUESTION_BATCH // 2
+
+
+@pytest.mark.parametrize("n", [1, 100, 10_000])
+def test_evaluate_concept(benchmark, allocations, n):
+    analyses = make_analyses(n)
+    allocations(evaluate_concept, "Concept", analyses)
+    result = benchmark(evaluate_concept, "Concept", analyses)
+    assert 0 <= result["confidence_score"] <= 100
+
+
+@pytest.mark.parametrize("wrapping", ["bare", "fenced", "chatty"])
+def test_decode_llm_json(benchmark, allocations, wrapping):
+    body = json.dumps(fake_payload("educational content analyst", random.Random(0)), indent=2)
+    text = {
+        "bare": body,
+        "fenced": f"```json\n{body}\n```",
+        "chatty": f"Sure! Here is the summary {{as requested}}:\n```json\n{body}\n```\nLet me know if you need more.",
+    }[wrapping]
+    allocations(decode_llm_json, text)
+    assert benchmark(decode_llm_json, text, dict)["title"]
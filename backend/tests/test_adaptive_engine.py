@@ -0,0 +1,123 @@
+"""
+Adaptive sequencing: the ability update, item selection and /next-question.
+
+Run from backend/:
+    python -m pytest tests/test_adaptive_engine.py
+"""
+import math
+
+import pytest
+
+from app.routes import assessment
+from app.services.adaptive_engine import (
+    ITEM_DIFFICULTY,
+    K_INITIAL,
+    K_MIN,
+    AdaptiveState,
+    item_information,
+    success_probability,
+)
+
+
+def item(question_id, difficulty="moderate", segment="MCQ", topic="Paging"):
+    return {"question_id": question_id, "question": f"Question {question_id}?", "difficulty": difficulty,
+            "segment": segment, "topic": topic, "options": ["A) a", "B) b", "C) c", "D) d"],
+            "correct_answer": "D", "reasoning_explanation": "Because D."}
+
+
+def test_rasch_model():
+    assert success_probability(0.0, 0.0) == 0.5
+    assert success_probability(1.0, 0.0) == pytest.approx(1 / (1 + math.exp(-1)))
+    assert item_information(0.0, 0.0) == 0.25
+    assert item_information(0.0, 2.0) < item_information(0.0, 0.5)
+
+
+def test_elo_update():
+    state = AdaptiveState()
+    assert state.record_outcome(item("q1"), {"is_correct": True}) == pytest.approx(K_INITIAL * 0.5)
+    expected = state.ability + K_INITIAL / math.sqrt(2) * (0 - success_probability(state.ability, 0.0))
+    assert state.record_outcome(item("q2"), {"is_correct": False}) == pytest.approx(expected)
+    assert state.responses == 2
+
+
+def test_llm_correctness_is_scaled():
+    state = AdaptiveState()
+    state.record_outcome(item("q1"), {"correctness": 75})
+    assert state.ability == pytest.approx(K_INITIAL * (0.75 - 0.5))
+    state = AdaptiveState()
+    state.record_outcome(item("q1"), {"correctness": "n/a"})
+    assert state.ability == pytest.approx(K_INITIAL * -0.5)
+
+
+def test_step_size_shrinks_to_floor():
+    state = AdaptiveState()
+    for i in range(100):
+        state.record_outcome(item(f"q{i}"), {"is_correct": i % 2 == 0})
+    before = state.ability
+    state.record_outcome(item("last"), {"is_correct": True})
+    assert state.ability - before == pytest.approx(K_MIN * (1 - success_probability(before, 0.0)))
+
+
+def test_repeated_answer_is_ignored():
+    state = AdaptiveState()
+    first = state.record_outcome(item("q1"), {"is_correct": True})
+    assert state.record_outcome(item("q1"), {"is_correct": True}) == first
+    assert state.record_outcome(item("q1"), {"is_correct": False}) == first
+    assert state.responses == 1
+
+
+def test_next_question_picks_most_informative_and_spreads_topics():
+    bank = [item("easy", "easy"), item("mod", "moderate"), item("hard", "hard", "MCQ_REASONING")]
+    state = AdaptiveState()
+    assert state.next_question(bank)["question_id"] == "mod"
+
+    state = AdaptiveState(ability=1.0)
+    assert state.next_question(bank)["question_id"] == "hard"
+
+    # Same level: the topic not served yet wins
+    state = AdaptiveState()
+    bank = [item("a", topic="Paging"), item("b", topic="Paging"), item("c", topic="Locks")]
+    served = [state.next_question(bank)["question_id"] for _ in range(3)]
+    assert served == ["a", "c", "b"]
+    assert state.next_question(bank) is None
+    assert state.topic_counts == {"Paging": 2, "Locks": 1}
+
+
+def test_next_level_and_least_covered_topic():
+    assert AdaptiveState().next_level() == ("moderate", None)
+    assert AdaptiveState(ability=-2.0).next_level() == ("easy", None)
+    assert AdaptiveState(ability=ITEM_DIFFICULTY[("hard", "ASSERTION_REASON")]).next_level() == ("hard", "B")
+
+    state = AdaptiveState()
+    state.mark_served(item("a", topic="Paging"))
+    state.mark_served(item("b", topic="Locks"))
+    state.mark_served(item("c", topic="Paging"))
+    assert state.least_covered_topic(["Paging", "Locks", "Scheduling"]) == "Scheduling"
+    assert state.least_covered_topic(["Paging", "Locks"]) == "Locks"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(assessment, "generate_adaptive_bank", lambda domain, count, document=None: [
+        item(f"q{i}", *level, topic=f"Topic {i}") for i, level in enumerate(ITEM_DIFFICULTY)])
+    monkeypatch.setattr(assessment, "generate_validated_question",
+                        lambda domain, topic, diff, segment, mode, document=None: item("live", diff, topic=topic))
+    return create_app().test_client()
+
+
+def test_next_question_route_keeps_answer_key_on_server(client):
+    resp = client.post("/api/assessment/generate-batch", json={"domain": "OS", "adaptive": True}).json
+    assert "questions" not in resp
+    session_id = resp["session_id"]
+
+    sources = []
+    for _ in range(len(ITEM_DIFFICULTY) + 1):
+        body = client.get(f"/api/assessment/next-question/{session_id}").json
+        sources.append(body["source"])
+        question = body["question"]
+        assert "correct_answer" not in question
+        assert "reasoning_explanation" not in question
+        assert question["options"] and question["question"]
+    assert sources == ["bank"] * len(ITEM_DIFFICULTY) + ["generated"]
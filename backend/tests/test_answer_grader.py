@@ -0,0 +1,50 @@
+"""
+Local MCQ grading against the answer key.
+
+Run from backend/:
+    python -m pytest tests/test_answer_grader.py
+"""
+import pytest
+
+from app.services.answer_grader import grade_mcq_response, needs_llm_grading
+
+MCQ = {"question": "What is paging?", "correct_answer": "B", "reasoning_required": False}
+
+
+@pytest.mark.parametrize("selected", ["B", "b", " B) ", "B) Fixed-size pages"])
+def test_correct_answer_any_format(selected):
+    analysis = grade_mcq_response(MCQ, selected, 80)
+    assert analysis["is_correct"] is True
+    assert analysis["graded_locally"] is True
+    assert analysis["correctness"] == analysis["clarity"] == analysis["reasoning_quality"] == 100
+    assert analysis["confidence"] == 80
+    assert analysis["short_feedback"] == "Correct. B is the right answer."
+
+
+def test_wrong_answer_inverts_confidence_alignment():
+    analysis = grade_mcq_response(MCQ, "C) Segments", 80)
+    assert analysis["is_correct"] is False
+    assert analysis["correctness"] == 0
+    assert analysis["confidence"] == 20
+    assert analysis["short_feedback"] == "Incorrect. You chose C; the correct answer is B."
+
+
+@pytest.mark.parametrize("stated, expected", [(150, 100), (-5, 0), ("72.6", 73), ("high", 50), (None, 50)])
+def test_self_confidence_clamped(stated, expected):
+    assert grade_mcq_response(MCQ, "B", stated)["confidence"] == expected
+
+
+@pytest.mark.parametrize("selected", [None, "", "E", "Both", 2])
+def test_no_usable_selection(selected):
+    assert grade_mcq_response(MCQ, selected) is None
+
+
+@pytest.mark.parametrize("question", [
+    {**MCQ, "reasoning_required": True},
+    {**MCQ, "correct_answer": ""},
+    {**MCQ, "correct_answer": "Both A and R are true"},
+    {"question": "Explain paging."},
+])
+def test_questions_that_need_the_llm(question):
+    assert needs_llm_grading(question)
+    assert grade_mcq_response(question, "B") is None
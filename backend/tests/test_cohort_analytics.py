@@ -0,0 +1,117 @@
+"""
+Vectorized cohort analytics against the per-response scalar engine.
+
+Every score and status label in the cohort report must match what
+evaluate_concept showed the student for the same analysis.
+
+Run from backend/:
+    python -m pytest tests/test_cohort_analytics.py
+"""
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.routes import assessment
+from app.services import cohort_analytics
+from app.services.cohort_analytics import (
+    NumpyUnavailable,
+    cohort_report,
+    collect_session_records,
+    pack_analyses,
+    status_labels,
+    weak_point_flags,
+    weighted_scores,
+)
+from app.services.confidence_engine import DIMENSIONS, _status_label, _weak_points, evaluate_concept
+
+
+def _records(analyses, sessions=1):
+    return [{"session_id": f"s{i % sessions}", "topic": "Paging", "difficulty": "easy", "analysis": a}
+            for i, a in enumerate(analyses)]
+
+
+def test_scores_and_labels_match_evaluate_concept():
+    rng = random.Random(7)
+    analyses = [{k: rng.randint(0, 100) for k in DIMENSIONS} for _ in range(20000)]
+    analyses += [{k: round(rng.uniform(0, 100), 2) for k in DIMENSIONS} for _ in range(2000)]
+    analyses.append({"clarity": 91, "correctness": 75, "confidence": 59, "reasoning_quality": 38})
+
+    frame = pack_analyses(_records(analyses))
+    scores = weighted_scores(frame)
+    labels = status_labels(scores)
+    expected = [evaluate_concept("c", [a]) for a in analyses]
+    assert [int(s) for s in scores] == [e["confidence_score"] for e in expected]
+    assert list(labels) == [e["status"] for e in expected]
+    assert list(labels) == [_status_label(int(s)) for s in scores]
+    assert (int(scores[-1]), labels[-1]) == (74, "Medium")
+
+
+def test_weak_point_flags_match_scalar_rules():
+    analyses = [{"clarity": 59, "correctness": 60, "confidence": 49, "reasoning_quality": 100},
+                {"clarity": 100, "correctness": 10, "confidence": 50, "reasoning_quality": 59.5}]
+    flags = weak_point_flags(pack_analyses(_records(analyses)))
+    for i, a in enumerate(analyses):
+        flagged = [label for label, f in flags.items() if f[i]]
+        assert flagged == _weak_points(a)
+
+
+def test_non_numeric_values_count_as_zero():
+    frame = pack_analyses(_records([{"clarity": "n/a", "correctness": None, "confidence": "80"}]))
+    assert [float(frame.rows[k][0]) for k in DIMENSIONS] == [0.0, 0.0, 80.0, 0.0]
+    assert int(weighted_scores(frame)[0]) == evaluate_concept("c", [{"confidence": 80}])["confidence_score"]
+
+
+def test_cohort_report():
+    analyses = [{k: 80 for k in DIMENSIONS}, {k: 40 for k in DIMENSIONS}, {k: 60 for k in DIMENSIONS}]
+    report = cohort_report(pack_analyses(_records(analyses, sessions=2)))
+    assert (report["responses"], report["sessions"]) == (3, 2)
+    assert report["status_counts"] == {"Strong": 1, "Medium": 1, "Weak": 1}
+    assert report["score_percentiles"]["p50"] == 60
+    assert report["session_score_percentiles"]["p50"] == 55  # s0: (80+60)/2, s1: 40
+    assert report["topics"]["Paging"]["responses"] == 3
+    assert cohort_report(pack_analyses([]))["responses"] == 0
+
+
+class _GrowingQuestions(list):
+    """Creates another session while the records are being collected."""
+
+    def __init__(self, sessions):
+        super().__init__()
+        self.sessions = sessions
+
+    def __iter__(self):
+        self.sessions.setdefault("late", {"questions": [], "responses": []})
+        return super().__iter__()
+
+
+def test_collect_tolerates_sessions_created_meanwhile():
+    sessions = {}
+    sessions["s1"] = {"topic": "Paging", "questions": _GrowingQuestions(sessions),
+                      "responses": [{"question_id": "q1", "analysis": {"clarity": 50}}, {"question_id": "q2"}]}
+    records = collect_session_records(sessions)
+    assert records == [{"session_id": "s1", "topic": "Paging", "difficulty": None, "analysis": {"clarity": 50}}]
+    assert "late" in sessions
+
+
+@pytest.fixture
+def client():
+    from app.main import create_app
+
+    return create_app().test_client()
+
+
+def test_cohort_route(client):
+    assert client.get("/api/assessment/analytics/cohort").json["success"] is True
+
+
+def test_cohort_route_without_numpy(client, monkeypatch):
+    monkeypatch.setattr(cohort_analytics, "np", None)
+    monkeypatch.setattr(cohort_analytics, "optional_import", lambda name: None)
+    resp = client.get("/api/assessment/analytics/cohort")
+    assert resp.status_code == 503
+    assert resp.json["error"] == "numpy is not installed"
+    with pytest.raises(NumpyUnavailable):
+        pack_analyses([])
+    assert assessment.NumpyUnavailable is NumpyUnavailable
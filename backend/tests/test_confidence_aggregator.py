@@ -0,0 +1,73 @@
+"""
+Running statistics and the incremental confidence report.
+
+The aggregator's report must match evaluate_concept over the same analyses
+(what the route computed before aggregation was incremental).
+
+Run from backend/:
+    python -m pytest tests/test_confidence_aggregator.py
+"""
+import random
+import statistics
+
+import pytest
+
+from app.services.confidence_aggregator import ConfidenceAggregator, RunningStats
+from app.services.confidence_engine import DIMENSIONS, evaluate_concept
+
+
+def _analyses(n: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [{k: rng.randint(0, 100) for k in DIMENSIONS} for _ in range(n)]
+
+
+def test_running_stats_match_statistics():
+    values = [random.Random(1).uniform(0, 100) for _ in range(500)]
+    stats = RunningStats()
+    for v in values:
+        stats.add(v)
+    assert stats.count == 500
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.pvariance(values))
+    assert stats.stddev == pytest.approx(statistics.pstdev(values))
+
+
+def test_running_stats_small_counts():
+    stats = RunningStats()
+    assert (stats.count, stats.mean, stats.variance) == (0, 0.0, 0.0)
+    stats.add(42)
+    assert (stats.mean, stats.variance) == (42, 0.0)
+    assert stats.to_dict() == {"count": 1, "mean": 42.0, "stddev": 0.0}
+
+
+def test_report_matches_evaluate_concept():
+    analyses = _analyses(40)
+    topics = ["Paging", "Scheduling", "Locks"]
+    aggregator = ConfidenceAggregator()
+    for i, analysis in enumerate(analyses):
+        aggregator.add(topics[i % 3], analysis)
+
+    report = aggregator.report("Operating Systems")
+    assert report["responses"] == 40
+    overall = {k: v for k, v in report["overall"].items() if k != "dimensions"}
+    assert overall == evaluate_concept("Operating Systems", analyses)
+    for t, topic in enumerate(topics):
+        expected = evaluate_concept(topic, analyses[t::3])
+        assert {k: v for k, v in report["topics"][topic].items() if k != "dimensions"} == expected
+        assert report["topics"][topic]["dimensions"]["clarity"]["count"] == len(analyses[t::3])
+
+
+def test_non_numeric_dimensions_count_as_zero():
+    aggregator = ConfidenceAggregator()
+    aggregator.add("Paging", {"clarity": "n/a", "correctness": None, "confidence": "80"})
+    dims = aggregator.report()["overall"]["dimensions"]
+    assert dims["clarity"]["mean"] == dims["correctness"]["mean"] == dims["reasoning_quality"]["mean"] == 0
+    assert dims["confidence"]["mean"] == 80
+
+
+def test_empty_report():
+    report = ConfidenceAggregator().report()
+    assert report["responses"] == 0
+    assert report["topics"] == {}
+    assert report["overall"]["concept"] == "Session"
+    assert report["overall"]["weak_points"] == ["insufficient data"]
@@ -0,0 +1,87 @@
+"""
+Streaming timing-aware confidence scorer.
+
+Run from backend/:
+    python -m pytest tests/test_confidence_scorer.py
+"""
+import random
+import statistics
+
+import pytest
+
+from app.services.confidence_scorer import StreamingConfidenceScorer, compute_confidence
+
+
+def _batch_score(latencies, analyses):
+    """The blend computed over the whole history at once (what the scorer replaced)."""
+    clarity = statistics.fmean(a["clarity"] / 100 for a in analyses)
+    consistency = sum(a["confidence"] >= 70 for a in analyses) / len(analyses)
+    speed = min(1.0, 30 / statistics.fmean(latencies))
+    return min(round(clarity * 40 + speed * 30 + consistency * 30), 100)
+
+
+def test_streaming_matches_batch():
+    rng = random.Random(5)
+    scorer = StreamingConfidenceScorer()
+    latencies, analyses = [], []
+    for i in range(50):
+        latency = rng.uniform(5, 90)
+        analysis = {"clarity": rng.randint(0, 100), "confidence": rng.randint(0, 100), "short_feedback": f"#{i}"}
+        scorer.record(latency, analysis)
+        latencies.append(latency)
+        analyses.append(analysis)
+
+        result = scorer.result()
+        assert result["answers"] == i + 1
+        assert result["confidence_score"] == _batch_score(latencies, analyses)
+        assert result["average_response_time"] == round(statistics.fmean(latencies))
+        assert result["response_time_stddev"] == pytest.approx(round(statistics.pstdev(latencies), 2))
+    assert result["insights"] == ["#45", "#46", "#47", "#48", "#49"]
+
+
+def test_speed_credit():
+    fast, slow = StreamingConfidenceScorer(), StreamingConfidenceScorer()
+    fast.record(10, {"clarity": 100, "confidence": 90})
+    slow.record(60, {"clarity": 100, "confidence": 90})
+    assert fast.result()["confidence_score"] == 100
+    assert slow.result()["confidence_score"] == 85  # 40 + 0.5 * 30 + 30
+    assert slow.result()["confidence_label"] == "Strong Confidence"
+
+
+@pytest.mark.parametrize("time_taken", [None, 0, -3, float("nan"), float("inf"), "fast", [], {}])
+def test_invalid_time_taken_is_not_a_latency(time_taken):
+    scorer = StreamingConfidenceScorer()
+    scorer.record(time_taken, {"clarity": 80, "confidence": 90})
+    scorer.record("12.5", {"clarity": 80, "confidence": 90})
+    assert scorer.latency.count == 1
+    assert scorer.latency.mean == 12.5
+    assert scorer.count == 2
+
+
+def test_no_latency_drops_the_speed_term():
+    scorer = StreamingConfidenceScorer()
+    scorer.record(None, {"clarity": 50, "confidence": 90})
+    result = scorer.result()
+    # (0.5 * 40 + 1.0 * 30) / 70, not 0.5 * 40 + 0.5 * 30 + 1.0 * 30 with clarity standing in for speed
+    assert result["confidence_score"] == round(50 / 70 * 100) == 71
+    assert result["average_response_time"] == 0
+    assert result["response_time_stddev"] == 0
+
+    scorer = StreamingConfidenceScorer()
+    scorer.record(None, {"clarity": 100, "confidence": 10})
+    assert scorer.result()["confidence_score"] == round(40 / 70 * 100)
+
+
+def test_clarity_score_and_confidence_language():
+    scorer = StreamingConfidenceScorer()
+    scorer.record(30, {"clarity_score": 0.5, "confidence_language": "high", "clarity": 0})
+    assert scorer.clarity.mean == 0.5
+    assert scorer.result()["consistency_score"] == 100
+
+
+def test_compute_confidence():
+    assert compute_confidence({}) is None
+    scorer = StreamingConfidenceScorer()
+    assert compute_confidence({"timing": scorer}) is None
+    scorer.record(30, {"clarity": 100, "confidence": 100})
+    assert compute_confidence({"timing": scorer})["confidence_score"] == 100
@@ -0,0 +1,132 @@
+"""
+Context cache lifecycle against the offline Gemini stand-in.
+
+ContextCache runs with the real cachedContents create/refresh calls from
+gemini_analyzer, pointed at benchmarks/fake_gemini_server, and a
+controllable clock so expiry and the refresh window are deterministic.
+
+Run from backend/:
+    python -m pytest tests/test_context_cache.py
+"""
+import pytest
+import requests
+
+from app.services import context_cache, gemini_analyzer
+from app.services.context_cache import ContextCache, REFRESH_FRACTION
+from benchmarks.fake_gemini_server import FakeConfig, FakeGeminiServer
+
+MODEL = "gemini-1.5-flash"
+PREFIX = "You are an expert tutor. Answer in JSON.\n" * 20
+TTL = 1000
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with FakeGeminiServer(FakeConfig()) as srv:
+        monkeypatch.setattr(gemini_analyzer, "GEMINI_BASE", srv.base_url)
+        monkeypatch.setattr(gemini_analyzer, "GEMINI_API_KEY", "fake")
+        yield srv
+
+
+def _stats(srv) -> dict:
+    return requests.get(f"{srv.base_url}/_fake/config", timeout=5).json()["stats"]
+
+
+def _delete(srv, name: str) -> None:
+    requests.delete(f"{srv.base_url}/{gemini_analyzer.GEMINI_API_VERSION}/{name}", timeout=5)
+
+
+def _cache(clock, **kwargs) -> ContextCache:
+    kwargs.setdefault("min_tokens", 0)
+    return ContextCache(gemini_analyzer._create_cached_content, gemini_analyzer._refresh_cached_content,
+                        ttl=TTL, clock=clock, **kwargs)
+
+
+def test_create_then_hit(server):
+    cache = _cache(Clock())
+    name = cache.handle(MODEL, PREFIX)
+    assert name and name.startswith("cachedContents/")
+    assert cache.handle(MODEL, PREFIX) == name
+    assert _stats(server)["caches_created"] == 1
+
+
+def test_refresh_inside_refresh_window(server):
+    clock = Clock()
+    cache = _cache(clock)
+    name = cache.handle(MODEL, PREFIX)
+    clock.now = TTL * (1 - REFRESH_FRACTION / 2)
+    assert cache.handle(MODEL, PREFIX) == name
+    # Refreshed: still a hit well past the original expiry
+    clock.now = TTL * 1.5
+    assert cache.handle(MODEL, PREFIX) == name
+    assert _stats(server)["caches_created"] == 1
+
+
+def test_failed_refresh_recreates(server):
+    clock = Clock()
+    cache = _cache(clock)
+    name = cache.handle(MODEL, PREFIX)
+    _delete(server, name)
+    clock.now = TTL * (1 - REFRESH_FRACTION / 2)
+    new = cache.handle(MODEL, PREFIX)
+    assert new and new != name
+    assert _stats(server)["caches_created"] == 2
+
+
+def test_expired_handle_recreated(server):
+    clock = Clock()
+    cache = _cache(clock)
+    name = cache.handle(MODEL, PREFIX)
+    clock.now = TTL + 1
+    assert cache.handle(MODEL, PREFIX) not in (None, name)
+
+
+def test_small_prefix_not_cached(server):
+    cache = _cache(Clock(), min_tokens=10_000)
+    assert cache.handle(MODEL, PREFIX) is None
+    assert _stats(server)["caches_created"] == 0
+
+
+def test_rejected_create_backs_off(server):
+    requests.post(f"{server.base_url}/_fake/config", json={"cache_min_tokens": 10_000}, timeout=5)
+    clock = Clock()
+    calls = []
+
+    def create(model, text, ttl):
+        calls.append(model)
+        return gemini_analyzer._create_cached_content(model, text, ttl)
+
+    cache = ContextCache(create, gemini_analyzer._refresh_cached_content, ttl=TTL, min_tokens=0, clock=clock)
+    assert cache.handle(MODEL, PREFIX) is None
+    assert cache.handle(MODEL, PREFIX) is None
+    assert len(calls) == 1
+    clock.now = context_cache.FAILURE_BACKOFF_SECONDS + 1
+    cache.handle(MODEL, PREFIX)
+    assert len(calls) == 2
+
+
+def test_call_gemini_uses_and_invalidates_handle(server, monkeypatch):
+    cache = _cache(Clock())
+    monkeypatch.setattr(gemini_analyzer, "CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(gemini_analyzer, "_context_cache", cache)
+    prompt = PREFIX + "Explain the concept: Binary Search"
+
+    assert gemini_analyzer.call_gemini(prompt, cacheable_prefix=PREFIX)
+    assert _stats(server)["cache_hits"] == 1
+
+    # Provider dropped the handle: the call still succeeds with the full prompt
+    # and the next call uploads the prefix again
+    _delete(server, cache.handle(MODEL, PREFIX))
+    assert gemini_analyzer.call_gemini(prompt, cacheable_prefix=PREFIX)
+    assert gemini_analyzer.call_gemini(prompt, cacheable_prefix=PREFIX)
+    stats = _stats(server)
+    assert stats["caches_created"] == 2
+    assert stats["cache_hits"] == 2
@@ -0,0 +1,112 @@
+"""
+Incremental re-ingest: section reuse, diff_sections and the summary-reuse decision.
+
+Run from backend/:
+    python -m pytest tests/test_document_store.py
+"""
+import pytest
+
+from app.routes import assessment
+from app.services.concept_extractor import extract_concepts
+from app.services.document_store import create_document, diff_sections, get_document, reusable_sections
+
+SECTIONS = {
+    "Process Scheduling": "The scheduler picks the next runnable process. Round robin gives each process a "
+                          "fixed time slice and preempts it when the slice expires.",
+    "Virtual Memory": "Virtual memory gives every process its own address space. Pages are mapped to "
+                      "physical frames and swapped to disk under memory pressure.",
+    "File Systems": "A file system maps names to blocks on disk. Journaling file systems log metadata "
+                    "changes first so a crash cannot leave the tree inconsistent.",
+}
+
+
+def _text(*titles: str, edits=None) -> str:
+    edits = edits or {}
+    return "\n".join(f"{t}\n{edits.get(t, SECTIONS[t])}" for t in titles)
+
+
+def _store(text: str) -> dict:
+    concepts = extract_concepts(text)
+    document_id = create_document(text, concepts, [c["title"] for c in concepts], {"source": "heuristic"}, "raw_text")
+    return get_document(document_id)
+
+
+def _reingest(previous: dict, text: str):
+    concepts = extract_concepts(text, reusable_sections(previous))
+    return concepts, diff_sections(previous, concepts)
+
+
+def test_unchanged_sections_are_reused_as_is():
+    previous = _store(_text("Process Scheduling", "Virtual Memory", "File Systems"))
+    concepts, diff = _reingest(previous, _text("Process Scheduling", "Virtual Memory", "File Systems"))
+    assert all(new is old for new, old in zip(concepts, previous["sections"]))
+    assert diff == {"reused": 3, "recomputed": 0, "removed": 0, "changed_fraction": 0.0}
+
+
+def test_edited_section_is_recomputed():
+    previous = _store(_text("Process Scheduling", "Virtual Memory", "File Systems"))
+    edited = SECTIONS["Virtual Memory"].replace("disk", "a swap partition")
+    concepts, diff = _reingest(previous, _text("Process Scheduling", "Virtual Memory", "File Systems",
+                                               edits={"Virtual Memory": edited}))
+    assert concepts[0] is previous["sections"][0] and concepts[2] is previous["sections"][2]
+    assert concepts[1] is not previous["sections"][1]
+    assert (diff["reused"], diff["recomputed"], diff["removed"]) == (2, 1, 1)
+    total = max(sum(len(c["content"]) for c in concepts), sum(len(s["content"]) for s in previous["sections"]))
+    expected = (len(concepts[1]["content"]) + len(previous["sections"][1]["content"])) / total
+    assert diff["changed_fraction"] == pytest.approx(expected, abs=1e-4)
+
+
+def test_added_and_removed_sections():
+    previous = _store(_text("Process Scheduling", "Virtual Memory"))
+    _, added = _reingest(previous, _text("Process Scheduling", "Virtual Memory", "File Systems"))
+    assert (added["reused"], added["recomputed"], added["removed"]) == (2, 1, 0)
+    _, removed = _reingest(previous, _text("Process Scheduling"))
+    assert (removed["reused"], removed["recomputed"], removed["removed"]) == (1, 0, 1)
+    assert removed["changed_fraction"] > 0
+
+
+def test_duplicate_sections_match_as_a_multiset():
+    previous = _store(_text("Virtual Memory", "Process Scheduling", "Virtual Memory"))
+    assert len(previous["sections"]) == 3
+    assert len(reusable_sections(previous)) == 2
+
+    _, dropped = _reingest(previous, _text("Virtual Memory", "Process Scheduling"))
+    assert (dropped["reused"], dropped["recomputed"], dropped["removed"]) == (2, 0, 1)
+    assert dropped["changed_fraction"] > 0
+
+    concepts, extra = _reingest(previous, _text("Virtual Memory", "Process Scheduling", "Virtual Memory",
+                                                "Virtual Memory"))
+    assert (extra["reused"], extra["recomputed"], extra["removed"]) == (4, 0, 0)
+    assert extra["changed_fraction"] > 0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(assessment, "initial_summary", lambda text, topics, concepts, source: (
+        {"title": "Local", "source": "textrank"}, False))
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("edits, reused", [
+    ({}, True),  # identical text: returned as stored
+    ({"File Systems": SECTIONS["File Systems"].replace("metadata", "metadata and data")}, True),
+    ({t: c.upper() for t, c in SECTIONS.items()}, False),
+])
+def test_llm_summary_kept_when_little_changed(client, monkeypatch, edits, reused):
+    monkeypatch.setattr(assessment, "REINGEST_RESUMMARIZE_FRACTION", 0.75)
+    titles = ("Process Scheduling", "Virtual Memory", "File Systems")
+    document_id = client.post("/api/assessment/ingest", json={"text": _text(*titles)}).json["document_id"]
+    llm_summary = {"title": "From the LLM", "source": "vertex_ai"}
+    get_document(document_id)["summary"] = llm_summary
+
+    resp = client.post("/api/assessment/ingest", json={"text": _text(*titles, edits=edits),
+                                                       "document_id": document_id}).json
+    assert resp["reingest"]["summary_reused"] is reused
+    assert (resp["summary"] == llm_summary) is reused
+
+
+def test_reingest_unknown_document(client):
+    resp = client.post("/api/assessment/ingest", json={"text": _text("File Systems"), "document_id": "nope"})
+    assert resp.status_code == 404
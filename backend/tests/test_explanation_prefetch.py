@@ -0,0 +1,189 @@
+"""
+Explanation prefetch: queueing the largest sections, reuse of a prefetched
+explanation (also across re-ingest) and the fallbacks to a live call.
+
+Run from backend/:
+    python -m pytest tests/test_explanation_prefetch.py
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from app.routes import assessment
+from app.services import explanation_prefetch, metrics
+from app.services.document_store import create_document, get_document
+from app.services.explanation_prefetch import cached_explanation, prefetch_explanations
+
+SECTIONS = {
+    "Process Scheduling": "The scheduler picks the next runnable process. " * 3,
+    "Virtual Memory": "Virtual memory gives every process its own address space. " * 5,
+    "File Systems": "A file system maps names to blocks on disk. " * 4,
+    "Interrupts": "Devices raise interrupts. ",
+}
+
+
+def _events():
+    series = metrics._counters.get("assessment_explain_prefetch_total", {})
+    return {dict(labels)["event"]: value for labels, value in series.items()}
+
+
+def _store(sections: dict, document_id: str = None) -> dict:
+    sections = [{"title": t, "content": c} for t, c in sections.items()]
+    text = "\n".join(s["content"] for s in sections)
+    document_id = create_document(text, sections, [s["title"] for s in sections], {"title": "OS"}, "raw_text",
+                                  document_id)
+    return get_document(document_id)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """explain_with_llm stand-in recording the concepts it was asked for."""
+    calls = []
+
+    def explain(title, content):
+        calls.append(title)
+        return {"explanation": f"{title} explained", "example": "e.g."}
+
+    monkeypatch.setattr(explanation_prefetch, "explain_with_llm", explain)
+    monkeypatch.setattr(explanation_prefetch, "_executor", ThreadPoolExecutor(2, thread_name_prefix="explain"))
+    metrics.reset()
+    yield calls
+    metrics.reset()
+
+
+def _wait(document: dict):
+    for future in document["explanations"].values():
+        future.exception(5)
+
+
+def test_largest_sections_are_prefetched_and_reused(llm):
+    document = _store(SECTIONS)
+    assert prefetch_explanations(document, count=2) == 2
+    _wait(document)
+    assert sorted(llm) == ["File Systems", "Virtual Memory"]
+
+    content = SECTIONS["Virtual Memory"]
+    assert cached_explanation(document, "Virtual Memory", content) == {
+        "explanation": "Virtual Memory explained", "example": "e.g."}
+    assert cached_explanation(document, "Interrupts", SECTIONS["Interrupts"]) is None
+    # Same title, different content: a different section
+    assert cached_explanation(document, "Virtual Memory", content + "Edited.") is None
+    assert len(llm) == 2
+    assert _events() == {"queued": 2, "hit": 1, "miss": 2}
+
+
+def test_prefetch_is_off_by_default(llm):
+    document = _store(SECTIONS)
+    assert prefetch_explanations(document) == 0
+    assert document["explanations"] == {}
+    assert llm == []
+
+
+def test_reingest_keeps_explanations_of_unchanged_sections(llm):
+    previous = _store(SECTIONS)
+    prefetch_explanations(previous, count=4)
+    _wait(previous)
+    failed = Future()
+    failed.set_exception(RuntimeError("LLM down"))
+    key = previous["manifest"][list(SECTIONS).index("Interrupts")]
+    previous["explanations"][key] = failed
+
+    edited = {**SECTIONS, "File Systems": "Journaling file systems log metadata first. " * 4}
+    document = _store(edited, previous["document_id"])
+    assert prefetch_explanations(document, previous, count=4) == 2  # edited and failed sections
+    _wait(document)
+    assert sorted(llm[4:]) == ["File Systems", "Interrupts"]
+    for title, content in edited.items():
+        assert cached_explanation(document, title, content)["explanation"] == f"{title} explained"
+    assert _events()["hit"] == 4
+
+
+def test_queued_prefetch_is_cancelled_for_a_live_call(llm):
+    document = _store(SECTIONS)
+    queued = Future()
+    key = document["manifest"][0]
+    document["explanations"][key] = queued
+
+    assert cached_explanation(document, "Process Scheduling", SECTIONS["Process Scheduling"]) is None
+    assert queued.cancelled()
+    assert key not in document["explanations"]
+    assert _events() == {"cancelled": 1}
+
+
+def test_slow_prefetch_times_out_and_is_kept(llm):
+    document = _store(SECTIONS)
+    running = Future()
+    running.set_running_or_notify_cancel()
+    key = document["manifest"][0]
+    document["explanations"][key] = running
+
+    assert cached_explanation(document, "Process Scheduling", SECTIONS["Process Scheduling"], wait=0.1) is None
+    assert document["explanations"][key] is running  # still there for the next request
+    assert _events() == {"miss": 1}
+
+    running.set_result({"explanation": "late", "example": ""})
+    assert cached_explanation(document, "Process Scheduling", SECTIONS["Process Scheduling"], wait=0.1) == {
+        "explanation": "late", "example": ""}
+    assert _events() == {"miss": 1, "hit": 1}
+
+
+def test_failed_prefetch_is_dropped(llm):
+    document = _store(SECTIONS)
+    failed = Future()
+    failed.set_exception(RuntimeError("LLM down"))
+    key = document["manifest"][0]
+    document["explanations"][key] = failed
+
+    assert cached_explanation(document, "Process Scheduling", SECTIONS["Process Scheduling"]) is None
+    assert key not in document["explanations"]
+    assert _events() == {"miss": 1}
+
+
+def test_replaced_document_skips_queued_prefetches(llm, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(explanation_prefetch, "_executor", ThreadPoolExecutor(1, thread_name_prefix="explain"))
+    explanation_prefetch._executor.submit(gate.wait, 5)  # hold the only worker
+
+    previous = _store(SECTIONS)
+    prefetch_explanations(previous, count=2)
+    _store(SECTIONS, previous["document_id"])  # re-ingested before the prefetches ran
+    gate.set()
+    for future in previous["explanations"].values():
+        assert isinstance(future.exception(5), LookupError)
+    assert llm == []
+
+
+@pytest.fixture
+def client(llm, monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(assessment, "initial_summary", lambda text, topics, concepts, source: (
+        {"title": "OS", "source": "textrank"}, False))
+    monkeypatch.setattr(prefetch_explanations, "__defaults__", (None, 1))
+    live = []
+    monkeypatch.setattr(assessment, "explain_concept", lambda title, content: live.append(title) or {
+        "explanation": f"{title} live", "example": ""})
+    return create_app().test_client(), live
+
+
+def test_explain_route_serves_prefetched_explanation(client, llm):
+    client, live = client
+    text = "\n".join(f"{title}\n{content}" for title, content in SECTIONS.items())
+    document_id = client.post("/api/assessment/ingest", json={"text": text}).json["document_id"]
+    document = get_document(document_id)
+    _wait(document)
+    assert len(llm) == 1
+    section = max(document["sections"], key=lambda s: len(s["content"]))
+    other = min(document["sections"], key=lambda s: len(s["content"]))
+
+    def explain(s, **extra):
+        return client.post("/api/assessment/explain",
+                           json={"title": s["title"], "content": s["content"], **extra}).json["explanation"]
+
+    assert explain(section, document_id=document_id)["explanation"] == f"{section['title']} explained"
+    assert live == []
+    assert explain(other, document_id=document_id)["explanation"] == f"{other['title']} live"
+    assert explain(section)["explanation"] == f"{section['title']} live"
+    assert explain(section, document_id="missing")["explanation"] == f"{section['title']} live"
+    assert len(llm) == 1
@@ -0,0 +1,48 @@
+"""
+Import-time budget for the app factory.
+
+Runs `from app.main import create_app` in a fresh interpreter (best of a few
+runs, so one noisy run doesn't fail the build) and fails if it takes longer
+than IMPORT_BUDGET_MS or if a heavy SDK got imported eagerly.
+
+Run from backend/:
+    python -m pytest tests/test_import_budget.py
+    IMPORT_BUDGET_MS=400 python -m pytest tests/test_import_budget.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+from app.lazy_imports import HEAVY_MODULES
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1500"))
+RUNS = 3
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app.main import create_app
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed_ms, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe() -> dict:
+    env = dict(os.environ, WARM_IMPORTS="0", PROFILING_ENABLED="0", GEMINI_API_KEY="budget-test")
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True, timeout=60,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_create_app_import_within_budget():
+    results = [_probe() for _ in range(RUNS)]
+    best = min(r["ms"] for r in results)
+    assert best <= IMPORT_BUDGET_MS, f"app.main import took {best:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_sdks_not_imported_at_startup():
+    assert _probe()["loaded"] == []
@@ -0,0 +1,74 @@
+"""
+decode_llm_json on the shapes LLM responses actually come in.
+
+Run from backend/:
+    python -m pytest tests/test_llm_json.py
+"""
+import pytest
+
+from app.services import llm_json
+from app.services.llm_json import MAX_CANDIDATES, decode_llm_json
+
+OBJ = {"question": "What is {paging}?", "options": ["A) x", "B) y"], "nested": {"k": [1, 2]}}
+RAW = '{"question": "What is {paging}?", "options": ["A) x", "B) y"], "nested": {"k": [1, 2]}}'
+
+
+@pytest.fixture(autouse=True, params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    """Run every case with and without orjson on the fast path."""
+    if request.param == "orjson":
+        if llm_json.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(llm_json, "orjson", None)
+    return request.param
+
+
+@pytest.mark.parametrize("text", [
+    RAW,
+    f"```json\n{RAW}\n```",
+    f"```\n{RAW}\n```\n",
+    f"Here is the question you asked for:\n{RAW}",
+    f"{RAW}\n\nNote: the options are shuffled.",
+    f"Sure! ```json\n{RAW}\n``` Let me know if you need more {{details}}.",
+    "  \n" + RAW + "  trailing } brace",
+])
+def test_wrapped_objects(text):
+    assert decode_llm_json(text) == OBJ
+
+
+def test_arrays():
+    assert decode_llm_json('Result:\n```json\n[{"a": 1}, {"b": 2}]\n```') == [{"a": 1}, {"b": 2}]
+
+
+def test_stray_brace_in_preamble_is_skipped():
+    assert decode_llm_json("Use the {format} below.\n" + RAW) == OBJ
+
+
+def test_expect_skips_values_of_the_other_type():
+    text = 'Fields like ["question", "options"] are required:\n' + RAW
+    assert decode_llm_json(text) == ["question", "options"]
+    assert decode_llm_json(text, expect=dict) == OBJ
+    assert decode_llm_json('{"a": 1} then [1, 2]', expect=list) == [1, 2]
+
+
+def test_first_of_two_objects():
+    assert decode_llm_json('{"a": 1}\n{"b": 2}') == {"a": 1}
+
+
+@pytest.mark.parametrize("text", ["", "no json here", "{not json}", '{"a": 1', "[1, 2"])
+def test_no_json_raises(text):
+    with pytest.raises(ValueError):
+        decode_llm_json(text)
+
+
+def test_expect_without_match_raises():
+    with pytest.raises(ValueError):
+        decode_llm_json("[1, 2, 3]", expect=dict)
+
+
+def test_gives_up_after_max_candidates():
+    noise = "{x} " * MAX_CANDIDATES
+    with pytest.raises(ValueError):
+        decode_llm_json(noise + RAW)
+    assert decode_llm_json("{x} " * (MAX_CANDIDATES - 1) + RAW) == OBJ
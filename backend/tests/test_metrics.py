@@ -0,0 +1,105 @@
+"""
+In-process metrics: spans, counters and their Prometheus rendering on /metrics.
+
+Run from backend/:
+    python -m pytest tests/test_metrics.py
+"""
+import pathlib
+import re
+
+import pytest
+
+from app.services import metrics
+from app.services.metrics import inc, observe, record_fallback, record_llm_call, render_prometheus, span
+
+APP_DIR = pathlib.Path(__file__).resolve().parents[1] / "app"
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _samples(text: str) -> dict:
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_histogram_buckets_are_cumulative():
+    for value in (0.0005, 0.02, 0.02, 0.3, 100):
+        observe("assessment_stage_duration_seconds", value, route="r", stage="s")
+    samples = _samples(render_prometheus())
+    bucket = 'assessment_stage_duration_seconds_bucket{route="r",stage="s",le="%s"}'
+    assert samples[bucket % "0.001"] == "1"
+    assert samples[bucket % "0.01"] == "1"
+    assert samples[bucket % "0.025"] == "3"
+    assert samples[bucket % "0.5"] == "4"
+    assert samples[bucket % "30.0"] == "4"
+    assert samples[bucket % "+Inf"] == "5"
+    assert samples['assessment_stage_duration_seconds_count{route="r",stage="s"}'] == "5"
+    assert float(samples['assessment_stage_duration_seconds_sum{route="r",stage="s"}']) == pytest.approx(100.3405)
+
+
+def test_span_outside_a_request_is_background():
+    with span("parse"):
+        pass
+    with pytest.raises(ValueError):
+        with span("parse"):
+            raise ValueError("still recorded")
+    text = render_prometheus()
+    assert 'assessment_stage_duration_seconds_count{route="background",stage="parse"} 2' in text
+    assert "# TYPE assessment_stage_duration_seconds histogram" in text
+
+
+def test_counters_render_with_help_and_labels():
+    inc("assessment_llm_requests_total", status="ok")
+    inc("assessment_llm_requests_total", 2, status="ok")
+    record_fallback("summarize")
+    record_llm_call("error", {"promptTokenCount": 1200, "candidatesTokenCount": 0, "cachedContentTokenCount": 800})
+    inc("assessment_prompt_renders_total", template='quote"and\\slash')
+    text = render_prometheus()
+    assert "# HELP assessment_llm_requests_total LLM API calls by outcome" in text
+    assert "# TYPE assessment_llm_requests_total counter" in text
+    samples = _samples(text)
+    assert samples['assessment_llm_requests_total{status="ok"}'] == "3"
+    assert samples['assessment_llm_requests_total{status="error"}'] == "1"
+    assert samples['assessment_fallbacks_total{stage="summarize"}'] == "1"
+    assert samples['assessment_llm_tokens_total{kind="prompt"}'] == "1200"
+    assert samples['assessment_llm_tokens_total{kind="cached"}'] == "800"
+    assert 'assessment_llm_tokens_total{kind="output"}' not in samples
+    assert samples['assessment_prompt_renders_total{template="quote\\"and\\\\slash"}'] == "1"
+
+
+def test_every_metric_has_help_text():
+    used = set()
+    for path in APP_DIR.rglob("*.py"):
+        used |= set(re.findall(r'(?:inc|observe)\(\s*"([a-z_]+)"', path.read_text()))
+    assert used
+    assert used <= set(metrics._HELP), sorted(used - set(metrics._HELP))
+
+
+def test_metrics_endpoint_labels_requests_and_spans_by_route():
+    from app.main import create_app
+
+    app = create_app()
+
+    @app.route("/_test/span/<item>")
+    def _span_route(item):
+        with span("unit"):
+            return {"item": item}
+
+    client = app.test_client()
+    assert client.get("/_test/span/a").status_code == 200
+    assert client.get("/_test/span/b").status_code == 200
+    assert client.get("/api/assessment/documents/missing").status_code == 404
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    samples = _samples(resp.get_data(as_text=True))
+    assert samples['assessment_stage_duration_seconds_count{route="/_test/span/<item>",stage="unit"}'] == "2"
+    assert samples['assessment_request_duration_seconds_count'
+                   '{method="GET",route="/_test/span/<item>",status="200"}'] == "2"
+    assert samples['assessment_request_duration_seconds_count'
+                   '{method="GET",route="/api/assessment/documents/<document_id>",status="404"}'] == "1"
@@ -0,0 +1,200 @@
+"""
+OCR page routing, header/footer removal and section coalescing in pdf_parser.
+
+Run from backend/:
+    python -m pytest tests/test_pdf_parser.py
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import pdf_parser
+from app.services.pdf_parser import (
+    PAGE_BREAK,
+    _document_page_texts,
+    coalesce_sections,
+    extract_text_hybrid,
+    normalize_text,
+    page_needs_ocr,
+    remove_boilerplate_lines,
+    split_into_sections,
+)
+
+BODY = ("Paging maps virtual pages onto physical frames through a per-process page table kept by the "
+        "kernel, and the TLB caches recent translations.")
+
+
+def _chapters(count: int) -> str:
+    """One chapter per page, each with the same "Example" and "Summary" headings mid-page."""
+    pages = []
+    for n in range(1, count + 1):
+        pages.append("\n".join([
+            "Operating Systems Notes",
+            f"Chapter {n} Memory Topics",
+            BODY,
+            "Example",
+            BODY,
+            "Summary",
+            BODY,
+            str(n),
+        ]))
+    return PAGE_BREAK.join(pages)
+
+
+def test_running_header_and_page_numbers_removed():
+    lines = remove_boilerplate_lines([page.splitlines() for page in _chapters(8).split(PAGE_BREAK)])
+    assert "Operating Systems Notes" not in lines
+    assert not any(l.isdigit() for l in lines)
+
+
+def test_repeated_chapter_headings_stay_section_boundaries():
+    titles = [title for title, _ in split_into_sections(normalize_text(_chapters(8)))]
+    assert titles.count("Example") == 8
+    assert titles.count("Summary") == 8
+
+
+def test_numbers_kept_outside_header_footer_position():
+    pages = [[f"Experiment {n}", BODY, "Results", "2019", BODY, f"Run {n} complete"] for n in range(6)]
+    lines = remove_boilerplate_lines(pages)
+    assert lines.count("2019") == 6
+    assert lines.count("Results") == 6
+    assert remove_boilerplate_lines([["2019", "Results"]]) == ["2019", "Results"]
+
+
+def test_pasted_text_has_no_boilerplate():
+    text = "\n".join(["Summary", "2019", BODY] * 10)
+    assert remove_boilerplate_lines([text.splitlines()]) == text.splitlines()
+
+
+def test_normalize_keeps_page_breaks():
+    assert normalize_text("  a  \n b \f c \n") == "a\nb\fc"
+
+
+def test_coalesce_keeps_every_word():
+    sections = [("Intro", "x" * 10), ("Big", "y" * 300), ("Tiny", "z"), ("Last", "w" * 150)]
+    merged = coalesce_sections(sections, min_chars=100, max_count=10)
+    text = " ".join(f"{t} {c}" for t, c in merged)
+    for title, content in sections:
+        assert title in text and content in text
+    assert all(len(c) >= 100 for _, c in merged)
+
+
+def test_coalesce_caps_section_count():
+    sections = [(f"Topic {i}", "w" * 150) for i in range(1000)]
+    assert len(coalesce_sections(sections, min_chars=100, max_count=50)) <= 50
+
+
+@pytest.mark.parametrize("text", [
+    BODY,
+    "Привет мир, это тестовая страница с нормальным текстовым слоем и несколькими предложениями.",
+    "Für alle x ∈ ℝ gilt: ∑ aᵢ ≤ ∀ε > 0, die Reihe konvergiert absolut und gleichmäßig.",
+    "For all x ∈ ℝ and ∀ε > 0 there is δ with |f(x) − f(y)| < ε; hence ∑ 1/n² converges to π²/6.",
+    "Η εικονική μνήμη δίνει σε κάθε διεργασία τον δικό της χώρο διευθύνσεων στο λειτουργικό σύστημα.",
+])
+def test_good_text_layers_stay_local(text):
+    assert not page_needs_ocr(text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Page 3",
+    "#$%^&*~|<>{}[]@#$%^&*~|<>{}[]@#$%^&*~|<>{}[]@#$%^&*~",
+    "\ue000\ue001\ue002 \ue003\ue004" * 10,
+    "\ufffd\ufffd \ufffd\ufffd\ufffd " * 10,
+    "Xkcd Qwz Brrt Pqst Lmnk Zxcv Bnmt Hjkl Wrtp Sdfg Xkcd Qwz",
+])
+def test_missing_or_garbage_text_layers_go_to_ocr(text):
+    assert page_needs_ocr(text)
+
+
+def _doc(text, spans):
+    pages = [SimpleNamespace(layout=SimpleNamespace(text_anchor=SimpleNamespace(
+        text_segments=[SimpleNamespace(start_index=a, end_index=b) for a, b in segs]))) for segs in spans]
+    return SimpleNamespace(text=text, pages=pages)
+
+
+def test_document_page_texts():
+    doc = _doc("one two three", [[(None, 4)], [(4, 8)], [(8, 10), (10, 13)]])
+    assert _document_page_texts(doc, 3) == ["one ", "two ", "three"]
+    # Page layout that doesn't match the chunk: everything on its first page
+    assert _document_page_texts(_doc("all", [[(0, 3)]]), 3) == ["all", "", ""]
+    assert _document_page_texts(SimpleNamespace(text=None, pages=None), 2) == ["", ""]
+
+
+def _pdf(pages):
+    """A minimal PDF; page i is 600 + i points wide so a stub OCR can tell pages apart. None = scanned."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>",
+            f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] "
+            f"/Count {len(pages)} >>"]
+    font = 3 + 2 * len(pages)
+    for i, text in enumerate(pages):
+        content = "" if text is None else f"BT /F1 10 Tf 20 700 Td ({text}) Tj ET"
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {600 + i} 792] /Contents {4 + 2 * i} 0 R "
+                    f"/Resources << /Font << /F1 {font} 0 R >> >> >>")
+        objs.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objs.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    out, offsets = "%PDF-1.4\n", []
+    for n, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{n} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n" + "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF"
+    return out.encode("latin-1")
+
+
+@pytest.fixture
+def stub_document_ai(monkeypatch):
+    """Document AI stand-in that "reads" page i of the original PDF as "OCR page i"."""
+    pypdf2 = pytest.importorskip("PyPDF2")
+    import io
+
+    calls = []
+    fail_pages = set()
+
+    def process(pdf_bytes, client=None):
+        indices = [int(page.mediabox.width) - 600 for page in pypdf2.PdfReader(io.BytesIO(pdf_bytes)).pages]
+        calls.append(indices)
+        if fail_pages & set(indices):
+            raise RuntimeError("quota exceeded")
+        texts = [f"OCR page {i}" for i in indices]
+        spans, start = [], 0
+        for t in texts:
+            spans.append([(start, start + len(t))])
+            start += len(t)
+        return _doc("".join(texts), spans)
+
+    documentai = SimpleNamespace(DocumentProcessorServiceClient=lambda: object())
+    real_import = pdf_parser.optional_import
+    monkeypatch.setattr(pdf_parser, "optional_import",
+                        lambda name: documentai if name == "google.cloud.documentai" else real_import(name))
+    monkeypatch.setattr(pdf_parser, "_document_ai_configured", lambda: True)
+    monkeypatch.setattr(pdf_parser, "_process_with_document_ai", process)
+    monkeypatch.setattr(pdf_parser, "DOCUMENT_AI_CHUNK_PAGES", 2)
+    return SimpleNamespace(calls=calls, fail_pages=fail_pages)
+
+
+def test_hybrid_ocrs_only_scanned_pages_in_page_order(stub_document_ai):
+    pages = [BODY, None, BODY, None, None, BODY, None]
+    text, source = extract_text_hybrid(_pdf(pages))
+    assert source == "hybrid"
+    assert sorted(stub_document_ai.calls) == [[1, 3], [4, 6]]
+    got = text.split(PAGE_BREAK)
+    assert [t.strip().startswith("Paging") for t in got] == [p is not None for p in pages]
+    assert [got[i] for i in (1, 3, 4, 6)] == ["OCR page 1", "OCR page 3", "OCR page 4", "OCR page 6"]
+
+
+def test_hybrid_keeps_text_layer_when_a_chunk_fails(stub_document_ai):
+    stub_document_ai.fail_pages.add(3)
+    text, source = extract_text_hybrid(_pdf([None, BODY, None, None]))
+    assert source == "hybrid"
+    got = text.split(PAGE_BREAK)
+    assert (got[0], got[2], got[3]) == ("OCR page 0", "OCR page 2", "")
+    assert got[1].startswith("Paging")
+
+
+def test_hybrid_sources(stub_document_ai):
+    assert extract_text_hybrid(_pdf([BODY, BODY]))[1] == "pypdf2"
+    assert stub_document_ai.calls == []
+    assert extract_text_hybrid(_pdf([None, None, None])) == (PAGE_BREAK.join(
+        f"OCR page {i}" for i in range(3)), "document_ai")
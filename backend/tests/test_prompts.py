@@ -0,0 +1,95 @@
+"""
+Prompt registry: every template renders with all of its fields filled in,
+and per-call data stays out of the static (cacheable) prefix.
+
+Run from backend/:
+    python -m pytest tests/test_prompts.py
+"""
+import re
+
+import pytest
+
+from app.services import metrics
+from app.services.prompts import (
+    PROMPTS,
+    SOURCES_BLOCK,
+    PromptTemplate,
+    describe,
+    estimate_tokens,
+    get_prompt,
+    render_prompt,
+)
+
+EXPECTED_TEMPLATES = {
+    "question.easy", "question.moderate", "question.hard.mcq_reasoning", "question.hard.assertion_reason",
+    "question.fallback", "question.open", "analyze", "explain", "summary",
+}
+
+
+def _values(template: PromptTemplate) -> dict:
+    return {field: f"<<{field.upper()}-VALUE>>" for field in template.fields}
+
+
+def test_registry_contents():
+    assert set(PROMPTS) == EXPECTED_TEMPLATES
+    assert all(get_prompt(name) is PROMPTS[name] for name in PROMPTS)
+    assert set(describe()) == EXPECTED_TEMPLATES
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED_TEMPLATES))
+def test_renders_with_every_field_filled(name):
+    template = PROMPTS[name]
+    values = _values(template)
+    rendered = render_prompt(name, **values)
+
+    assert rendered.startswith(template.static)
+    tail = rendered[len(template.static):]
+    for field, value in values.items():
+        assert value in tail, field
+        assert "{" + field + "}" not in rendered
+    # No format placeholder survives in the per-call tail
+    assert not re.search(r"\{[a-z_]+\}", tail)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED_TEMPLATES))
+def test_static_prefix_holds_no_per_call_fields(name):
+    template = PROMPTS[name]
+    assert template.fields
+    for field in template.fields:
+        assert "{" + field + "}" not in template.static
+    assert template.static_tokens == estimate_tokens(template.static)
+
+
+def test_question_templates_share_fields():
+    question_fields = PROMPTS["question.easy"].fields
+    assert {"domain", "topic", "seed", "sources"} <= question_fields
+    for name in ("question.moderate", "question.hard.mcq_reasoning", "question.hard.assertion_reason"):
+        assert PROMPTS[name].fields == question_fields
+
+
+def test_sources_block_renders_into_question_prompt():
+    template = PROMPTS["question.easy"]
+    values = {**_values(template), "sources": SOURCES_BLOCK.format(excerpts="[1] Paging maps pages to frames.")}
+    rendered = template.render(**values)
+    assert "SOURCE EXCERPTS:\n[1] Paging maps pages to frames.\n" in rendered
+    assert rendered.rindex("SOURCE EXCERPTS") > len(template.static)
+
+
+def test_missing_field_raises():
+    template = PROMPTS["explain"]
+    with pytest.raises(KeyError, match="missing fields: \\['content'\\]"):
+        template.render(title="Paging")
+
+
+def test_render_counts_tokens():
+    metrics.reset()
+    template = PROMPTS["analyze"]
+    rendered = template.render(question="What is paging?", answer="Mapping pages to frames.")
+    counters = metrics._counters
+    assert counters["assessment_prompt_renders_total"][(("template", "analyze"),)] == 1
+    tokens = counters["assessment_prompt_tokens_total"]
+    static = tokens[(("part", "static"), ("template", "analyze"))]
+    dynamic = tokens[(("part", "dynamic"), ("template", "analyze"))]
+    assert static == template.static_tokens
+    assert dynamic == estimate_tokens(rendered[len(template.static):])
+    metrics.reset()
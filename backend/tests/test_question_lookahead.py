@@ -0,0 +1,123 @@
+"""
+Look-ahead question buffer: serving, refilling, the bounded wait and
+cancellation when the session expires.
+
+Run from backend/:
+    python -m pytest tests/test_question_lookahead.py
+"""
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from app.services import metrics, question_lookahead, session_store
+from app.services.question_lookahead import next_question
+
+
+def _events():
+    series = metrics._counters.get("assessment_question_lookahead_total", {})
+    return {dict(labels)["event"]: value for labels, value in series.items()}
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    """generate_question stand-in; set `gate` to hold background generations."""
+    state = {"calls": [], "gate": None}
+    counter = itertools.count()
+
+    def generate(subject, topic, difficulty):
+        n = next(counter)
+        state["calls"].append((threading.current_thread().name, topic))
+        if state["gate"] is not None and threading.current_thread().name.startswith("lookahead"):
+            state["gate"].wait(5)
+        return {"question": f"{topic} question {n}", "difficulty": difficulty}
+
+    monkeypatch.setattr(question_lookahead, "generate_question", generate)
+    monkeypatch.setattr(question_lookahead, "_executor", ThreadPoolExecutor(2, thread_name_prefix="lookahead"))
+    metrics.reset()
+    return state
+
+
+@pytest.fixture
+def session():
+    session_id = session_store.create_session("OS", "Paging")
+    yield session_id, session_store.sessions[session_id]
+    session_store.sessions.pop(session_id, None)
+
+
+def test_first_call_is_live_then_served_from_buffer(generator, session):
+    session_id, s = session
+    first = next_question(session_id, s, depth=1)
+    assert generator["calls"][0][0] == threading.current_thread().name
+    assert len(s["lookahead"]) == 1
+    s["lookahead"][0].result(5)
+
+    second = next_question(session_id, s, depth=1)
+    assert second["question"] != first["question"]
+    assert second["question"] == "Paging question 1"
+    assert _events() == {"miss": 1, "hit": 1, "queued": 2}
+
+
+def test_buffer_refills_to_depth(generator, session):
+    session_id, s = session
+    next_question(session_id, s, depth=3)
+    assert len(s["lookahead"]) == 3
+    next_question(session_id, s, depth=3)
+    assert len(s["lookahead"]) == 3
+    next_question(session_id, s, depth=0)
+    assert len(s["lookahead"]) == 2
+
+
+def test_slow_buffered_question_falls_back_to_live(generator, session, monkeypatch):
+    session_id, s = session
+    monkeypatch.setattr(question_lookahead._buffered, "__defaults__", (0.1,))
+    slow = Future()
+    slow.set_running_or_notify_cancel()  # running: can't be cancelled, never finishes
+    s["lookahead"].append(slow)
+
+    served = next_question(session_id, s, depth=0)
+    assert served["question"] == "Paging question 0"
+    assert generator["calls"] == [(threading.current_thread().name, "Paging")]  # generated live
+    assert slow not in s["lookahead"]  # dropped, so the next call doesn't wait on it again
+    assert _events() == {"miss": 1, "queued": 0}
+
+
+def test_failed_or_queued_questions_are_generated_live(generator, session):
+    session_id, s = session
+    failed = Future()
+    failed.set_exception(RuntimeError("LLM down"))
+    queued = Future()
+    s["lookahead"].extend([failed, queued])
+
+    assert next_question(session_id, s, depth=0)["question"] == "Paging question 0"
+    assert next_question(session_id, s, depth=0)["question"] == "Paging question 1"
+    assert queued.cancelled()
+    assert _events() == {"miss": 1, "cancelled": 1, "queued": 0}
+
+
+def test_expiry_cancels_queued_questions(generator, session):
+    session_id, s = session
+    generator["gate"] = threading.Event()
+    next_question(session_id, s, depth=4)  # 2 workers busy, 2 queued behind them
+    futures = list(s["lookahead"])
+    session_store._expire(session_id)
+    assert len(s["lookahead"]) == 0
+    assert sum(f.cancelled() for f in futures) == 2
+    generator["gate"].set()
+
+    # Nothing more is queued for an expired session
+    next_question(session_id, s, depth=2)
+    assert len(s["lookahead"]) == 0
+    assert session_store.get_session(session_id) is None
+
+
+def test_concurrent_requests_share_the_buffer(generator, session):
+    session_id, s = session
+    next_question(session_id, s, depth=2)
+    for f in list(s["lookahead"]):
+        f.result(5)
+    with ThreadPoolExecutor(8) as pool:
+        served = list(pool.map(lambda _: next_question(session_id, s, depth=2)["question"], range(40)))
+    assert len(served) == len(set(served)) == 40
+    assert len(s["lookahead"]) == 2
@@ -0,0 +1,133 @@
+"""
+Behaviour of the table-driven question validator.
+
+Every error code, its message and the auto_fix_question results are pinned
+to what the original if/elif validator returned for the same questions, so
+the rule tables can change shape without changing behaviour.
+
+Run from backend/:
+    python -m pytest tests/test_question_validator.py
+"""
+import copy
+
+import pytest
+
+from app.services.question_validator import (
+    auto_fix_question,
+    check_question,
+    validate_and_fix_question,
+    validate_batch,
+    validate_question,
+)
+
+OPTIONS = ["A) One", "B) Two", "C) Three", "D) Four"]
+AR_OPTIONS = [
+    "A) Both A and R are true, and R is the correct explanation of A",
+    "B) Both A and R are true, but R is NOT the correct explanation of A",
+    "C) A is true, but R is false",
+    "D) A is false, but R is true",
+]
+AR_TEXT = "Assertion: caches help. Reason: locality."
+
+
+def question(**overrides):
+    q = {"question": "What is a process in an operating system?", "options": list(OPTIONS),
+         "correct_answer": "A", "difficulty": "easy", "segment": "MCQ", "reasoning_required": False}
+    q.update(overrides)
+    return q
+
+
+@pytest.mark.parametrize("q, code, message", [
+    (question(question="Short?"), "text_too_short", "Question text is too short or empty"),
+    (question(options=OPTIONS[:3]), "option_count", "Expected exactly 4 options, got 3"),
+    (question(options=[]), "option_count", "Expected exactly 4 options, got 0"),
+    (question(options=["A) One", "B) Two", "Three", "D) Four"]), "option_label",
+     "Option 3 must start with 'C)'"),
+    (question(correct_answer="E"), "correct_answer", "Invalid correct_answer: E. Must be A, B, C, or D"),
+    (question(difficulty="expert"), "difficulty",
+     "Invalid difficulty level: expert. Must be easy, moderate, or hard"),
+    (question(difficulty=""), "difficulty", "Invalid difficulty level: . Must be easy, moderate, or hard"),
+    (question(segment="ASSERTION_REASON"), "segment", "Easy questions must be MCQ segment, got ASSERTION_REASON"),
+    (question(difficulty="moderate", segment="MCQ_REASONING"), "segment",
+     "Moderate questions must be MCQ segment, got MCQ_REASONING"),
+    (question(difficulty="hard", segment="MCQ"), "segment",
+     "Hard difficulty must use MCQ_REASONING or ASSERTION_REASON segment, got MCQ"),
+    (question(reasoning_required=True), "reasoning_unexpected", "Easy questions should not require reasoning"),
+    (question(difficulty="moderate", reasoning_required=True), "reasoning_unexpected",
+     "Moderate questions should not require reasoning (use hard for that)"),
+    (question(difficulty="hard", segment="ASSERTION_REASON", reasoning_required=True), "reasoning_unexpected",
+     "ASSERTION_REASON questions should not require additional reasoning"),
+    (question(difficulty="hard", segment="MCQ_REASONING"), "reasoning_missing",
+     "Hard MCQ_REASONING segment must require reasoning"),
+    (question(difficulty="hard", segment="ASSERTION_REASON", question="Consider the statement about caches."),
+     "assertion_reason_missing", "ASSERTION_REASON must contain both Assertion and Reason statements"),
+    (question(difficulty="hard", segment="ASSERTION_REASON", question=AR_TEXT), "assertion_reason_options",
+     "ASSERTION_REASON options must follow standard A-R format"),
+])
+def test_issue_codes(q, code, message):
+    issue, _ = check_question(copy.deepcopy(q))
+    assert (issue.code, issue.message) == (code, message)
+    assert validate_question(copy.deepcopy(q)) == (False, message)
+
+
+@pytest.mark.parametrize("q, warnings", [
+    (question(), []),
+    (question(difficulty="EASY"), []),
+    (question(question="Processes own an address space and threads."), ["style_definition"]),
+    (question(difficulty="moderate", question="How would you use a semaphore here?"), []),
+    (question(difficulty="moderate", question="Semaphores protect shared state."), ["style_application"]),
+    (question(difficulty="hard", segment="MCQ_REASONING", reasoning_required=True), []),
+    (question(difficulty="hard", segment="ASSERTION_REASON", question=AR_TEXT, options=AR_OPTIONS), []),
+])
+def test_valid_questions_and_style_warnings(q, warnings):
+    assert check_question(copy.deepcopy(q)) == (None, warnings)
+    assert validate_question(copy.deepcopy(q)) == (True, None)
+
+
+@pytest.mark.parametrize("q, expected", [
+    ({"question": "What is paging?", "options": ["One", "Two", "Three", "Four", "Five"],
+      "correct_answer": " b) Two ", "difficulty": "easy"},
+     {"question": "What is paging?", "options": OPTIONS, "correct_answer": "B", "difficulty": "easy",
+      "segment": "MCQ", "reasoning_required": False}),
+    ({"question": "What is paging?", "options": ["B) One", "A) Two", "d)Three", "C) Four"],
+      "correct_answer": "c", "difficulty": "Hard"},
+     {"question": "What is paging?", "options": ["A) One", "B) Two", "C) d)Three", "D) Four"],
+      "correct_answer": "C", "difficulty": "Hard", "segment": "MCQ_REASONING", "reasoning_required": True}),
+    ({"question": "What is paging?", "options": OPTIONS, "correct_answer": "A", "difficulty": "hard",
+      "segment": "ASSERTION_REASON", "reasoning_required": True},
+     {"question": "What is paging?", "options": OPTIONS, "correct_answer": "A", "difficulty": "hard",
+      "segment": "ASSERTION_REASON", "reasoning_required": False}),
+    ({"question": "What is paging?", "options": OPTIONS, "correct_answer": "A", "difficulty": "expert"},
+     {"question": "What is paging?", "options": OPTIONS, "correct_answer": "A", "difficulty": "expert",
+      "reasoning_required": False}),
+])
+def test_auto_fix_question(q, expected):
+    assert auto_fix_question(copy.deepcopy(q)) == expected
+
+
+def test_validate_and_fix_leaves_input_untouched():
+    q = {"question": "What is paging?", "options": ["One", "Two", "Three", "Four"],
+         "correct_answer": "b", "difficulty": "easy"}
+    original = copy.deepcopy(q)
+    valid, fixed, error = validate_and_fix_question(q)
+    assert (valid, error) == (True, None)
+    assert fixed["options"] == OPTIONS
+    assert q == original
+
+
+def test_validate_batch():
+    batch = [
+        question(options=["One", "Two", "Three", "Four"]),
+        question(question="Short?"),
+        question(question="Processes own an address space and threads."),
+    ]
+    results = validate_batch(batch)
+    assert [r["valid"] for r in results] == [True, False, True]
+    assert results[1]["error"] == {"code": "text_too_short", "message": "Question text is too short or empty"}
+    assert results[2]["warnings"] == ["style_definition"]
+    assert results[0]["question"]["options"] == OPTIONS
+    assert batch[0]["options"] == ["One", "Two", "Three", "Four"]
+
+    unfixed = validate_batch(batch[:1], fix=False)
+    assert unfixed[0]["error"]["code"] == "option_label"
+    assert unfixed[0]["question"] is batch[0]
@@ -0,0 +1,132 @@
+"""
+BM25 retrieval over ingested sections and document-grounded /generate-batch.
+
+Run from backend/:
+    python -m pytest tests/test_retrieval.py
+"""
+import pytest
+
+from app.routes import assessment
+from app.services import question_generator, session_store
+from app.services.document_store import get_document
+from app.services.retrieval import BM25Index, Passage, format_passages, split_passages, tokenize
+
+SECTIONS = [
+    {"title": "Process Scheduling", "content": "The scheduler picks the next runnable process. Round robin gives "
+                                               "each process a fixed time slice and preempts it when the slice "
+                                               "expires."},
+    {"title": "Virtual Memory", "content": "Virtual memory gives every process its own address space. Pages are "
+                                           "mapped to physical frames and swapped to disk under memory pressure."},
+    {"title": "File Systems", "content": "A file system maps names to blocks on disk. Journaling file systems log "
+                                         "metadata changes first so a crash cannot leave the tree inconsistent."},
+]
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("What is the Round-Robin scheduler of 2024?") == ["round", "robin", "scheduler", "2024"]
+
+
+def test_split_passages_keeps_section_and_title():
+    sections = [{"title": "A", "content": " ".join(f"w{i}" for i in range(7))}, {"title": "B", "content": ""},
+                {"title": "C", "content": "one two"}]
+    passages = split_passages(sections, words=3)
+    assert passages == [Passage(0, "A", "w0 w1 w2"), Passage(0, "A", "w3 w4 w5"), Passage(0, "A", "w6"),
+                        Passage(2, "C", "one two")]
+
+
+def test_search_ranks_the_matching_section_first():
+    index = BM25Index.from_sections(SECTIONS)
+    assert len(index) == 3
+    for i, section in enumerate(SECTIONS):
+        hits = index.search(section["title"], k=3)
+        assert hits[0][0].section == i
+        scores = [score for _, score in hits]
+        assert scores == sorted(scores, reverse=True)
+    assert index.search("journaling crash")[0][0].title == "File Systems"
+
+
+def test_search_only_returns_passages_with_query_terms():
+    index = BM25Index.from_sections(SECTIONS)
+    assert index.search("round robin time slice", k=3) == index.search("round robin time slice", k=1)
+    assert sorted(p.section for p, _ in index.search("disk", k=3)) == [1, 2]
+    assert index.search("quantum entanglement") == []
+    assert index.search("what is the") == []
+    assert BM25Index([]).search("anything") == []
+
+
+def test_rare_terms_and_short_passages_score_higher():
+    index = BM25Index([
+        Passage(0, "", "cache cache miss"),
+        Passage(1, "", "cache miss " + "filler " * 20),
+        Passage(2, "", "cache hit"),
+    ])
+    # "miss" is in fewer passages than "cache", so it carries more weight
+    assert index._idf["miss"] > index._idf["cache"]
+    # Same term frequency: the shorter passage wins
+    short, long_ = BM25Index([Passage(0, "", "tlb miss"), Passage(1, "", "tlb miss " + "filler " * 20)]) \
+        .search("tlb", k=2)
+    assert short[0].section == 0 and short[1] > long_[1]
+    assert [p.section for p, _ in index.search("cache miss", k=3)][-1] == 2
+
+
+def test_format_passages_numbers_excerpts():
+    hits = [(Passage(0, "Paging", "Pages map to frames."), 2.0), (Passage(3, "TLB", "Caches translations."), 1.0)]
+    assert format_passages(hits) == "[1] Paging: Pages map to frames.\n[2] TLB: Caches translations."
+    assert format_passages([]) == ""
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app.main import create_app
+
+    monkeypatch.setattr(assessment, "initial_summary", lambda text, topics, concepts, source: (
+        {"title": "OS Notes", "source": "textrank"}, False))
+    return create_app().test_client()
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """(topic, excerpts) of every question the generator is asked for."""
+    calls = []
+
+    def generate(domain, topic, difficulty="moderate", segment=None, excerpts=""):
+        calls.append((topic, excerpts))
+        return {"question_id": f"q{len(calls)}", "question": f"What is {topic}?", "topic": topic,
+                "options": ["A) a", "B) b", "C) c", "D) d"], "correct_answer": "A",
+                "difficulty": difficulty, "segment": "MCQ", "reasoning_required": False}
+
+    monkeypatch.setattr(question_generator, "generate_question_with_answer", generate)
+    return calls
+
+
+def test_generate_batch_is_grounded_in_the_document(client, prompts):
+    text = "\n".join(f"{s['title']}\n{s['content']}" for s in SECTIONS)
+    document_id = client.post("/api/assessment/ingest", json={"text": text}).json["document_id"]
+    titles = set(get_document(document_id)["topics"])
+    assert titles == {s["title"] for s in SECTIONS}
+
+    resp = client.post("/api/assessment/generate-batch",
+                       json={"document_id": document_id, "count": 5, "difficulty": "easy"}).json
+    assert resp["success"] and len(resp["questions"]) == 5
+    assert {q["topic"] for q in resp["questions"]} <= titles
+    assert len(prompts) == 5
+    for topic, excerpts in prompts:
+        assert topic in titles
+        # The topic's own section is the best passage for it
+        assert excerpts.startswith(f"[1] {topic}: ")
+
+    session = session_store.sessions[resp["session_id"]]
+    assert session["document_id"] == document_id
+    assert session["subject"] == "OS Notes"
+
+
+def test_generate_batch_without_document_sends_no_excerpts(client, prompts):
+    resp = client.post("/api/assessment/generate-batch", json={"domain": "operating-systems", "count": 2}).json
+    assert session_store.sessions[resp["session_id"]]["document_id"] is None
+    assert [excerpts for _, excerpts in prompts] == ["", ""]
+
+
+def test_generate_batch_unknown_document(client, prompts):
+    resp = client.post("/api/assessment/generate-batch", json={"document_id": "missing", "count": 2})
+    assert resp.status_code == 404
+    assert prompts == []
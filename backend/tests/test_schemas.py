@@ -0,0 +1,94 @@
+"""
+Slotted session models: read-only, and to_dict() returns the original JSON shape.
+
+Run from backend/:
+    python -m pytest tests/test_schemas.py
+"""
+import copy
+import json
+
+import pytest
+
+from app.schemas.assessment import (
+    ASSERTION_REASON_OPTIONS,
+    CONFIDENCE_OPTIONS,
+    Analysis,
+    Difficulty,
+    Question,
+    Response,
+    Segment,
+    intern_options,
+)
+
+MCQ = {
+    "question_id": "q1", "question": "What is paging?", "options": ["A) a", "B) b", "C) c", "D) d"],
+    "correct_answer": "B", "topic": "Memory", "difficulty": "easy", "segment": "MCQ", "reasoning_required": False,
+}
+
+
+@pytest.mark.parametrize("data", [
+    MCQ,
+    {**MCQ, "difficulty": "hard", "segment": "ASSERTION_REASON", "options": list(ASSERTION_REASON_OPTIONS)},
+    {**MCQ, "reasoning_explanation": "Because B.", "source_passages": [1, 3]},
+    {"question_id": "ui", "question": "Explain paging.", "difficulty": "medium",
+     "options": [dict(o) for o in CONFIDENCE_OPTIONS]},
+    {"question": "Bad level", "difficulty": "expert", "segment": "ESSAY"},
+    {"question": "Minimal"},
+])
+def test_question_round_trip(data):
+    original = copy.deepcopy(data)
+    q = Question(data)
+    assert q.to_dict() == original
+    assert json.loads(json.dumps(q.to_dict())) == original
+    assert data == original
+
+
+def test_absent_fields_stay_absent():
+    q = Question({"question": "Minimal"})
+    assert "difficulty" not in q
+    assert q.get("difficulty", "moderate") == "moderate"
+    with pytest.raises(KeyError):
+        q["segment"]
+    assert len(q) == 1
+
+
+def test_enums_and_shared_options():
+    q = Question({**MCQ, "segment": "ASSERTION_REASON", "options": list(ASSERTION_REASON_OPTIONS)})
+    assert q.difficulty is Difficulty.EASY and q.segment is Segment.ASSERTION_REASON
+    assert q["difficulty"] == "easy"
+    assert q.options is ASSERTION_REASON_OPTIONS
+    assert intern_options([dict(o) for o in CONFIDENCE_OPTIONS]) is CONFIDENCE_OPTIONS
+
+
+def test_records_are_read_only():
+    q = Question(MCQ)
+    with pytest.raises(AttributeError):
+        q.question = "changed"
+    with pytest.raises(AttributeError):
+        q.new_field = 1
+    with pytest.raises(TypeError):
+        q["question"] = "changed"
+    assert not hasattr(q, "__dict__")
+    assert q["question"] == "What is paging?"
+
+
+def test_to_dict_returns_fresh_containers():
+    q = Question({"question": "Explain paging.", "options": [dict(o) for o in CONFIDENCE_OPTIONS]})
+    out = q.to_dict()
+    out["options"].append("E) extra")
+    out["options"][0]["text"] = "changed"
+    assert len(q["options"]) == 4
+    assert q.to_dict()["options"][0]["text"] == CONFIDENCE_OPTIONS[0]["text"] != "changed"
+
+
+def test_response_round_trip_with_nested_analysis():
+    data = {"question_id": "q1", "topic": "Memory", "selected_option": "B", "explanation": "",
+            "self_confidence": 80, "time_taken_seconds": 12.5,
+            "analysis": {"clarity": 100, "correctness": 100, "confidence": 80, "reasoning_quality": 100,
+                         "short_feedback": "Correct.", "is_correct": True, "graded_locally": True}}
+    r = Response(data)
+    assert isinstance(r["analysis"], Analysis)
+    assert r["analysis"]["is_correct"] is True
+    assert r.to_dict() == data
+    assert Response.from_dict(r) is r
+    assert Response({"question_id": "q2"}).to_dict() == {"question_id": "q2"}
@@ -0,0 +1,99 @@
+"""
+TextRank summarizer: TF-IDF rows, rank convergence, keyphrases and the
+heuristic fallback when scipy is missing.
+
+Run from backend/:
+    python -m pytest tests/test_textrank.py
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy.sparse")
+
+from app.services import document_summary, textrank
+from app.services.textrank import keyphrases, textrank as rank_sentences, textrank_summary, tfidf_matrix
+
+SENTENCES = [
+    "Virtual memory maps pages to physical frames.",
+    "The page table maps virtual pages to frames.",
+    "A TLB caches recent page table lookups for virtual memory.",
+    "Page faults load missing pages into frames.",
+    "Bananas are yellow.",
+]
+CONCEPTS = [
+    {"title": "Virtual Memory", "content": " ".join(SENTENCES[:2])},
+    {"title": "Paging", "content": " ".join(SENTENCES[2:4])},
+    {"title": "Fruit", "content": SENTENCES[4]},
+]
+
+
+def test_tfidf_rows_are_unit_length():
+    x, vocab = tfidf_matrix(SENTENCES + ["", "the of and"])
+    norms = np.sqrt(np.asarray(x.multiply(x).sum(axis=1)).ravel())
+    assert norms[:len(SENTENCES)] == pytest.approx(1.0)
+    assert norms[len(SENTENCES):] == pytest.approx(0.0)  # no terms: left as a zero row
+    assert x.shape == (len(SENTENCES) + 2, len(vocab))
+    assert "pages" in vocab or "page" in vocab
+
+
+def test_repeated_terms_weigh_more():
+    x, vocab = tfidf_matrix(["paging paging paging frames", "paging frames"])
+    row = x[0].toarray().ravel()
+    assert row[vocab["paging"]] > row[vocab["frames"]]
+
+
+def test_textrank_converges_to_a_distribution(monkeypatch):
+    x, _ = tfidf_matrix(SENTENCES)
+    rank = rank_sentences(x)
+    assert rank.sum() == pytest.approx(1.0)
+    assert (rank > 0).all()
+    # Shares no terms with the rest: only the teleport share reaches it
+    assert int(np.argmin(rank)) == SENTENCES.index("Bananas are yellow.")
+
+    # Iterating much longer barely moves the early-stopped ranks
+    monkeypatch.setattr(textrank, "MAX_ITERATIONS", 1000)
+    monkeypatch.setattr(textrank, "TOLERANCE", 1e-14)
+    assert np.abs(rank_sentences(x) - rank).sum() < 1e-5
+
+
+def test_textrank_single_sentence():
+    x, _ = tfidf_matrix(["Only one sentence here."])
+    assert rank_sentences(x).tolist() == [1.0]
+
+
+def test_keyphrases_are_deduplicated():
+    sentences = ["Virtual memory uses page tables.", "Virtual memory and page tables.", "Page tables map memory."]
+    scores = {"virtual": 3.0, "memory": 2.5, "page": 2.0, "tables": 1.8, "uses": 0.1, "map": 0.2, "and": 5.0}
+    phrases = keyphrases(sentences, scores, limit=5)
+    assert phrases[0] == "Virtual memory"
+    assert len({p.lower() for p in phrases}) == len(phrases)
+    words = [set(p.lower().split()) for p in phrases]
+    assert not any(a <= b for i, a in enumerate(words) for j, b in enumerate(words) if i != j)
+    assert all("and" not in w for w in words)  # stopwords never form phrases
+
+
+def test_textrank_summary_shape():
+    summary = textrank_summary(" ".join(SENTENCES), ["Memory"], CONCEPTS)
+    assert summary["title"] == "Memory"
+    assert "Bananas" not in summary["overview"].split(".")[0]
+    assert [t["name"] for t in summary["main_topics"]] == ["Virtual Memory", "Paging", "Fruit"]
+    assert summary["key_concepts"]
+    with pytest.raises(ValueError):
+        textrank_summary("", [], [{"title": "Empty", "content": ""}])
+
+
+def test_local_summary_falls_back_without_scipy(monkeypatch):
+    monkeypatch.setattr(textrank, "np", None)
+    monkeypatch.setattr(textrank, "sparse", None)
+    monkeypatch.setattr(textrank, "optional_import", lambda name: None)
+    with pytest.raises(RuntimeError):
+        textrank_summary(" ".join(SENTENCES), ["Memory"], CONCEPTS)
+
+    summary = document_summary.local_summary(" ".join(SENTENCES), ["Memory"], CONCEPTS, "raw_text")
+    assert summary["source"] == "raw_text"
+    assert summary["overview"]
+
+
+def test_local_summary_uses_textrank():
+    summary = document_summary.local_summary(" ".join(SENTENCES), ["Memory"], CONCEPTS, "raw_text")
+    assert summary["source"] == "textrank"